@@ -0,0 +1,54 @@
+import random
+import unittest
+from controller.agent_order import AgentOrder
+from model.alien import Alien
+from model.location import Location
+
+
+class TestAgentOrder(unittest.TestCase):
+
+    def test_morton_code(self):
+        self.assertEqual(AgentOrder.morton_code(0, 0), 0)
+        self.assertEqual(AgentOrder.morton_code(1, 0), 1)
+        self.assertEqual(AgentOrder.morton_code(0, 1), 2)
+        self.assertEqual(AgentOrder.morton_code(3, 3), 15)
+        self.assertEqual(AgentOrder.morton_code(256, 0), 1 << 16)
+        self.assertEqual(AgentOrder.morton_code(0, 300),
+                         AgentOrder.morton_code(0, 256) | AgentOrder.morton_code(0, 44))
+
+    def test_insertion_keeps_order(self):
+        agents = [Alien(Location(5, 5)), Alien(Location(0, 0))]
+        AgentOrder(AgentOrder.INSERTION, 10, 10).sort(agents)
+        self.assertEqual([agent.get_location() for agent in agents], [Location(5, 5), Location(0, 0)])
+
+    def test_morton_order(self):
+        agents = [Alien(Location(x, y)) for x, y in ((1, 1), (0, 1), (1, 0), (0, 0), (2, 0), (-1, 0))]
+        AgentOrder(AgentOrder.MORTON, 4, 4).sort(agents)
+        self.assertEqual([(agent.get_location().get_x(), agent.get_location().get_y()) for agent in agents],
+                         [(0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (-1, 0)])
+
+    def test_shuffled_morton_keeps_blocks_in_order(self):
+        agents = [Alien(Location(x, y)) for x in range(8) for y in range(8)]
+        order = AgentOrder(AgentOrder.SHUFFLED_MORTON, 8, 8, block_bits=2, random_source=random.Random(3))
+        order.sort(agents)
+        blocks = [(agent.get_location().get_x() // 4, agent.get_location().get_y() // 4) for agent in agents]
+        self.assertEqual(blocks, sorted(blocks, key=lambda block: AgentOrder.morton_code(*block)))
+        first_block = [agent.get_location() for agent in agents[:16]]
+        self.assertNotEqual(first_block, sorted(first_block, key=lambda location: AgentOrder.morton_code(
+            location.get_x(), location.get_y())))
+
+    def test_shuffle_is_reproducible(self):
+        orders = []
+        for _ in range(2):
+            agents = [Alien(Location(x, 0)) for x in range(8)]
+            AgentOrder(AgentOrder.SHUFFLED_MORTON, 8, 8, random_source=random.Random(7)).sort(agents)
+            orders.append([agent.get_location().get_x() for agent in agents])
+        self.assertEqual(orders[0], orders[1])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            AgentOrder("spiral", 4, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,3 +9,53 @@ class Config:
     rock_creation_probability = 0.3
 
     initial_num_rovers = 8
+
+    rover_memory_capacity = 16
+    rover_memory_ttl = 200
+    rover_memory_eviction = "lru"
+
+    rover_sensing_radius = 1
+
+    cell_size = 20
+    max_fps = 30
+    max_steps_per_second = 1000
+    viewport_size = 800
+
+    renderer = "tk"  # "tk" for the window, "terminal" for ANSI output, e.g. over SSH, "none" to run headless
+    max_steps = 0  # Stop a headless run after this many steps, 0 for no limit
+
+    frame_export_every = 0  # Export a frame every this many steps, 0 to disable
+    frame_export_directory = "frames"
+    frame_export_format = "png"  # "png" for a numbered sequence, "gif" for animated GIFs (needs Pillow) of up to
+    # FrameExporter.GIF_SEGMENT_PIXELS (64 Mi) pixels of frames each: frames.gif, then frames_001.gif, ...
+    frame_export_scale = 1
+    frame_export_threaded = True
+
+    diff_server_enabled = False  # Stream per-step diffs to http://127.0.0.1:<port>/, e.g. through an SSH tunnel
+    diff_server_port = 8765
+    diff_server_history = 1024  # Steps of diffs kept for clients that fall behind
+
+    metrics_every = 0  # Sample mission statistics every this many steps, 0 to disable
+    metrics_path = "metrics.csv"  # Written at the end of a run; a .parquet path needs pyarrow
+
+    heatmap_directory = ""  # Save the activity heatmaps as .npy files and PNG images here at the end of a run
+
+    stalemate_window = 500  # Stop a run after this many steps without deliveries, battery changes or movement
+
+    agent_order = "insertion"  # "insertion", "morton" (Z-order by cell) or "shuffled_morton"
+    agent_order_block_bits = 3  # shuffled_morton shuffles agents within blocks of 2 ** bits by 2 ** bits cells
+
+    update_mode = "sequential"  # "sequential": agents see earlier agents' moves; "synchronous": intents, then commit
+    # Keep the aliens in shared memory and step them in this many processes, one band of rows each; implies
+    # synchronous, excludes rollouts, and runs differ from single-process runs
+    parallel_workers = 0
+
+    rover_policy = "heuristic"  # "heuristic" for Rover.act, "random" for random moves, "remote" for a PolicyServer
+    rover_policy_port = 8766  # The port of the PolicyServer asked by the "remote" policy
+
+    rollout_candidates = 0  # Targets the spacecraft plays out in forked worlds per docked rover, 0 to disable
+    rollout_count = 8  # Rollouts per candidate target
+    rollout_horizon = 40  # Steps per rollout
+    rollout_workers = 0  # Play the rollouts out in this many spawned processes, 0 for the simulator's process
+
+    random_seed = None  # Seed of the random decisions of a run; None draws it from the random module
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import List, Set
+
+from model.intent import Intent
+from model.mars import Mars
+from model.rock import Rock
+
+
+class IntentResolver:
+    """
+    Commits the intents collected during a synchronous step in bulk, deterministically.
+
+    Intents are committed phase by phase in the order of Intent.PHASES, so for example every move lands
+    before any attack. Within a phase they are ordered by a priority derived from the cell each agent
+    started the step in, mixed with a salt drawn once per step, so the outcome does not depend on the
+    order in which agents acted and no cell keeps winning every conflict. Moves without a destination pick
+    one of their options that is still unclaimed, in that same order.
+
+    Conflicts are settled as follows:
+    - Only the first claim on a cell is committed; later moves, pick-ups and rover placements stay put.
+    - Attacks, battery sharing and taking rocks need both agents adjacent once everyone has moved, and
+      the other rover still intact.
+    - Docking needs the rover adjacent to the spacecraft and still carrying a rock.
+
+    Attributes:
+        __rejected_count (int): The number of intents dropped by conflicts so far.
+    """
+    PHASE_OF_KIND = {kind: phase for phase, kinds in enumerate(Intent.PHASES) for kind in kinds}
+    PRIORITY_MULTIPLIER = 2654435761  # Knuth's multiplicative hash, spreading neighbouring cells apart
+
+    def __init__(self) -> None:
+        """Initialise the IntentResolver object."""
+        self.__rejected_count = 0
+
+    def get_rejected_count(self) -> int:
+        """Get the number of intents dropped by conflicts so far."""
+        return self.__rejected_count
+
+    def commit(self, mars: Mars, intents: List[Intent]) -> None:
+        """
+        Apply the intents of a step, settling conflicts.
+
+        Args:
+            mars (Mars): The Mars environment, still as it was when the agents decided.
+            intents (List[Intent]): The intents submitted during the step.
+        """
+        if not intents:
+            return
+        width, height = mars.get_width(), mars.get_height()
+        random_pool = mars.get_random_pool()
+        salt = random_pool.next_value()
+
+        # Priorities are taken before anything moves; the sort is stable, so the intents of one agent
+        # keep the order they were submitted in
+        ordered = []
+        for intent in intents:
+            location = intent.get_agent().get_location()
+            cell = (location.get_y() % height) * width + location.get_x() % width
+            priority = ((cell ^ salt) * IntentResolver.PRIORITY_MULTIPLIER) & 0xFFFFFFFF
+            ordered.append((IntentResolver.PHASE_OF_KIND[intent.get_kind()], priority, intent))
+        ordered.sort(key=lambda entry: entry[:2])
+
+        claimed_cells: Set[int] = set()
+        for _, _, intent in ordered:
+            if intent.get_kind() in Intent.MOVEMENTS:
+                if not self.__claim(mars, intent, claimed_cells):
+                    self.__rejected_count += 1
+                    continue
+            elif not IntentResolver.__is_still_valid(mars, intent):
+                self.__rejected_count += 1
+                continue
+            intent.get_agent().apply_intent(mars, intent)
+
+    @staticmethod
+    def __claim(mars: Mars, intent: Intent, claimed_cells: Set[int]) -> bool:
+        """
+        Claim the destination cell of a movement, picking one from its options if it has none.
+
+        Returns:
+            bool: True if the cell was claimed, False if it was taken.
+        """
+        width, height = mars.get_width(), mars.get_height()
+        type_codes = mars.get_type_codes()
+        # Pick-ups enter a rock cell, every other movement an empty one
+        enterable_code = Rock.TYPE_CODE if intent.get_kind() == Intent.PICK_UP else Mars.EMPTY_CODE
+
+        location = intent.get_location()
+        if location is None:
+            candidates = []
+            for option in intent.get_options() or ():
+                cell = (option.get_y() % height) * width + option.get_x() % width
+                if cell not in claimed_cells and type_codes[cell] == enterable_code:
+                    candidates.append((cell, option))
+            if not candidates:
+                return False
+            cell, location = mars.get_random_pool().choice(candidates)
+            intent.set_location(location)
+        else:
+            cell = (location.get_y() % height) * width + location.get_x() % width
+            if cell in claimed_cells or type_codes[cell] != enterable_code:
+                return False
+        claimed_cells.add(cell)
+        return True
+
+    @staticmethod
+    def __is_still_valid(mars: Mars, intent: Intent) -> bool:
+        """Check whether an intent between two agents still makes sense now that everyone has moved."""
+        kind = intent.get_kind()
+        other = intent.get_other()
+        if kind not in (Intent.ATTACK, Intent.SHARE_BATTERY, Intent.TAKE_ROCK, Intent.DOCK):
+            return True
+        if other.is_destroyed() or mars.get_distance(intent.get_agent().get_location(), other.get_location()) > 1:
+            return False
+        return kind != Intent.DOCK or other.has_rock()
@@ -0,0 +1,114 @@
+import contextlib
+import io
+import random
+import unittest
+from controller.config import Config
+from controller.intent_resolver import IntentResolver
+from model.alien import Alien
+from model.intent import Intent
+from model.location import Location
+from model.mars import Mars
+from model.rover import Rover
+
+
+class TestIntentResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.resolver = IntentResolver()
+
+    def add_rover(self, location):
+        rover = Rover(location, Location(0, 0))
+        self.mars.set_agent(rover, location)
+        self.mars.add_rover(rover)
+        return rover
+
+    def test_submit_applies_right_away_outside_a_synchronous_step(self):
+        rover = self.add_rover(Location(2, 2))
+        self.mars.submit(Intent(rover, Intent.MOVE, Location(3, 2)))
+        self.assertEqual(rover.get_location(), Location(3, 2))
+        self.assertEqual(self.mars.end_intents(), [])
+
+    def test_submit_collects_during_a_synchronous_step(self):
+        rover = self.add_rover(Location(2, 2))
+        self.mars.begin_intents()
+        intent = Intent(rover, Intent.MOVE, Location(3, 2))
+        self.mars.submit(intent)
+        self.assertEqual(rover.get_location(), Location(2, 2))
+        self.assertEqual(self.mars.end_intents(), [intent])
+
+    def test_one_claim_per_cell(self):
+        first = self.add_rover(Location(2, 2))
+        second = self.add_rover(Location(4, 2))
+        self.resolver.commit(self.mars, [Intent(first, Intent.MOVE, Location(3, 2)),
+                                         Intent(second, Intent.MOVE, Location(3, 2))])
+        self.assertIn(self.mars.get_agent(Location(3, 2)), (first, second))
+        self.assertEqual(sorted(rover.get_battery_level() for rover in (first, second)), [95.0, 100.0])
+        self.assertEqual(self.resolver.get_rejected_count(), 1)
+
+    def test_options_skip_claimed_cells(self):
+        rovers = [self.add_rover(Location(x, 2)) for x in (2, 4, 6)]
+        options = [Location(3, 2), Location(5, 2), Location(7, 2)]
+        self.resolver.commit(self.mars, [Intent(rover, Intent.MOVE, options=options) for rover in rovers])
+        self.assertEqual(self.resolver.get_rejected_count(), 0)
+        self.assertEqual({rover.get_location() for rover in rovers}, set(options))
+
+    def test_outcome_independent_of_submission_order(self):
+        outcomes = []
+        for reverse in (False, True):
+            random.seed(11)
+            self.setUp()
+            rovers = [self.add_rover(Location(x, 2)) for x in (2, 4, 6)]
+            intents = [Intent(rover, Intent.MOVE, options=[Location(3, 2), Location(5, 2)]) for rover in rovers]
+            self.resolver.commit(self.mars, intents[::-1] if reverse else intents)
+            outcomes.append([rover.get_location() for rover in rovers])
+        self.assertEqual(outcomes[0], outcomes[1])
+
+    def test_attack_needs_adjacency_after_moves(self):
+        rover = self.add_rover(Location(3, 2))
+        alien = Alien(Location(2, 2))
+        self.mars.set_agent(alien, Location(2, 2))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.resolver.commit(self.mars, [Intent(rover, Intent.MOVE, Location(4, 2)),
+                                             Intent(alien, Intent.ATTACK, other=rover)])
+        self.assertEqual(rover.get_shield(), 100)
+        self.assertEqual(self.resolver.get_rejected_count(), 1)
+
+    def test_pick_up_needs_the_rock(self):
+        first = self.add_rover(Location(2, 2))
+        second = self.add_rover(Location(4, 2))
+        self.mars.place_rock(Location(3, 2))
+        self.resolver.commit(self.mars, [Intent(first, Intent.PICK_UP, Location(3, 2)),
+                                         Intent(second, Intent.PICK_UP, Location(3, 2))])
+        self.assertEqual(sum(rover.has_rock() for rover in (first, second)), 1)
+        self.assertFalse(self.mars.has_rock(Location(3, 2)))
+
+
+class TestSynchronousSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window)
+        Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window = 30, "none", "synchronous", 0
+
+    def tearDown(self):
+        Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window = self.saved
+
+    def run_simulation(self, reverse):
+        from controller.simulator import Simulator
+        random.seed(5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            for _ in range(60):
+                if reverse:
+                    simulator._Simulator__agents.reverse()
+                if not simulator.step():
+                    break
+        return bytes(simulator._Simulator__mars.get_type_codes())
+
+    def test_independent_of_agent_order(self):
+        self.assertEqual(self.run_simulation(False), self.run_simulation(True))
+
+
+if __name__ == '__main__':
+    unittest.main()
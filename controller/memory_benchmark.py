@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import resource
+import subprocess
+import sys
+import tracemalloc
+from typing import Callable, Dict, Sequence
+
+from controller.config import Config
+from model.alien import Alien
+from model.location import Location
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+
+class MemoryBenchmark:
+    """
+    Reports the memory used per agent type and the peak resident set size of whole simulations.
+
+    Per-type sizes are measured with tracemalloc over many instances, and include everything an instance
+    owns, e.g. its Location and the rock memory of a rover. Peak RSS only ever grows within a process, so
+    every world size is simulated in a fresh child process.
+
+    Run with: python -m controller.memory_benchmark
+    """
+    WORLD_SIZES = (20, 100, 500, 1000)
+    INSTANCES = 10000
+
+    @staticmethod
+    def measure_agent_bytes(instances: int = INSTANCES) -> Dict[str, float]:
+        """
+        Measure the average number of bytes allocated per instance of every agent type.
+
+        Args:
+            instances (int): The number of instances to create per type.
+
+        Returns:
+            Dict[str, float]: The bytes per instance, keyed by class name.
+        """
+        factories: Dict[str, Callable[[int], object]] = {
+            Location.__name__: lambda i: Location(i, i),
+            Rock.__name__: lambda i: Rock(Location(i, i)),
+            Alien.__name__: lambda i: Alien(Location(i, i)),
+            Rover.__name__: lambda i: Rover(Location(i, i), Location(0, 0)),
+            Spacecraft.__name__: lambda i: Spacecraft(Location(i, i)),
+        }
+        sizes = {}
+        for name, factory in factories.items():
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            objects = [factory(i) for i in range(instances)]
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            # The list holding the instances is not part of their size
+            sizes[name] = (after - before - sys.getsizeof(objects)) / len(objects)
+        return sizes
+
+    @staticmethod
+    def measure_peak_rss(world_size: int, steps: int, seed: int = 1) -> int:
+        """
+        Build and run a headless simulation and return the peak resident set size of this process.
+
+        Args:
+            world_size (int): The width and height of the world.
+            steps (int): The number of steps to simulate.
+            seed (int): The random seed.
+
+        Returns:
+            int: The peak resident set size in bytes.
+        """
+        from controller.simulator import Simulator
+
+        Config.world_size = world_size
+        Config.renderer = "none"
+        random.seed(seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            for _ in range(steps):
+                if not simulator.step():
+                    break
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    @staticmethod
+    def report(world_sizes: Sequence[int] = WORLD_SIZES, steps: int = 10) -> str:
+        """
+        Measure everything and format the results as a table.
+
+        Args:
+            world_sizes (Sequence[int]): The world sizes to simulate, one child process each.
+            steps (int): The number of steps to simulate per world.
+
+        Returns:
+            str: The report.
+        """
+        lines = ["Bytes per instance"]
+        for name, size in MemoryBenchmark.measure_agent_bytes().items():
+            lines.append(f"  {name:<12}{size:>10.0f}")
+        lines.append(f"Peak RSS after {steps} steps")
+        for world_size in world_sizes:
+            output = subprocess.run([sys.executable, "-m", "controller.memory_benchmark", "--rss",
+                                     str(world_size), "--steps", str(steps)],
+                                    capture_output=True, text=True, check=True).stdout
+            lines.append(f"  {world_size:>5} x {world_size:<5}{int(output) / 2 ** 20:>10.1f} MiB")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report memory used per agent type and per world size.")
+    parser.add_argument("--rss", type=int, metavar="WORLD_SIZE",
+                        help="only print the peak RSS in bytes of one world size")
+    parser.add_argument("--steps", type=int, default=10, help="the number of steps to simulate per world")
+    arguments = parser.parse_args()
+    if arguments.rss:
+        print(MemoryBenchmark.measure_peak_rss(arguments.rss, arguments.steps))
+    else:
+        print(MemoryBenchmark.report(steps=arguments.steps))
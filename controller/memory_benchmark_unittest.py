@@ -0,0 +1,31 @@
+import unittest
+from controller.memory_benchmark import MemoryBenchmark
+from model.alien import Alien
+from model.location import Location
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+
+    def test_agents_have_no_instance_dict(self):
+        for agent in (Location(1, 2), Rock(Location(1, 2)), Alien(Location(1, 2)),
+                      Rover(Location(1, 2), Location(0, 0)), Spacecraft(Location(0, 0))):
+            self.assertFalse(hasattr(agent, "__dict__"), type(agent).__name__)
+
+    def test_private_attributes_stay_reachable(self):
+        rover = Rover(Location(1, 2), Location(0, 0))
+        rover._Rover__battery_level = 42.0
+        self.assertEqual(rover.get_battery_level(), 42.0)
+        self.assertGreater(Rover._Rover__next_id, 1)
+
+    def test_measure_agent_bytes(self):
+        sizes = MemoryBenchmark.measure_agent_bytes(instances=100)
+        self.assertEqual(set(sizes), {"Location", "Rock", "Alien", "Rover", "Spacecraft"})
+        self.assertLess(sizes["Location"], sizes["Rock"])
+        self.assertLess(sizes["Rock"], sizes["Rover"])
+
+
+if __name__ == '__main__':
+    unittest.main()
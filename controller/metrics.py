@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import csv
+from array import array
+from typing import Dict, Iterable, Optional, TYPE_CHECKING
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is only needed for Parquet export
+    pyarrow = None
+
+if TYPE_CHECKING:
+    from model.alien import Alien
+    from model.rover import Rover
+    from model.spacecraft import Spacecraft
+
+
+class MetricsCollector:
+    """
+    Per-step mission statistics kept in columnar form.
+
+    Every series is a preallocated array of doubles that doubles in size when full, so recording a sample
+    writes one value per column without allocating. Samples are taken every few steps, and the columns can
+    be exported to CSV, or to Parquet when pyarrow is installed.
+
+    Attributes:
+        __every (int): The number of steps between two samples.
+        __columns (Dict[str, array]): The preallocated storage of every series.
+        __size (int): The number of samples recorded.
+    """
+    STEP = "step"
+    ROCKS_DELIVERED = "rocks_delivered"
+    LIVE_ROVERS = "live_rovers"
+    MEAN_BATTERY = "mean_battery"
+    MIN_BATTERY = "min_battery"
+    MEAN_SHIELD = "mean_shield"
+    ALIEN_HIBERNATION_RATIO = "alien_hibernation_ratio"
+    PENDING_TARGETS = "pending_targets"
+    COLUMNS = (STEP, ROCKS_DELIVERED, LIVE_ROVERS, MEAN_BATTERY, MIN_BATTERY, MEAN_SHIELD, ALIEN_HIBERNATION_RATIO,
+               PENDING_TARGETS)
+    COUNT_COLUMNS = (STEP, ROCKS_DELIVERED, LIVE_ROVERS, PENDING_TARGETS)  # Written as integers to CSV
+
+    def __init__(self, every: int = 1, capacity: int = 1024) -> None:
+        """
+        Initialise the MetricsCollector object.
+
+        Args:
+            every (int): The number of steps between two samples.
+            capacity (int): The number of samples to preallocate room for.
+
+        Raises:
+            ValueError: If every or capacity is smaller than 1.
+        """
+        if every < 1 or capacity < 1:
+            raise ValueError("Sampling interval and capacity must be at least 1")
+        self.__every = every
+        self.__columns: Dict[str, array] = {name: array("d", bytes(8 * capacity))
+                                            for name in MetricsCollector.COLUMNS}
+        self.__size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples recorded."""
+        return self.__size
+
+    def is_due(self, step: int) -> bool:
+        """Return True if a sample should be recorded at a step."""
+        return step % self.__every == 0
+
+    def record(self, step: int, spacecraft: Optional[Spacecraft], rovers: Iterable[Rover],
+               aliens: Iterable[Alien]) -> bool:
+        """
+        Record a sample if the step is due.
+
+        Args:
+            step (int): The current simulation step.
+            spacecraft (Optional[Spacecraft]): The spacecraft, if any.
+            rovers (Iterable[Rover]): The rovers; destroyed ones are skipped.
+            aliens (Iterable[Alien]): The aliens.
+
+        Returns:
+            bool: True if a sample was recorded.
+        """
+        if not self.is_due(step):
+            return False
+
+        live_rovers = battery_sum = shield_sum = 0
+        min_battery = float("nan")
+        for rover in rovers:
+            if rover.is_destroyed():
+                continue
+            battery = rover.get_battery_level()
+            battery_sum += battery
+            shield_sum += rover.get_shield()
+            if live_rovers == 0 or battery < min_battery:
+                min_battery = battery
+            live_rovers += 1
+        alien_count = hibernating = 0
+        for alien in aliens:
+            alien_count += 1
+            if alien.is_hibernating():
+                hibernating += 1
+
+        self.__reserve()
+        columns, index = self.__columns, self.__size
+        columns[MetricsCollector.STEP][index] = step
+        columns[MetricsCollector.ROCKS_DELIVERED][index] = spacecraft.get_total_rocks_delivered() if spacecraft else 0
+        columns[MetricsCollector.LIVE_ROVERS][index] = live_rovers
+        columns[MetricsCollector.MEAN_BATTERY][index] = battery_sum / live_rovers if live_rovers else float("nan")
+        columns[MetricsCollector.MIN_BATTERY][index] = min_battery
+        columns[MetricsCollector.MEAN_SHIELD][index] = shield_sum / live_rovers if live_rovers else float("nan")
+        columns[MetricsCollector.ALIEN_HIBERNATION_RATIO][index] = hibernating / alien_count if alien_count else 0.0
+        columns[MetricsCollector.PENDING_TARGETS][index] = spacecraft.get_pending_target_count() if spacecraft else 0
+        self.__size += 1
+        return True
+
+    def get_column(self, name: str) -> array:
+        """
+        Get a copy of the recorded values of a series.
+
+        Args:
+            name (str): One of COLUMNS.
+
+        Returns:
+            array: The recorded values as doubles.
+        """
+        return self.__columns[name][:self.__size]
+
+    def export(self, path: str) -> None:
+        """
+        Export the recorded series, as Parquet if the path ends in .parquet and as CSV otherwise.
+
+        Args:
+            path (str): The file to write.
+        """
+        if path.endswith(".parquet"):
+            self.export_parquet(path)
+        else:
+            self.export_csv(path)
+
+    def export_csv(self, path: str) -> None:
+        """
+        Export the recorded series as CSV, one row per sample.
+
+        Args:
+            path (str): The file to write.
+        """
+        columns = [self.__get_values(name) for name in MetricsCollector.COLUMNS]
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(MetricsCollector.COLUMNS)
+            writer.writerows(zip(*columns))
+
+    def export_parquet(self, path: str) -> None:
+        """
+        Export the recorded series as a Parquet file.
+
+        Args:
+            path (str): The file to write.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise ImportError("Exporting Parquet files requires pyarrow")
+        table = pyarrow.table({name: self.__get_values(name) for name in MetricsCollector.COLUMNS})
+        pyarrow.parquet.write_table(table, path)
+
+    def __get_values(self, name: str) -> list:
+        """Get the recorded values of a series, as integers for the count columns."""
+        values = self.get_column(name).tolist()
+        if name in MetricsCollector.COUNT_COLUMNS:
+            return [int(value) for value in values]
+        return values
+
+    def __reserve(self) -> None:
+        """Make room for one more sample, doubling the storage of every column if it is full."""
+        if self.__size == len(self.__columns[MetricsCollector.STEP]):
+            for column in self.__columns.values():
+                column.frombytes(bytes(8 * len(column)))
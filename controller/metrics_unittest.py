@@ -0,0 +1,77 @@
+import csv
+import math
+import os
+import tempfile
+import unittest
+from controller import metrics
+from controller.metrics import MetricsCollector
+from model.alien import Alien
+from model.location import Location
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+
+class TestMetricsCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.spacecraft = Spacecraft(Location(0, 0))
+        self.rovers = [Rover(Location(1, 0), Location(0, 0)), Rover(Location(0, 1), Location(0, 0))]
+        self.rovers[0]._Rover__battery_level = 40.0
+        self.rovers[1].sustain_damage(30)
+        self.aliens = [Alien(Location(5, 5)), Alien(Location(6, 6))]
+        self.aliens[0]._Alien__hibernating = True
+
+    def test_record_sample(self):
+        collector = MetricsCollector()
+        self.assertTrue(collector.record(1, self.spacecraft, self.rovers, self.aliens))
+        self.assertEqual(len(collector), 1)
+        self.assertEqual(collector.get_column(MetricsCollector.LIVE_ROVERS)[0], 2)
+        self.assertEqual(collector.get_column(MetricsCollector.MEAN_BATTERY)[0], 70.0)
+        self.assertEqual(collector.get_column(MetricsCollector.MIN_BATTERY)[0], 40.0)
+        self.assertEqual(collector.get_column(MetricsCollector.MEAN_SHIELD)[0], 85.0)
+        self.assertEqual(collector.get_column(MetricsCollector.ALIEN_HIBERNATION_RATIO)[0], 0.5)
+
+    def test_sampling_interval(self):
+        collector = MetricsCollector(every=5)
+        recorded = [step for step in range(1, 21) if collector.record(step, self.spacecraft, self.rovers, [])]
+        self.assertEqual(recorded, [5, 10, 15, 20])
+        self.assertEqual(collector.get_column(MetricsCollector.STEP).tolist(), [5.0, 10.0, 15.0, 20.0])
+
+    def test_columns_grow(self):
+        collector = MetricsCollector(capacity=2)
+        for step in range(10):
+            collector.record(step, self.spacecraft, self.rovers, self.aliens)
+        self.assertEqual(len(collector.get_column(MetricsCollector.STEP)), 10)
+
+    def test_no_live_rovers(self):
+        collector = MetricsCollector()
+        self.rovers[0].sustain_damage(100)
+        collector.record(1, None, self.rovers[:1], [])
+        self.assertEqual(collector.get_column(MetricsCollector.LIVE_ROVERS)[0], 0)
+        self.assertTrue(math.isnan(collector.get_column(MetricsCollector.MEAN_BATTERY)[0]))
+
+    def test_export_csv(self):
+        collector = MetricsCollector()
+        collector.record(1, self.spacecraft, self.rovers, self.aliens)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.csv")
+            collector.export(path)
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][MetricsCollector.LIVE_ROVERS], "2")
+        self.assertEqual(rows[0][MetricsCollector.MEAN_BATTERY], "70.0")
+
+    @unittest.skipIf(metrics.pyarrow is None, "pyarrow is not installed")
+    def test_export_parquet(self):
+        collector = MetricsCollector()
+        collector.record(1, self.spacecraft, self.rovers, self.aliens)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.parquet")
+            collector.export(path)
+            table = metrics.pyarrow.parquet.read_table(path)
+        self.assertEqual(table.column(MetricsCollector.LIVE_ROVERS).to_pylist(), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,585 @@
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple, TYPE_CHECKING
+
+from controller.intent_resolver import IntentResolver
+from model.alien import Alien
+from model.alien_proximity import AlienProximity
+from model.heatmap import Heatmap
+from model.intent import Intent
+from model.location import Location
+from model.mars import Mars
+from model.random_pool import RandomPool
+
+if TYPE_CHECKING:
+    from model.rover import Rover
+
+
+class RoverSnapshot:
+    """
+    The state of a live rover at the start of a step, as sensed by aliens in a worker process.
+
+    Attributes:
+        __id (int): The ID of the rover.
+        __location (Location): The location of the rover.
+        __shield (int): The shield level of the rover.
+    """
+    __slots__ = ("__id", "__location", "__shield")
+
+    def __init__(self, rover_id: int, location: Location, shield: int) -> None:
+        """
+        Initialise the RoverSnapshot object.
+
+        Args:
+            rover_id (int): The ID of the rover.
+            location (Location): The location of the rover.
+            shield (int): The shield level of the rover.
+        """
+        self.__id = rover_id
+        self.__location = location
+        self.__shield = shield
+
+    def get_id(self) -> int:
+        """Get the ID of the rover."""
+        return self.__id
+
+    def get_location(self) -> Location:
+        """Get the location of the rover."""
+        return self.__location
+
+    def get_shield(self) -> int:
+        """Get the shield level of the rover."""
+        return self.__shield
+
+    @staticmethod
+    def is_destroyed() -> bool:
+        """Only live rovers are snapshotted."""
+        return False
+
+
+class BandAlien(Alien):
+    """
+    An alien materialised from its row of the shared alien table while it decides or moves.
+
+    Aliens kept in the table have no object in the Mars grid, so moving one only changes type codes.
+
+    Attributes:
+        __row (int): The table row of the alien.
+    """
+    __slots__ = ("__row",)
+
+    def __init__(self, location: Location, row: int) -> None:
+        """
+        Initialise the BandAlien object.
+
+        Args:
+            location (Location): The location of the alien.
+            row (int): The table row of the alien.
+        """
+        super().__init__(location)
+        self.__row = row
+
+    def get_row(self) -> int:
+        """Get the table row of the alien."""
+        return self.__row
+
+    def apply_intent(self, mars: Mars, intent: Intent) -> None:
+        """
+        Carry out an intent the alien submitted while acting.
+
+        Args:
+            mars (Mars): The Mars environment, or the TileView of a worker process.
+            intent (Intent): The intent to carry out.
+        """
+        kind = intent.get_kind()
+        if kind not in (Intent.MOVE, Intent.CHASE):
+            super().apply_intent(mars, intent)
+            return
+        location = intent.get_location()
+        mars.set_type_code(self.get_location(), Mars.EMPTY_CODE)
+        mars.set_type_code(location, Alien.TYPE_CODE)
+        self.set_location(location)
+        mars.get_heatmap().record_alien_move(location.get_x(), location.get_y())
+        if kind == Intent.CHASE:
+            self.set_state(self.get_energy() - 20, self.is_hibernating())
+
+
+class AlienVisits:
+    """
+    The alien-visits layer of the heatmap, as recorded into the shared block by a worker process.
+
+    Attributes:
+        __counters (memoryview): The counters of all cells in row-major order.
+        __width (int): The width of the world.
+        __height (int): The height of the world.
+    """
+
+    def __init__(self, counters: memoryview, width: int, height: int) -> None:
+        """
+        Initialise the AlienVisits object.
+
+        Args:
+            counters (memoryview): The counters of all cells in row-major order.
+            width (int): The width of the world.
+            height (int): The height of the world.
+        """
+        self.__counters = counters
+        self.__width = width
+        self.__height = height
+
+    def record_alien_move(self, x: int, y: int) -> None:
+        """Count an alien entering a cell."""
+        self.__counters[(y % self.__height) * self.__width + x % self.__width] += 1
+
+
+class TileView:
+    """
+    The part of the Mars interface aliens use in a worker process, backed by the shared occupancy grid.
+
+    Intents submitted by the aliens are collected, never applied; an IntentResolver commits them through the
+    view, which records the cells it changes.
+
+    Attributes:
+        __grid (memoryview): The type codes of all cells in row-major order.
+        __width (int): The width of the world.
+        __height (int): The height of the world.
+        __heatmap (Optional[AlienVisits]): The counters alien moves are recorded in.
+        __random_pool (Optional[RandomPool]): The source of the random picks made while committing.
+        __intents (List[Intent]): The intents submitted since they were last taken.
+        __changed_cells (array): The row-major indices of the cells changed since they were last taken.
+    """
+    DIRECTIONS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, grid: memoryview, width: int, height: int, heatmap: Optional[AlienVisits] = None,
+                 random_pool: Optional[RandomPool] = None) -> None:
+        """
+        Initialise the TileView object.
+
+        Args:
+            grid (memoryview): The type codes of all cells in row-major order.
+            width (int): The width of the world.
+            height (int): The height of the world.
+            heatmap (Optional[AlienVisits]): The counters alien moves are recorded in, if any are committed.
+            random_pool (Optional[RandomPool]): The source of the random picks, if any intents are committed.
+        """
+        self.__grid = grid
+        self.__width = width
+        self.__height = height
+        self.__heatmap = heatmap
+        self.__random_pool = random_pool
+        self.__intents: List[Intent] = []
+        self.__changed_cells = array("i")
+
+    def get_width(self) -> int:
+        """Get the width of the world."""
+        return self.__width
+
+    def get_height(self) -> int:
+        """Get the height of the world."""
+        return self.__height
+
+    def get_type_codes(self) -> memoryview:
+        """Get the shared occupancy grid."""
+        return self.__grid
+
+    def get_heatmap(self) -> Optional[AlienVisits]:
+        """Get the counters alien moves are recorded in."""
+        return self.__heatmap
+
+    def get_random_pool(self) -> Optional[RandomPool]:
+        """Get the source of the random picks made while committing."""
+        return self.__random_pool
+
+    def get_adjacent_locations(self, location: Location) -> List[Location]:
+        """Get the eight neighbours of a location in the same order as Mars, wrapping around the edges."""
+        x, y = location.get_x(), location.get_y()
+        return [Location((x + dx) % self.__width, (y + dy) % self.__height) for dx, dy in TileView.DIRECTIONS]
+
+    def get_free_adjacent_locations(self, location: Location) -> List[Location]:
+        """Get the neighbours of a location that hold no agent and no rock."""
+        grid, width = self.__grid, self.__width
+        return [adjacent for adjacent in self.get_adjacent_locations(location)
+                if grid[adjacent.get_y() * width + adjacent.get_x()] == 0]
+
+    def set_type_code(self, location: Location, type_code: int) -> None:
+        """Change the type code of a cell in the shared grid."""
+        index = (location.get_y() % self.__height) * self.__width + location.get_x() % self.__width
+        self.__grid[index] = type_code
+        self.__changed_cells.append(index)
+
+    def submit(self, intent: Intent) -> None:
+        """Collect an intent."""
+        self.__intents.append(intent)
+
+    def take_intents(self) -> List[Intent]:
+        """Get and forget the intents submitted since the last call."""
+        intents, self.__intents = self.__intents, []
+        return intents
+
+    def take_changed_cells(self) -> array:
+        """Get and forget the cells changed since the last call."""
+        changed_cells, self.__changed_cells = self.__changed_cells, array("i")
+        return changed_cells
+
+
+class ParallelStepper:
+    """
+    Keeps the aliens in shared memory and lets worker processes decide and move them, one horizontal band of
+    the torus each.
+
+    Aliens are by far the most numerous agents on large maps, so in parallel mode the simulator's process
+    keeps no objects for them. The occupancy grid of Mars, the alien-visits layer of its heatmap and a table
+    with one row per alien live in shared blocks for the whole run; Mars and the workers read and change
+    them in place, so a step copies nothing per alien between the processes.
+
+    The table has one region per band. Every step each worker decides for the aliens of its region against
+    the world as it was at the start of the step, then commits the moves of its interior aliens with an
+    IntentResolver of its own, seeded from the random pool of Mars. Interior aliens start at least
+    EDGE_ROWS rows away from both edges of their band, so they only read and write cells of their band,
+    and never the edge rows the neighbouring workers read. The simulator's process then commits the
+    intents of the other agents together with the moves of the edge aliens and all alien attacks, which
+    need the final positions of everyone, and hands the rows of aliens that crossed into another band over
+    to its region.
+
+    Only the edge aliens, the attackers and the other agents are handled serially, so the serial share of
+    a step shrinks as the bands grow taller. Interior aliens move before any other agent, so runs are
+    repeatable for a given number of workers, but differ from single-process runs and from runs with
+    another number of workers.
+
+    Attributes:
+        __mars (Mars): The Mars environment, whose grid and alien visits live in the shared blocks.
+        __width (int): The width of the world.
+        __height (int): The height of the world.
+        __workers (int): The number of worker processes and bands.
+        __grid (SharedMemory): The block holding the occupancy grid.
+        __visits (SharedMemory): The block holding the alien-visits layer of the heatmap.
+        __table (Optional[SharedMemory]): The block holding the alien table, replaced when a region is full.
+        __capacity (int): The number of rows in every region of the table.
+        __counts (List[int]): The number of aliens in every region.
+        __executor (ProcessPoolExecutor): The worker processes.
+    """
+    HALO_ROWS = 3  # The sensing radius of the aliens
+    EDGE_ROWS = 2  # Aliens this close to an edge of their band are moved by the simulator's process
+
+    # The columns of the alien table. Location, energy and hibernation are kept up to date; the intent
+    # columns hold what an edge alien wants, and the rover an alien attacks, until they are committed
+    X, Y, ENERGY, HIBERNATING, MOVE_KIND, MOVE_CELL, OPTION_MASK, ATTACK_ID = range(8)
+    COLUMNS = 8
+    MOVE_KINDS = (None, Intent.MOVE, Intent.CHASE)  # Indexed by the MOVE_KIND column
+    # The kinds committed before any movement, which still see the world as it was at the start of the step
+    EARLY_KINDS = frozenset(kind for kinds in Intent.PHASES[:Intent.PHASES.index(Intent.MOVEMENTS)] for kind in kinds)
+
+    __attached: Dict[str, SharedMemory] = {}  # The shared block a worker process is attached to, by role
+    __devnull: Optional[TextIO] = None  # The stream a worker process reports to
+
+    def __init__(self, mars: Mars, aliens: Sequence[Alien], workers: int) -> None:
+        """
+        Initialise the ParallelStepper object, move Mars and the aliens into shared memory and start the workers.
+
+        The aliens are replaced by type codes in the Mars grid; their objects are no longer used.
+
+        Args:
+            mars (Mars): The Mars environment.
+            aliens (Sequence[Alien]): All aliens.
+            workers (int): The number of worker processes and bands.
+        """
+        self.__mars = mars
+        self.__width = width = mars.get_width()
+        self.__height = height = mars.get_height()
+        self.__workers = max(1, min(workers, height))
+        self.__grid = SharedMemory(create=True, size=width * height)
+        mars.share_type_codes(self.__grid.buf)
+        itemsize = array(Heatmap.TYPECODES[Heatmap.ALIEN_VISITS]).itemsize
+        self.__visits = SharedMemory(create=True, size=width * height * itemsize)
+        mars.get_heatmap().share_layer(Heatmap.ALIEN_VISITS, self.__visits.buf)
+
+        bands: List[List[Alien]] = [[] for _ in range(self.__workers)]
+        for alien in aliens:
+            bands[self.__band_of(alien.get_location().get_y())].append(alien)
+            mars.set_type_code(alien.get_location(), Alien.TYPE_CODE)
+        self.__table: Optional[SharedMemory] = None
+        self.__capacity = 0
+        self.__counts = [0] * self.__workers
+        self.__reserve(max(len(band) for band in bands))
+        table, columns = self.__table.buf.cast("i"), ParallelStepper.COLUMNS
+        for band, band_aliens in enumerate(bands):
+            for offset, alien in enumerate(band_aliens):
+                base = (band * self.__capacity + offset) * columns
+                table[base + ParallelStepper.X] = alien.get_location().get_x() % width
+                table[base + ParallelStepper.Y] = alien.get_location().get_y() % height
+                table[base + ParallelStepper.ENERGY] = alien.get_energy()
+                table[base + ParallelStepper.HIBERNATING] = alien.is_hibernating()
+            self.__counts[band] = len(band_aliens)
+        table.release()
+
+        # Spawned rather than forked, so workers never inherit the threads of the frame exporter or diff server
+        self.__executor = ProcessPoolExecutor(self.__workers, mp_context=get_context("spawn"),
+                                              initializer=ParallelStepper.initialise_worker)
+
+    def get_worker_count(self) -> int:
+        """Get the number of worker processes and bands."""
+        return self.__workers
+
+    def get_aliens(self) -> List[Alien]:
+        """
+        Materialise the aliens from the table, e.g. for metrics.
+
+        Returns:
+            List[Alien]: Copies of the aliens, band by band; changing them changes nothing.
+        """
+        table, columns = self.__table.buf.cast("i"), ParallelStepper.COLUMNS
+        aliens = []
+        for band, count in enumerate(self.__counts):
+            for row in range(band * self.__capacity, band * self.__capacity + count):
+                base = row * columns
+                alien = Alien(Location(table[base + ParallelStepper.X], table[base + ParallelStepper.Y]))
+                alien.set_state(table[base + ParallelStepper.ENERGY], bool(table[base + ParallelStepper.HIBERNATING]))
+                aliens.append(alien)
+        table.release()
+        return aliens
+
+    def step(self, intents: List[Intent], resolver: IntentResolver, rovers: Sequence[Rover],
+             spacecraft_location: Optional[Location]) -> None:
+        """
+        Let the aliens decide and move in the workers, then commit everything else.
+
+        Args:
+            intents (List[Intent]): The intents of the other agents, decided against the world as it was at the
+                start of the step.
+            resolver (IntentResolver): Commits the intents handled in the simulator's process.
+            rovers (Sequence[Rover]): The live rovers.
+            spacecraft_location (Optional[Location]): The location of the spacecraft, if any.
+        """
+        mars, width, height = self.__mars, self.__width, self.__height
+        resolver.commit(mars, [intent for intent in intents if intent.get_kind() in ParallelStepper.EARLY_KINDS])
+        intents = [intent for intent in intents if intent.get_kind() not in ParallelStepper.EARLY_KINDS]
+
+        rover_rows = tuple((rover.get_id(), rover.get_location().get_x() % width,
+                            rover.get_location().get_y() % height, rover.get_shield())
+                           for rover in sorted(rovers, key=lambda rover: rover.get_id()))
+        spacecraft = None
+        if spacecraft_location is not None:
+            spacecraft = (spacecraft_location.get_x() % width, spacecraft_location.get_y() % height)
+        random_pool = mars.get_random_pool()
+        futures = []
+        for band, count in enumerate(self.__counts):
+            # Drawn for empty bands too, so the draws do not depend on where the aliens are
+            seed = random_pool.next_value()
+            if count:
+                futures.append(self.__executor.submit(
+                    ParallelStepper.step_band, self.__grid.name, self.__table.name, self.__visits.name, width,
+                    height, self.__workers, band, band * self.__capacity, count, rover_rows, spacecraft, seed))
+        pending_rows = []
+        for future in futures:
+            rows, changed_cells = future.result()
+            pending_rows.extend(rows)
+            mars.mark_changed(changed_cells)
+
+        rovers_by_id = {rover.get_id(): rover for rover in rovers}
+        table, columns = self.__table.buf.cast("i"), ParallelStepper.COLUMNS
+        aliens = []
+        for row in pending_rows:
+            base = row * columns
+            x, y = table[base + ParallelStepper.X], table[base + ParallelStepper.Y]
+            alien = BandAlien(Location(x, y), row)
+            alien.set_state(table[base + ParallelStepper.ENERGY], bool(table[base + ParallelStepper.HIBERNATING]))
+            aliens.append(alien)
+            kind = ParallelStepper.MOVE_KINDS[table[base + ParallelStepper.MOVE_KIND]]
+            if kind is not None:
+                cell = table[base + ParallelStepper.MOVE_CELL]
+                if cell >= 0:
+                    intents.append(Intent(alien, kind, Location(cell % width, cell // width)))
+                else:
+                    mask = table[base + ParallelStepper.OPTION_MASK]
+                    options = [Location((x + dx) % width, (y + dy) % height)
+                               for bit, (dx, dy) in enumerate(TileView.DIRECTIONS) if mask >> bit & 1]
+                    intents.append(Intent(alien, kind, options=options))
+            rover_id = table[base + ParallelStepper.ATTACK_ID]
+            if rover_id:
+                intents.append(Intent(alien, Intent.ATTACK, other=rovers_by_id[rover_id]))
+        resolver.commit(mars, intents)
+
+        handoffs = []
+        for alien in aliens:
+            row, location = alien.get_row(), alien.get_location()
+            base = row * columns
+            table[base + ParallelStepper.X] = location.get_x() % width
+            table[base + ParallelStepper.Y] = location.get_y() % height
+            table[base + ParallelStepper.ENERGY] = alien.get_energy()
+            band = self.__band_of(location.get_y() % height)
+            if band != row // self.__capacity:
+                handoffs.append((row % self.__capacity, row // self.__capacity, band))
+        table.release()
+        if handoffs:
+            self.__hand_over(handoffs)
+
+    def close(self) -> None:
+        """Stop the worker processes and move the grid and the alien visits of Mars out of shared memory."""
+        self.__executor.shutdown()
+        self.__mars.share_type_codes(None)
+        self.__mars.get_heatmap().share_layer(Heatmap.ALIEN_VISITS, None)
+        for memory in (self.__grid, self.__visits, self.__table):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+        self.__table = None
+
+    def __band_of(self, y: int) -> int:
+        """Get the band a row of the world belongs to."""
+        return y * self.__workers // self.__height
+
+    def __hand_over(self, handoffs: List[Tuple[int, int, int]]) -> None:
+        """
+        Move the rows of aliens that crossed into another band to the region of that band.
+
+        Args:
+            handoffs (List[Tuple[int, int, int]]): The offset of the row in its region, the band it is in and
+                the band it moves to, for every alien handed over.
+        """
+        counts = self.__counts
+        incoming = [0] * self.__workers
+        for _, _, band in handoffs:
+            incoming[band] += 1
+        self.__reserve(max(count + extra for count, extra in zip(counts, incoming)))
+
+        capacity, columns = self.__capacity, ParallelStepper.COLUMNS
+        table = self.__table.buf.cast("i")
+        # Leaving rows are filled with the last row of their region, so later offsets are handled first
+        for offset, source, band in sorted(handoffs, reverse=True):
+            row, target = source * capacity + offset, band * capacity + counts[band]
+            table[target * columns:(target + 1) * columns] = table[row * columns:(row + 1) * columns]
+            counts[band] += 1
+            counts[source] -= 1
+            last = source * capacity + counts[source]
+            table[row * columns:(row + 1) * columns] = table[last * columns:(last + 1) * columns]
+        table.release()
+
+    def __reserve(self, capacity: int) -> None:
+        """Make sure every region of the table has a row for that many aliens, replacing the table if not."""
+        if capacity <= self.__capacity and self.__table is not None:
+            return
+        capacity = max(capacity, 2 * self.__capacity, 1)
+        columns = ParallelStepper.COLUMNS
+        table = SharedMemory(create=True, size=self.__workers * capacity * columns * 4)
+        if self.__table is not None:
+            old, new = self.__table.buf.cast("i"), table.buf.cast("i")
+            for band, count in enumerate(self.__counts):
+                start, target = band * self.__capacity * columns, band * capacity * columns
+                new[target:target + count * columns] = old[start:start + count * columns]
+            old.release()
+            new.release()
+            self.__table.close()
+            self.__table.unlink()
+        self.__table, self.__capacity = table, capacity
+
+    @staticmethod
+    def initialise_worker() -> None:
+        """Set up a worker process."""
+        # Aliens report to standard output; reports interleaved from several processes are unreadable
+        ParallelStepper.__devnull = sys.stdout = open(os.devnull, "w")
+        Finalize(None, ParallelStepper.__devnull.close, exitpriority=0)
+
+    @staticmethod
+    def step_band(grid_name: str, table_name: str, visits_name: str, width: int, height: int, workers: int,
+                  band: int, start: int, count: int, rover_rows: Tuple[Tuple[int, int, int, int], ...],
+                  spacecraft: Optional[Tuple[int, int]], seed: int) -> Tuple[List[int], array]:
+        """
+        Sense and decide for the aliens of a band, and commit the moves of its interior aliens; runs in a worker.
+
+        Args:
+            grid_name (str): The name of the shared occupancy grid.
+            table_name (str): The name of the shared alien table.
+            visits_name (str): The name of the shared alien-visits layer.
+            width (int): The width of the world.
+            height (int): The height of the world.
+            workers (int): The number of bands.
+            band (int): The band to step.
+            start (int): The first table row of the band.
+            count (int): The number of aliens in the band.
+            rover_rows (Tuple[Tuple[int, int, int, int], ...]): The ID, column, row and shield of every live
+                rover, by ID.
+            spacecraft (Optional[Tuple[int, int]]): The column and row of the spacecraft, if any.
+            seed (int): The seed of the random picks made while committing.
+
+        Returns:
+            Tuple[List[int], array]: The table rows of the aliens left for the simulator's process, edge aliens
+            that want to move and aliens that attack, and the cells changed in the grid.
+        """
+        table, columns = ParallelStepper.__attach("table", table_name).buf.cast("i"), ParallelStepper.COLUMNS
+        visits = ParallelStepper.__attach("visits", visits_name).buf.cast(Heatmap.TYPECODES[Heatmap.ALIEN_VISITS])
+        view = TileView(ParallelStepper.__attach("grid", grid_name).buf, width, height,
+                        AlienVisits(visits, width, height), RandomPool(seed))
+        rovers = [RoverSnapshot(rover_id, Location(x, y), shield) for rover_id, x, y, shield in rover_rows]
+        spacecraft_location = Location(*spacecraft) if spacecraft is not None else None
+        # A single band wraps onto itself and has no neighbours, so all of its aliens are interior
+        edge = ParallelStepper.EDGE_ROWS if workers > 1 else 0
+        top = -(-band * height // workers) + edge
+        bottom = -(-(band + 1) * height // workers) - edge
+
+        aliens = []
+        for row in range(start, start + count):
+            base = row * columns
+            alien = BandAlien(Location(table[base + ParallelStepper.X], table[base + ParallelStepper.Y]), row)
+            alien.set_state(table[base + ParallelStepper.ENERGY], bool(table[base + ParallelStepper.HIBERNATING]))
+            aliens.append(alien)
+        awake = [alien for alien in aliens if not alien.is_hibernating()]
+        for alien, (nearest_rover, sensed_spacecraft_location) in zip(
+                awake, AlienProximity(ParallelStepper.HALO_ROWS).query(view, awake, rovers, spacecraft_location)):
+            alien.sense(nearest_rover, sensed_spacecraft_location)
+
+        # Every alien decides before any interior alien moves
+        moves, pending_rows = [], []
+        for alien in aliens:
+            alien.act(view)
+            base = alien.get_row() * columns
+            interior = top <= alien.get_location().get_y() < bottom
+            table[base + ParallelStepper.MOVE_KIND] = 0
+            table[base + ParallelStepper.ATTACK_ID] = 0
+            intents = view.take_intents()
+            for intent in intents:
+                if intent.get_kind() == Intent.ATTACK:
+                    table[base + ParallelStepper.ATTACK_ID] = intent.get_other().get_id()
+                elif interior:
+                    moves.append(intent)
+                else:
+                    table[base + ParallelStepper.MOVE_KIND] = ParallelStepper.MOVE_KINDS.index(intent.get_kind())
+                    location = intent.get_location()
+                    if location is not None:
+                        cell = location.get_y() % height * width + location.get_x() % width
+                        table[base + ParallelStepper.MOVE_CELL] = cell
+                    else:
+                        options = intent.get_options()
+                        table[base + ParallelStepper.MOVE_CELL] = -1
+                        table[base + ParallelStepper.OPTION_MASK] = sum(
+                            1 << bit for bit, adjacent in enumerate(view.get_adjacent_locations(alien.get_location()))
+                            if adjacent in options)
+            if table[base + ParallelStepper.ATTACK_ID] or (intents and not interior):
+                pending_rows.append(alien.get_row())
+        IntentResolver().commit(view, moves)
+
+        for alien in aliens:
+            base = alien.get_row() * columns
+            table[base + ParallelStepper.X] = alien.get_location().get_x() % width
+            table[base + ParallelStepper.Y] = alien.get_location().get_y() % height
+            table[base + ParallelStepper.ENERGY] = alien.get_energy()
+            table[base + ParallelStepper.HIBERNATING] = alien.is_hibernating()
+        visits.release()
+        table.release()
+        return pending_rows, view.take_changed_cells()
+
+    @staticmethod
+    def __attach(role: str, name: str) -> SharedMemory:
+        """Attach to the shared block of a role once per worker process, detaching from one it replaced."""
+        memory = ParallelStepper.__attached.get(role)
+        if memory is None or memory.name != name:
+            if memory is not None:
+                memory.close()
+            memory = ParallelStepper.__attached[role] = SharedMemory(name=name)
+        return memory
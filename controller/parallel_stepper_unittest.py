@@ -0,0 +1,112 @@
+import contextlib
+import io
+import random
+import unittest
+from controller.config import Config
+from controller.intent_resolver import IntentResolver
+from controller.parallel_stepper import ParallelStepper, TileView
+from model.alien import Alien
+from model.heatmap import Heatmap
+from model.location import Location
+from model.mars import Mars
+
+
+class TestTileView(unittest.TestCase):
+
+    def test_free_adjacent_locations_wrap(self):
+        grid = bytearray(16)
+        grid[1] = 3  # An alien at (1, 0)
+        grid[12] = 4  # A rock at (0, 3)
+        view = TileView(memoryview(grid), 4, 4)
+        free = view.get_free_adjacent_locations(Location(0, 0))
+        self.assertEqual(len(free), 6)
+        self.assertNotIn(Location(1, 0), free)
+        self.assertNotIn(Location(0, 3), free)
+        self.assertIn(Location(3, 3), free)
+
+    def test_collects_intents(self):
+        view = TileView(memoryview(bytearray(4)), 2, 2)
+        view.submit("intent")
+        self.assertEqual(view.take_intents(), ["intent"])
+        self.assertEqual(view.take_intents(), [])
+
+
+class TestParallelSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window,
+                      Config.parallel_workers)
+        Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window = 40, "none", "synchronous", 0
+
+    def tearDown(self):
+        (Config.world_size, Config.renderer, Config.update_mode, Config.stalemate_window,
+         Config.parallel_workers) = self.saved
+
+    @staticmethod
+    def run_simulation(workers):
+        from controller.simulator import Simulator
+        Config.parallel_workers = workers
+        random.seed(3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            try:
+                for _ in range(40):
+                    if not simulator.step():
+                        break
+            finally:
+                simulator.close()
+        mars = simulator._Simulator__mars
+        return bytes(mars.get_type_codes()), bytes(mars.get_heatmap().get_layer(Heatmap.ALIEN_VISITS))
+
+    def test_repeatable_for_a_number_of_workers(self):
+        type_codes, visits = self.run_simulation(2)
+        self.assertEqual((type_codes, visits), self.run_simulation(2))
+        # Aliens only move, so there are as many as in a single-process run, and they were recorded moving
+        self.assertEqual(type_codes.count(Alien.TYPE_CODE), self.run_simulation(0)[0].count(Alien.TYPE_CODE))
+        self.assertGreater(sum(memoryview(visits).cast("I")), 0)
+
+    def test_rollouts_need_alien_objects(self):
+        from controller.simulator import Simulator
+        saved = Config.rollout_candidates
+        Config.rollout_candidates, Config.parallel_workers = 2, 2
+        try:
+            with self.assertRaises(ValueError):
+                Simulator()
+        finally:
+            Config.rollout_candidates = saved
+
+    def test_hands_over_an_alien_leaving_its_band(self):
+        mars = Mars()
+        mars.clear()
+        # Rocks leave an alien on the last row of the first band no way but into the second band
+        for x, y in ((4, 18), (5, 18), (6, 18), (4, 19), (6, 19)):
+            mars.place_rock(Location(x, y))
+        leaving, staying = Alien(Location(5, 19)), Alien(Location(30, 30))
+        for alien in (leaving, staying):
+            mars.set_agent(alien, alien.get_location())
+        stepper = ParallelStepper(mars, [leaving, staying], 2)
+        try:
+            self.assertIsNone(mars.get_agent(Location(5, 19)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                stepper.step([], IntentResolver(), [], None)
+            # The second region was full, so the table was replaced and the workers must follow
+            moved = stepper.get_aliens()
+            self.assertEqual(len(moved), 2)
+            self.assertEqual(moved[1].get_location().get_y(), 20)
+            self.assertEqual(mars.get_type_code(Location(5, 19)), Mars.EMPTY_CODE)
+            self.assertEqual(mars.get_type_code(moved[1].get_location()), Alien.TYPE_CODE)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                stepper.step([], IntentResolver(), [], None)
+            type_codes = bytes(mars.get_type_codes())
+            aliens = stepper.get_aliens()
+            self.assertEqual(type_codes.count(Alien.TYPE_CODE), 2)
+            for alien in aliens:
+                self.assertEqual(mars.get_type_code(alien.get_location()), Alien.TYPE_CODE)
+        finally:
+            stepper.close()
+        self.assertEqual(bytes(mars.get_type_codes()), type_codes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from controller.rover_policy import BatchedRoverPolicy
+from model.observation_windows import ObservationWindows
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyServer:
+    """
+    Serves a rover policy to many simulations, deciding for their requests in shared batches.
+
+    Simulations connect with a RemotePolicy, e.g. from other processes, and send the observations of their
+    rovers. The server waits up to max_delay after the first pending request for others to arrive, joins
+    the observations of all pending requests with the same window size, calls the policy once for all of
+    them, and sends every simulation its share of the actions. A model behind the server therefore sees
+    batches as large as the number of rovers of all connected simulations.
+
+    Every request is framed as REQUEST_HEADER (rovers, window side) followed by the windows, one byte per
+    cell, and the vitals, three little-endian 32-bit floats per rover. Every reply is REPLY_HEADER (rovers)
+    followed by one action byte per rover. A connection has at most one request pending.
+
+    The policy runs on the event loop, so requests arriving while it decides wait for the next batch. When
+    the policy fails, the error is logged to this module's logger and the connections of the batch are
+    closed.
+
+    Attributes:
+        __policy (BatchedRoverPolicy): The policy deciding the batches.
+        __port (int): The port to listen on, 0 for any free one.
+        __max_delay (float): The seconds to wait for more requests before deciding a batch.
+        __max_batch (int): The number of rovers above which no more requests join a batch.
+        __server (Optional[asyncio.AbstractServer]): The listening server once started.
+        __queue (Optional[asyncio.Queue]): The pending requests.
+        __batcher (Optional[asyncio.Task]): The task deciding the batches.
+        __batch_count (int): The number of times the policy has decided so far.
+    """
+    HOST = "127.0.0.1"
+    REQUEST_HEADER = struct.Struct("!II")
+    REPLY_HEADER = struct.Struct("!I")
+    VITAL_SIZE = 4  # Bytes per float
+
+    def __init__(self, policy: BatchedRoverPolicy, port: int = 0, max_delay: float = 0.001,
+                 max_batch: int = 4096) -> None:
+        """
+        Initialise the PolicyServer object.
+
+        Args:
+            policy (BatchedRoverPolicy): The policy deciding the batches.
+            port (int): The port to listen on, 0 for any free one.
+            max_delay (float): The seconds to wait for more requests before deciding a batch.
+            max_batch (int): The number of rovers above which no more requests join a batch.
+        """
+        self.__policy = policy
+        self.__port = port
+        self.__max_delay = max_delay
+        self.__max_batch = max_batch
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__batcher: Optional[asyncio.Task] = None
+        self.__batch_count = 0
+
+    def get_port(self) -> int:
+        """Get the port the server listens on; only known once started."""
+        return self.__server.sockets[0].getsockname()[1]
+
+    def get_batch_count(self) -> int:
+        """Get the number of times the policy has decided so far."""
+        return self.__batch_count
+
+    async def start(self) -> None:
+        """Start listening and deciding batches on the running event loop."""
+        self.__queue = asyncio.Queue()
+        self.__batcher = asyncio.create_task(self.__run_batches())
+        self.__server = await asyncio.start_server(self.__handle, PolicyServer.HOST, self.__port)
+
+    async def serve_forever(self) -> None:
+        """Start the server and serve until cancelled, e.g. as asyncio.run(server.serve_forever())."""
+        await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening and deciding batches."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            await asyncio.gather(self.__batcher, return_exceptions=True)
+            self.__batcher = None
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one connection until it closes."""
+        try:
+            while True:
+                count, side = PolicyServer.REQUEST_HEADER.unpack(
+                    await reader.readexactly(PolicyServer.REQUEST_HEADER.size))
+                windows = await reader.readexactly(count * side * side)
+                vitals = await reader.readexactly(count * ObservationWindows.VITALS * PolicyServer.VITAL_SIZE)
+                actions = b""
+                if count:
+                    future = asyncio.get_running_loop().create_future()
+                    self.__queue.put_nowait((count, side, windows, vitals, future))
+                    try:
+                        actions = await future
+                    except Exception:
+                        # Closing the connection tells the client that its batch failed; __decide logged why
+                        break
+                writer.write(PolicyServer.REPLY_HEADER.pack(count) + actions)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # The client went away
+        finally:
+            writer.close()
+
+    async def __run_batches(self) -> None:
+        """Decide the pending requests in batches, forever."""
+        queue = self.__queue
+        while True:
+            requests = [await queue.get()]
+            # Give the other simulations a moment to join the batch
+            await asyncio.sleep(self.__max_delay)
+            rovers = requests[0][0]
+            while not queue.empty() and rovers < self.__max_batch:
+                requests.append(queue.get_nowait())
+                rovers += requests[-1][0]
+
+            by_side: Dict[int, List[Tuple[int, int, bytes, bytes, asyncio.Future]]] = {}
+            for request in requests:
+                by_side.setdefault(request[1], []).append(request)
+            for side, batch in by_side.items():
+                self.__decide(side, batch)
+
+    def __decide(self, side: int, batch: List[Tuple[int, int, bytes, bytes, asyncio.Future]]) -> None:
+        """Call the policy once for a batch of requests with the same window size and answer each of them."""
+        total = sum(request[0] for request in batch)
+        windows = memoryview(b"".join(request[2] for request in batch)).cast("B", (total, side, side))
+        vitals = array("f")
+        vitals.frombytes(b"".join(request[3] for request in batch))
+        if sys.byteorder == "big":
+            vitals.byteswap()
+        try:
+            actions = bytes(int(action) for action in
+                            self.__policy.decide(windows, memoryview(vitals).cast("B").cast(
+                                "f", (total, ObservationWindows.VITALS))))
+            if len(actions) != total:
+                raise ValueError(f"Expected {total} actions, got {len(actions)}")
+        except Exception as error:
+            logger.error("Rover policy failed on a batch of %d rovers", total, exc_info=error)
+            for request in batch:
+                if not request[4].done():
+                    request[4].set_exception(error)
+            return
+        self.__batch_count += 1
+        position = 0
+        for count, _, _, _, future in batch:
+            # The handler awaiting the future may have been cancelled in the meantime
+            if not future.done():
+                future.set_result(actions[position:position + count])
+            position += count
+
+
+class RemotePolicy(BatchedRoverPolicy):
+    """
+    A rover policy that asks a PolicyServer for the actions of every batch, e.g. a model in another process.
+
+    Simulations driven from synchronous code call decide, which runs the request on an event loop of the
+    policy's own. Code already running on an event loop awaits decide_async instead; a RemotePolicy sticks
+    to the loop it first connected from.
+
+    Attributes:
+        __host (str): The host of the server.
+        __port (int): The port of the server.
+        __loop (Optional[asyncio.AbstractEventLoop]): The event loop decide runs requests on.
+        __reader (Optional[asyncio.StreamReader]): The connection to the server, once open.
+        __writer (Optional[asyncio.StreamWriter]): The connection to the server, once open.
+    """
+
+    def __init__(self, port: int, host: str = PolicyServer.HOST, radius: Optional[int] = None) -> None:
+        """
+        Initialise the RemotePolicy object.
+
+        Args:
+            port (int): The port of the server.
+            host (str): The host of the server.
+            radius (Optional[int]): The radius of the observation windows.
+        """
+        super().__init__(radius)
+        self.__host = host
+        self.__port = port
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__reader: Optional[asyncio.StreamReader] = None
+        self.__writer: Optional[asyncio.StreamWriter] = None
+
+    def decide(self, windows: memoryview, vitals: memoryview) -> Sequence[int]:
+        """
+        Ask the server for the action of every rover of a batch, blocking until it answers.
+
+        Args:
+            windows (memoryview): The windows of type codes centred on every rover.
+            vitals (memoryview): The battery, shield and carrying state of every rover.
+
+        Returns:
+            Sequence[int]: The action of every rover, in the order of the batch.
+        """
+        if self.__loop is None:
+            self.__loop = asyncio.new_event_loop()
+        return self.__loop.run_until_complete(self.decide_async(windows, vitals))
+
+    async def decide_async(self, windows: memoryview, vitals: memoryview) -> bytes:
+        """
+        Ask the server for the action of every rover of a batch.
+
+        Args:
+            windows (memoryview): The windows of type codes centred on every rover, shaped (rovers, side, side).
+            vitals (memoryview): The battery, shield and carrying state of every rover, shaped (rovers, 3).
+
+        Returns:
+            bytes: The action of every rover, in the order of the batch.
+
+        Raises:
+            ConnectionError: If the server closed the connection, e.g. because the policy failed.
+        """
+        if self.__writer is None:
+            self.__reader, self.__writer = await asyncio.open_connection(self.__host, self.__port)
+        count = len(vitals)
+        side = windows.shape[1] if count else 0
+        vital_bytes = vitals.tobytes()
+        if sys.byteorder == "big":
+            swapped = array("f", vital_bytes)
+            swapped.byteswap()
+            vital_bytes = swapped.tobytes()
+        self.__writer.write(PolicyServer.REQUEST_HEADER.pack(count, side) + windows.tobytes() + vital_bytes)
+        await self.__writer.drain()
+        try:
+            reply_count, = PolicyServer.REPLY_HEADER.unpack(
+                await self.__reader.readexactly(PolicyServer.REPLY_HEADER.size))
+            return await self.__reader.readexactly(reply_count)
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            # The next request opens a new connection
+            writer, self.__reader, self.__writer = self.__writer, None, None
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            raise ConnectionError("The policy server closed the connection") from error
+
+    def close(self) -> None:
+        """Close the connection and the event loop of decide."""
+        if self.__writer is not None:
+            self.__writer.close()
+            if self.__loop is not None:
+                self.__loop.run_until_complete(self.__writer.wait_closed())
+            self.__writer = None
+        if self.__loop is not None:
+            self.__loop.close()
+            self.__loop = None
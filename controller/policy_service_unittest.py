@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import unittest
+from array import array
+from controller.policy_service import PolicyServer, RemotePolicy
+from controller.rover_policy import BatchedRoverPolicy
+
+
+class StandInPolicy(BatchedRoverPolicy):
+    """Stands in for a model: moves every rover in the direction given by its battery, counting batches."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def decide(self, windows, vitals):
+        self.batch_sizes.append(len(vitals))
+        if any(battery < 0 for battery, _, _ in vitals.tolist()):
+            raise ValueError("Negative battery")
+        return [round(battery * 8) for battery, _, _ in vitals.tolist()]
+
+
+def observations(count, action, side=3):
+    """Build the observations of rovers that the stand-in policy sends in the given direction."""
+    windows = memoryview(bytearray(range(count * side * side))).cast("B", (count, side, side))
+    vitals = memoryview(array("f", [action / 8, 1.0, 0.0] * count)).cast("B").cast("f", (count, 3))
+    return windows, vitals
+
+
+class TestPolicyService(unittest.TestCase):
+
+    def test_requests_of_many_simulations_share_a_batch(self):
+        policy = StandInPolicy()
+
+        async def scenario():
+            server = PolicyServer(policy, max_delay=0.05)
+            await server.start()
+            clients = [RemotePolicy(server.get_port()) for _ in range(3)]
+            replies = await asyncio.gather(*(client.decide_async(*observations(count, count + 1))
+                                             for count, client in enumerate(clients, 1)))
+            for client in clients:
+                client.close()
+            await server.close()
+            return server.get_batch_count(), replies
+
+        batch_count, replies = asyncio.run(scenario())
+        self.assertEqual(batch_count, 1)
+        self.assertEqual(policy.batch_sizes, [6])
+        self.assertEqual([list(reply) for reply in replies], [[2], [3, 3], [4, 4, 4]])
+
+    def test_blocking_client_against_a_server_in_another_thread(self):
+        policy = StandInPolicy()
+        loop = asyncio.new_event_loop()
+        server = PolicyServer(policy, max_delay=0.0)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        client = RemotePolicy(server.get_port())
+        try:
+            self.assertEqual(list(client.decide(*observations(2, 5))), [5, 5])
+            self.assertEqual(list(client.decide(*observations(1, 7))), [7])
+        finally:
+            client.close()
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.assertEqual(policy.batch_sizes, [2, 1])
+
+    def test_cancelled_requests_are_skipped(self):
+        async def scenario():
+            server = PolicyServer(StandInPolicy())
+            loop = asyncio.get_running_loop()
+            futures = [loop.create_future() for _ in range(2)]
+            futures[0].cancel()
+            batch = []
+            for future in futures:
+                windows, vitals = observations(1, 3)
+                batch.append((1, 3, windows.tobytes(), vitals.tobytes(), future))
+            server._PolicyServer__decide(3, batch)
+            return futures[1].result()
+
+        self.assertEqual(list(asyncio.run(scenario())), [3])
+
+    def test_failing_policy_closes_the_connection(self):
+        async def scenario():
+            server = PolicyServer(StandInPolicy(), max_delay=0.0)
+            await server.start()
+            client = RemotePolicy(server.get_port())
+            try:
+                with self.assertRaises(ConnectionError):
+                    await client.decide_async(*observations(1, -1))
+                self.assertIsNone(client._RemotePolicy__reader)
+                self.assertIsNone(client._RemotePolicy__writer)
+                # The next request connects again
+                return await client.decide_async(*observations(2, 3))
+            finally:
+                client.close()
+                await server.close()
+
+        with self.assertLogs("controller.policy_service", "ERROR"):
+            self.assertEqual(list(asyncio.run(scenario())), [3, 3])
+
+if __name__ == '__main__':
+    unittest.main()
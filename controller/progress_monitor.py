@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from model.rock import Rock
+
+if TYPE_CHECKING:
+    from model.mars import Mars
+    from model.spacecraft import Spacecraft
+
+
+class ProgressMonitor:
+    """
+    Decides when a run has ended or can no longer make progress.
+
+    Besides the original end conditions it detects two kinds of stalemate:
+    - Provable: every live rover has an empty battery and is out of the spacecraft's reach, so nobody can
+      move, share power, recharge or deliver ever again.
+    - Statistical: within a window of steps no rock was delivered, no battery level changed and no rover
+      moved.
+
+    Attributes:
+        __window (int): The number of steps without progress after which the run is stopped, 0 to disable.
+        __last_state (Optional[tuple]): The delivered rocks, battery levels and rover locations last seen.
+        __last_progress_step (int): The last step at which that state changed.
+        __end_reason (Optional[str]): Why the run ended, or None while it is running.
+    """
+    ALL_ROVERS_DESTROYED = "all_rovers_destroyed"
+    NO_ROCKS_REMAINING = "no_rocks_remaining"
+    FLEET_STRANDED = "fleet_stranded"
+    NO_PROGRESS = "no_progress"
+
+    def __init__(self, window: int = 500) -> None:
+        """
+        Initialise the ProgressMonitor object.
+
+        Args:
+            window (int): The number of steps without progress after which the run is stopped, 0 to disable.
+        """
+        self.__window = window
+        self.__last_state: Optional[tuple] = None
+        self.__last_progress_step = 0
+        self.__end_reason: Optional[str] = None
+
+    def get_end_reason(self) -> Optional[str]:
+        """Get why the run ended, or None while it is running."""
+        return self.__end_reason
+
+    def check(self, step: int, mars: Mars, spacecraft: Optional[Spacecraft]) -> Optional[str]:
+        """
+        Check whether the run should stop after a step.
+
+        Args:
+            step (int): The step that has just been simulated.
+            mars (Mars): The Mars environment.
+            spacecraft (Optional[Spacecraft]): The spacecraft, if any.
+
+        Returns:
+            Optional[str]: One of the reason codes if the run should stop, None otherwise.
+        """
+        live_rovers = [rover for rover in mars.get_all_rovers() if not rover.is_destroyed()]
+        if not live_rovers:
+            return self.__end(ProgressMonitor.ALL_ROVERS_DESTROYED)
+
+        # Picked-up rocks leave the grid, so the rocks left are those on it and those being carried
+        carried_rocks = sum(1 for rover in live_rovers if rover.has_rock())
+        if mars.get_type_counts()[Rock.TYPE_CODE] + carried_rocks == 0:
+            return self.__end(ProgressMonitor.NO_ROCKS_REMAINING)
+
+        if spacecraft is not None:
+            spacecraft_location = spacecraft.get_location()
+            if all(rover.get_battery_level() <= 0
+                   and mars.get_distance(rover.get_location(), spacecraft_location) > 1 for rover in live_rovers):
+                return self.__end(ProgressMonitor.FLEET_STRANDED)
+
+        if self.__window > 0:
+            state = (spacecraft.get_total_rocks_delivered() if spacecraft is not None else 0,
+                     tuple(rover.get_battery_level() for rover in live_rovers),
+                     tuple(rover.get_location() for rover in live_rovers))
+            if state != self.__last_state:
+                self.__last_state = state
+                self.__last_progress_step = step
+            elif step - self.__last_progress_step >= self.__window:
+                return self.__end(ProgressMonitor.NO_PROGRESS)
+        return None
+
+    def __end(self, reason: str) -> str:
+        """Remember and return the reason the run ended."""
+        self.__end_reason = reason
+        return reason
@@ -0,0 +1,73 @@
+import unittest
+from controller.progress_monitor import ProgressMonitor
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+
+class TestProgressMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.spacecraft_location = Location(10, 10)
+        self.spacecraft = Spacecraft(self.spacecraft_location)
+        self.mars.set_agent(self.spacecraft, self.spacecraft_location)
+        self.rover = self.add_rover(Location(2, 2))
+        self.mars.set_agent(Rock(Location(5, 5)), Location(5, 5))
+        self.monitor = ProgressMonitor(window=3)
+
+    def add_rover(self, location):
+        rover = Rover(location, self.spacecraft_location)
+        self.mars.set_agent(rover, location)
+        self.mars.add_rover(rover)
+        return rover
+
+    def test_running(self):
+        self.assertIsNone(self.monitor.check(1, self.mars, self.spacecraft))
+        self.assertIsNone(self.monitor.get_end_reason())
+
+    def test_all_rovers_destroyed(self):
+        self.rover.sustain_damage(100)
+        self.assertEqual(self.monitor.check(1, self.mars, self.spacecraft), ProgressMonitor.ALL_ROVERS_DESTROYED)
+        self.assertEqual(self.monitor.get_end_reason(), ProgressMonitor.ALL_ROVERS_DESTROYED)
+
+    def test_no_rocks_remaining_counts_carried_rocks(self):
+        self.mars.set_agent(None, Location(5, 5))
+        self.rover.set_rock(Rock(Location(2, 2)))
+        self.assertIsNone(self.monitor.check(1, self.mars, self.spacecraft))
+        self.rover.drop_rock()
+        self.assertEqual(self.monitor.check(2, self.mars, self.spacecraft), ProgressMonitor.NO_ROCKS_REMAINING)
+
+    def test_fleet_stranded(self):
+        self.rover._Rover__battery_level = 0.0
+        self.assertEqual(self.monitor.check(1, self.mars, self.spacecraft), ProgressMonitor.FLEET_STRANDED)
+
+    def test_empty_rover_next_to_spacecraft_is_not_stranded(self):
+        self.rover._Rover__battery_level = 0.0
+        rover = self.add_rover(Location(11, 10))
+        rover._Rover__battery_level = 0.0
+        self.assertIsNone(self.monitor.check(1, self.mars, self.spacecraft))
+
+    def test_no_progress_within_window(self):
+        for step in range(1, 4):
+            self.assertIsNone(self.monitor.check(step, self.mars, self.spacecraft))
+        self.assertEqual(self.monitor.check(4, self.mars, self.spacecraft), ProgressMonitor.NO_PROGRESS)
+
+    def test_movement_is_progress(self):
+        for step in range(1, 10):
+            location = Location(2 + step, 2)
+            self.mars.set_agent(self.rover, location)
+            self.rover.set_location(location)
+            self.assertIsNone(self.monitor.check(step, self.mars, self.spacecraft))
+
+    def test_window_disabled(self):
+        monitor = ProgressMonitor(window=0)
+        for step in range(1, 10):
+            self.assertIsNone(monitor.check(step, self.mars, self.spacecraft))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import io
+import time
+from typing import Dict
+
+from controller.config import Config
+from controller.rollout_planner import RolloutPlanner
+from controller.simulator import Simulator
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+
+
+class RolloutBenchmark:
+    """
+    Compares the time a rollout planner takes to choose a target with the time a deep copy of the world takes.
+
+    Deep-copying the world once per rollout is what forking replaces, so a whole planning call, with all its
+    candidates and rollouts, should cost less than a single deep copy.
+
+    Run with: python -m controller.rollout_benchmark
+    """
+    WORLD_SIZE = 300
+    REPEATS = 5
+
+    @staticmethod
+    def measure(world_size: int = WORLD_SIZE, repeats: int = REPEATS, seed: int = 1) -> Dict[str, float]:
+        """
+        Time planning calls for every rover and deep copies of a freshly populated world.
+
+        The world is populated like the simulator's; the configured world size and random seed are restored
+        afterwards.
+
+        Args:
+            world_size (int): The width and height of the world.
+            repeats (int): The number of deep copies to time.
+            seed (int): The random seed.
+
+        Returns:
+            Dict[str, float]: The mean and the slowest planning call and the mean deep copy, in seconds.
+        """
+        saved = (Config.world_size, Config.random_seed)
+        Config.world_size, Config.random_seed = world_size, seed
+        try:
+            mars = Mars()
+            spacecraft = Simulator.populate(mars)[0]
+            planner = RolloutPlanner(Config.rollout_candidates or 4, Config.rollout_count, Config.rollout_horizon)
+            rocks = [Location(index % world_size, index // world_size)
+                     for index, code in enumerate(mars.get_type_codes()) if code == Rock.TYPE_CODE]
+
+            timings = []
+            for rover in mars.get_all_rovers():
+                nearest = sorted(rocks, key=lambda location: mars.get_distance(rover.get_location(), location))
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    planner.choose(mars, rover, nearest[:planner.get_candidates()], nearest[0],
+                                   spacecraft.get_location())
+                timings.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                copy.deepcopy(mars)
+            deepcopy = (time.perf_counter() - start) / repeats
+        finally:
+            Config.world_size, Config.random_seed = saved
+        return {"choose": sum(timings) / len(timings), "choose_max": max(timings), "deepcopy": deepcopy}
+
+    @staticmethod
+    def report(world_size: int = WORLD_SIZE, repeats: int = REPEATS) -> str:
+        """
+        Measure everything and format the results as a table.
+
+        Args:
+            world_size (int): The width and height of the world.
+            repeats (int): The number of deep copies to time.
+
+        Returns:
+            str: The report.
+        """
+        timings = RolloutBenchmark.measure(world_size, repeats)
+        return "\n".join([f"World {world_size} x {world_size}",
+                          f"  {'choose (mean)':<16}{timings['choose'] * 1000:>10.1f} ms",
+                          f"  {'choose (max)':<16}{timings['choose_max'] * 1000:>10.1f} ms",
+                          f"  {'deepcopy':<16}{timings['deepcopy'] * 1000:>10.1f} ms"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare a planning call with a deep copy of the world.")
+    parser.add_argument("--world-size", type=int, default=RolloutBenchmark.WORLD_SIZE,
+                        help="the width and height of the world")
+    parser.add_argument("--repeats", type=int, default=RolloutBenchmark.REPEATS,
+                        help="the number of deep copies to time")
+    arguments = parser.parse_args()
+    print(RolloutBenchmark.report(arguments.world_size, arguments.repeats))
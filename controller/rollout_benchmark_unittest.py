@@ -0,0 +1,17 @@
+import unittest
+from controller.config import Config
+from controller.rollout_benchmark import RolloutBenchmark
+
+
+class TestRolloutBenchmark(unittest.TestCase):
+
+    def test_measure_restores_the_configuration(self):
+        saved = (Config.world_size, Config.random_seed)
+        timings = RolloutBenchmark.measure(world_size=30, repeats=1)
+        self.assertEqual(set(timings), {"choose", "choose_max", "deepcopy"})
+        self.assertLessEqual(timings["choose"], timings["choose_max"])
+        self.assertEqual((Config.world_size, Config.random_seed), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
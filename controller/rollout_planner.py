@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.util import Finalize
+from typing import List, Optional, Sequence, TextIO, Tuple, TYPE_CHECKING
+
+from controller.config import Config
+from model.alien import Alien
+from model.alien_proximity import AlienProximity
+from model.location import Location
+from model.rover import Rover
+
+if TYPE_CHECKING:
+    from model.mars import Mars
+
+
+class RolloutPlanner:
+    """
+    Chooses the rock a docked rover goes for next by playing each candidate out in forked worlds.
+
+    For every candidate the planner forks the world with Mars.fork, lets a copy of the rover head for the
+    candidate with its usual behaviour while copies of the aliens around it act, and scores how the rover
+    fares within horizon steps: an early pickup scores close to 1 and a late one close to 0, lost shield is
+    subtracted and a destroyed rover scores -1. The candidate with the best mean score over all rollouts
+    wins, ties going to the default. Every candidate is played out with the same seeds, so the candidates
+    are compared on the same alien moves wherever they can be.
+
+    Forks only copy what a rollout changes: the grid and exploration map once written, the rover, and the
+    aliens and rovers an alien senses. Only aliens that could reach the rover within the horizon are
+    considered, and they are left where they are until they sense a rover. The rest of the world, including
+    the spacecraft and any rover farther away, is read but not simulated. A planning call costs less than
+    one deep copy of a large world; see controller.rollout_benchmark.
+
+    With workers, rollouts run in a pool of spawned processes kept for the planner's lifetime, since forking
+    the simulator's process, which may run the frame exporter's and the diff server's threads, can deadlock.
+    Every planning call pickles one fork of the world together with the configuration, sends it to each
+    worker with its share of the rollouts, and the workers play out in their unpickled copy. The seeds are
+    drawn in this process, so the choice does not depend on the number of workers.
+
+    Attributes:
+        __candidates (int): The number of available targets nearest to the rover that are played out.
+        __rollouts (int): The number of rollouts per candidate.
+        __horizon (int): The number of steps every rollout lasts at most.
+        __workers (int): The number of worker processes, 0 to play out in this process.
+        __executor (Optional[ProcessPoolExecutor]): The worker processes, started by the first planning call.
+    """
+    ALIEN_SENSING_RADIUS = 3  # The distance from which aliens start chasing a rover
+
+    __devnull: Optional[TextIO] = None  # The stream a worker process reports to
+
+    def __init__(self, candidates: int = 4, rollouts: int = 8, horizon: int = 40, workers: int = 0) -> None:
+        """
+        Initialise the RolloutPlanner object.
+
+        Args:
+            candidates (int): The number of available targets nearest to the rover that are played out.
+            rollouts (int): The number of rollouts per candidate.
+            horizon (int): The number of steps every rollout lasts at most.
+            workers (int): The number of worker processes, 0 to play out in this process.
+
+        Raises:
+            ValueError: If candidates, rollouts or horizon is not positive.
+        """
+        if candidates < 1 or rollouts < 1 or horizon < 1:
+            raise ValueError("Candidates, rollouts and horizon must be positive")
+        self.__candidates = candidates
+        self.__rollouts = rollouts
+        self.__horizon = horizon
+        self.__workers = workers
+        self.__executor: Optional[ProcessPoolExecutor] = None
+
+    def get_candidates(self) -> int:
+        """Get the number of available targets nearest to the rover that are played out."""
+        return self.__candidates
+
+    def get_rollouts(self) -> int:
+        """Get the number of rollouts per candidate."""
+        return self.__rollouts
+
+    def get_horizon(self) -> int:
+        """Get the number of steps every rollout lasts at most."""
+        return self.__horizon
+
+    def choose(self, mars: Mars, rover: Rover, locations: Sequence[Location], default: Location,
+               spacecraft_location: Optional[Location] = None) -> Location:
+        """
+        Choose the target of a rover among the available rock locations.
+
+        A candidate no alien can reach within the horizon plays out the same with every seed, so it is
+        played out once.
+
+        Args:
+            mars (Mars): The Mars environment.
+            rover (Rover): The rover to choose for.
+            locations (Sequence[Location]): The available rock locations.
+            default (Location): The location assigned without planning; always a candidate.
+            spacecraft_location (Optional[Location]): The location of the spacecraft, which aliens keep away from.
+
+        Returns:
+            Location: The candidate with the best mean rollout score.
+        """
+        nearest = sorted((location for location in locations if location != default),
+                         key=lambda location: mars.get_distance(rover.get_location(), location))
+        candidates = [default] + nearest[:self.__candidates - 1]
+        seeds = list(mars.get_random_pool().take(self.__rollouts))
+        threats = [RolloutPlanner.find_threats(mars, rover, target, self.__horizon) for target in candidates]
+        jobs = [(index, seed) for index, (aliens, _) in enumerate(threats) for seed in (seeds if aliens else seeds[:1])]
+
+        if self.__workers > 0:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(self.__workers, mp_context=get_context("spawn"),
+                                                      initializer=RolloutPlanner.initialise_worker)
+            config = {name: value for name, value in vars(Config).items() if not name.startswith("_")}
+            # A fork with a fixed seed leaves the random pool of the world untouched
+            snapshot = pickle.dumps((config, mars.fork(0), rover, self.__horizon, spacecraft_location, candidates,
+                                     threats), pickle.HIGHEST_PROTOCOL)
+            size = -(-len(jobs) // self.__workers)
+            futures = [self.__executor.submit(RolloutPlanner.play_out_snapshot, snapshot, jobs[start:start + size])
+                       for start in range(0, len(jobs), size)]
+            scores = [score for future in futures for score in future.result()]
+        else:
+            scores = [RolloutPlanner.play_out(mars, rover, candidates[index], seed, self.__horizon,
+                                              spacecraft_location, threats[index]) for index, seed in jobs]
+
+        totals = [0.0] * len(candidates)
+        counts = [0] * len(candidates)
+        for (index, _), score in zip(jobs, scores):
+            totals[index] += score
+            counts[index] += 1
+        means = [total / count for total, count in zip(totals, counts)]
+        return candidates[max(range(len(candidates)), key=lambda index: (means[index], -index))]
+
+    def __getstate__(self) -> dict:
+        """Pickle the settings but not the worker processes, e.g. along with the spacecraft in a snapshot."""
+        state = dict(self.__dict__)
+        state["_RolloutPlanner__executor"] = None
+        return state
+
+    def close(self) -> None:
+        """Stop the worker processes, if any were started."""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    @staticmethod
+    def initialise_worker() -> None:
+        """Set up a worker process."""
+        # Rovers and aliens report to standard output; rollouts are not part of the run
+        RolloutPlanner.__devnull = sys.stdout = open(os.devnull, "w")
+        Finalize(None, RolloutPlanner.__devnull.close, exitpriority=0)
+
+    @staticmethod
+    def play_out_snapshot(snapshot: bytes, jobs: List[Tuple[int, int]]) -> List[float]:
+        """
+        Play out rollouts in a pickled world; runs in a worker process.
+
+        Args:
+            snapshot (bytes): The pickled configuration, world, rover, horizon, spacecraft location,
+                candidates and threats of the planning call.
+            jobs (List[Tuple[int, int]]): The index of the candidate and the seed of every rollout.
+
+        Returns:
+            List[float]: The scores of the rollouts.
+        """
+        config, mars, rover, horizon, spacecraft_location, candidates, threats = pickle.loads(snapshot)
+        for name, value in config.items():
+            setattr(Config, name, value)
+        return [RolloutPlanner.play_out(mars, rover, candidates[index], seed, horizon, spacecraft_location,
+                                        threats[index]) for index, seed in jobs]
+
+    @staticmethod
+    def play_out(mars: Mars, rover: Rover, target: Location, seed: int, horizon: int,
+                 spacecraft_location: Optional[Location] = None,
+                 threats: Optional[Tuple[List[Alien], List[Rover]]] = None) -> float:
+        """
+        Let a copy of a rover head for a target in a fork of the world and score how it fares.
+
+        Aliens and other rovers are only copied into the fork once an awake alien senses a rover; until
+        then they are left where they are. Every step senses for all aliens at once with AlienProximity.
+
+        Args:
+            mars (Mars): The Mars environment, left unchanged.
+            rover (Rover): The rover.
+            target (Location): The rock location the copy of the rover heads for.
+            seed (int): The seed of the fork's random decisions.
+            horizon (int): The number of steps the rollout lasts at most.
+            spacecraft_location (Optional[Location]): The location of the spacecraft, which aliens keep away from.
+            threats (Optional[Tuple[List[Alien], List[Rover]]]): The aliens that can reach the rover and the
+                rovers they can attack, as found by find_threats if not given.
+
+        Returns:
+            float: 1 - steps / horizon if the rover picked up a rock, else 0, minus the fraction of its shield
+                lost; -1 if it was destroyed.
+        """
+        aliens, others = threats if threats is not None else RolloutPlanner.find_threats(mars, rover, target, horizon)
+        idle = list(aliens)
+        world = mars.fork(seed)
+        explorer = world.own(rover)
+        explorer.set_target_location(target)
+        rovers = [explorer] + others
+        active: List[Alien] = []
+        proximity = AlienProximity(RolloutPlanner.ALIEN_SENSING_RADIUS)
+
+        shield = explorer.get_shield()
+        # Printing to no stream at all is a no-op, so the rollout reports nothing
+        with contextlib.redirect_stdout(None):
+            for step in range(horizon):
+                explorer.act(world)
+                if explorer.has_rock():
+                    return 1.0 - step / horizon - (shield - explorer.get_shield()) / 100.0
+                if not idle and not active:
+                    continue
+                awake = [alien for alien in active if not alien.is_hibernating()]
+                sensing = awake + [alien for alien in idle if not alien.is_hibernating()]
+                live_rovers = [other for other in rovers if not other.is_destroyed()]
+                for position, (alien, (nearest_rover, sensed_spacecraft_location)) in enumerate(
+                        zip(sensing, proximity.query(world, sensing, live_rovers, spacecraft_location))):
+                    if position >= len(awake):
+                        if nearest_rover is None:
+                            continue
+                        idle.remove(alien)
+                        alien = world.own(alien)
+                        active.append(alien)
+                    if nearest_rover is not None and nearest_rover is not explorer:
+                        owned = world.own(nearest_rover)
+                        if owned is not nearest_rover:
+                            rovers[rovers.index(nearest_rover)] = nearest_rover = owned
+                    alien.sense(nearest_rover, sensed_spacecraft_location)
+                for alien in active:
+                    alien.act(world)
+                if explorer.is_destroyed():
+                    return -1.0
+        return -(shield - explorer.get_shield()) / 100.0
+
+    @staticmethod
+    def find_threats(mars: Mars, rover: Rover, target: Location, horizon: int) -> Tuple[List[Alien], List[Rover]]:
+        """
+        Find the aliens that can reach a rover on its way to a target within the horizon, and the rovers they
+        can attack.
+
+        The rover is taken to head straight for the target. Since aliens move one cell per step, an alien can
+        only get next to the rover in its i-th step if it starts within i + 1 cells of where the rover is
+        then, and all those cells lie within that distance of the last cell the rover reaches. The sensing
+        radius is added as slack for detours.
+
+        Args:
+            mars (Mars): The Mars environment.
+            rover (Rover): The rover.
+            target (Location): The rock location the rover heads for.
+            horizon (int): The number of steps the rollout lasts at most.
+
+        Returns:
+            Tuple[List[Alien], List[Rover]]: The aliens, nearest to that last cell first, and the other rovers
+                within their reach; both empty if there are no such aliens.
+        """
+        centre, reach = RolloutPlanner.__get_threat_area(mars, rover, target, horizon)
+        aliens = RolloutPlanner.__find_near(mars, centre, reach, Alien.TYPE_CODE)
+        if not aliens:
+            return [], []
+        rovers = RolloutPlanner.__find_near(mars, centre, reach + horizon + RolloutPlanner.ALIEN_SENSING_RADIUS,
+                                            Rover.TYPE_CODE)
+        return aliens, [other for other in rovers if other is not rover]
+
+    @staticmethod
+    def __get_threat_area(mars: Mars, rover: Rover, target: Location, horizon: int) -> Tuple[Location, int]:
+        """Get the last cell the rover reaches on a straight way to the target, and the reach of the aliens."""
+        start = rover.get_location()
+        width, height = mars.get_width(), mars.get_height()
+        dx = (target.get_x() - start.get_x() + width // 2) % width - width // 2
+        dy = (target.get_y() - start.get_y() + height // 2) % height - height // 2
+        steps = min(horizon, max(abs(dx), abs(dy)))
+        centre = Location((start.get_x() + max(-steps, min(steps, dx))) % width,
+                          (start.get_y() + max(-steps, min(steps, dy))) % height)
+        return centre, steps + 1 + RolloutPlanner.ALIEN_SENSING_RADIUS
+
+    @staticmethod
+    def __find_near(world: Mars, centre: Location, radius: int, type_code: int) -> List:
+        """Find the agents of one type within radius of a cell, nearest first."""
+        radius = min(radius, world.get_max_window_radius())
+        return world.find_agents_in_window(world.get_window(centre, radius), centre, radius, type_code)
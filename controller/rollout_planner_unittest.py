@@ -0,0 +1,147 @@
+import contextlib
+import io
+import pickle
+import random
+import unittest
+from unittest import mock
+from controller.config import Config
+from controller.rollout_planner import RolloutPlanner
+from model.alien import Alien
+from model.location import Location
+from model.mars import Mars
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+
+class TestRolloutPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_seed = Config.random_seed
+        Config.random_seed = 11
+        self.mars = Mars()
+        self.mars.clear()
+        self.rover = Rover(Location(10, 10), Location(0, 0))
+        self.mars.set_agent(self.rover, Location(10, 10))
+        self.mars.add_rover(self.rover)
+        for location in (Location(14, 10), Location(6, 10)):
+            self.mars.place_rock(location)
+
+    def tearDown(self):
+        Config.random_seed = self.saved_seed
+
+    def add_aliens(self):
+        """Guard the rock to the east with aliens."""
+        for location in (Location(15, 9), Location(15, 11), Location(13, 9)):
+            self.mars.set_agent(Alien(location), location)
+
+    def test_play_out_leaves_the_world_unchanged(self):
+        self.add_aliens()
+        codes = bytes(self.mars.get_type_codes())
+        score = RolloutPlanner.play_out(self.mars, self.rover, Location(14, 10), 2, 20)
+        self.assertLess(score, 0.0)
+        self.assertEqual(bytes(self.mars.get_type_codes()), codes)
+        self.assertEqual(self.rover.get_location(), Location(10, 10))
+        self.assertEqual((self.rover.get_shield(), self.rover.get_battery_level()), (100, 100.0))
+        self.assertFalse(self.rover.has_rock())
+        self.assertEqual(self.mars.get_exploration_map().get_unexplored_count(),
+                         self.mars.get_width() * self.mars.get_height())
+
+    def test_unguarded_rock_scores_by_distance(self):
+        near = RolloutPlanner.play_out(self.mars, self.rover, Location(14, 10), 1, 20)
+        self.mars.place_rock(Location(10, 4))
+        far = RolloutPlanner.play_out(self.mars, self.rover, Location(10, 4), 1, 20)
+        self.assertGreater(near, far)
+        self.assertGreater(far, 0.0)
+
+    def test_chooses_the_unguarded_rock(self):
+        self.add_aliens()
+        planner = RolloutPlanner(candidates=2, rollouts=3, horizon=20)
+        self.assertEqual(planner.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)],
+                                        Location(14, 10)), Location(6, 10))
+
+    def test_ties_go_to_the_default(self):
+        planner = RolloutPlanner(candidates=2, rollouts=2, horizon=2)
+        self.assertEqual(planner.choose(self.mars, self.rover, [Location(6, 10), Location(14, 10)],
+                                        Location(14, 10)), Location(14, 10))
+
+    def test_workers_agree_with_this_process(self):
+        self.add_aliens()
+        in_process = RolloutPlanner(candidates=2, rollouts=3, horizon=20)
+        chosen = in_process.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)], Location(14, 10))
+        next_value = self.mars.get_random_pool().next_value()
+        # The same world again, with the same seeds
+        self.setUp()
+        self.add_aliens()
+        workers = RolloutPlanner(candidates=2, rollouts=3, horizon=20, workers=2)
+        self.addCleanup(workers.close)
+        self.assertEqual(workers.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)],
+                                        Location(14, 10)), chosen)
+        self.assertEqual(self.mars.get_random_pool().next_value(), next_value)
+
+    def test_workers_are_kept_between_calls(self):
+        self.add_aliens()
+        planner = RolloutPlanner(candidates=2, rollouts=2, horizon=10, workers=1)
+        self.addCleanup(planner.close)
+        planner.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)], Location(14, 10))
+        executor = planner._RolloutPlanner__executor
+        planner.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)], Location(6, 10))
+        self.assertIs(planner._RolloutPlanner__executor, executor)
+        self.assertIsNone(pickle.loads(pickle.dumps(planner))._RolloutPlanner__executor)
+        planner.close()
+        self.assertIsNone(planner._RolloutPlanner__executor)
+
+    def test_planning_forks_instead_of_copying(self):
+        self.add_aliens()
+        shared = []
+        fork = Mars.fork
+
+        def spy(mars, seed=None):
+            world = fork(mars, seed)
+            shared.append(world.get_type_codes() is mars.get_type_codes())
+            return world
+
+        planner = RolloutPlanner(candidates=2, rollouts=3, horizon=20)
+        with mock.patch.object(Mars, "fork", spy), mock.patch("copy.deepcopy", side_effect=AssertionError):
+            planner.choose(self.mars, self.rover, [Location(14, 10), Location(6, 10)], Location(14, 10))
+        self.assertEqual(len(shared), 2 * 3)
+        self.assertTrue(all(shared))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            RolloutPlanner(rollouts=0)
+
+    def test_spacecraft_asks_the_planner(self):
+        self.add_aliens()
+        spacecraft = Spacecraft(Location(0, 0))
+        spacecraft.set_planner(RolloutPlanner(candidates=2, rollouts=3, horizon=20))
+        spacecraft._Spacecraft__remembered_rock_locations = [Location(14, 10), Location(6, 10)]
+        spacecraft._Spacecraft__assign_target_location_to_rover(self.rover, self.mars)
+        self.assertEqual(spacecraft._Spacecraft__assigned_rovers[self.rover], Location(6, 10))
+
+
+class TestSimulatorPlanning(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.world_size, Config.renderer, Config.stalemate_window, Config.rollout_candidates)
+        Config.world_size, Config.renderer, Config.stalemate_window = 30, "none", 0
+
+    def tearDown(self):
+        Config.world_size, Config.renderer, Config.stalemate_window, Config.rollout_candidates = self.saved
+
+    def test_planning_runs(self):
+        from controller.simulator import Simulator
+        Config.rollout_candidates = 3
+        random.seed(7)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            for _ in range(100):
+                simulator.step()
+            simulator.close()
+        spacecraft = simulator._Simulator__spacecraft
+        self.assertIsInstance(spacecraft._Spacecraft__planner, RolloutPlanner)
+        self.assertIsNone(simulator._Simulator__rollout_planner)
+        self.assertGreater(spacecraft.get_total_rocks_delivered(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
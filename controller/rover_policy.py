@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+from model.batched_mars import BatchedMars
+from model.random_pool import RandomPool
+
+if TYPE_CHECKING:
+    from model.mars import Mars
+    from model.rover import Rover
+
+
+class RoverPolicy(ABC):
+    """
+    Decides the moves of the rovers, one step at a time.
+
+    The simulator hands the policy the rovers that need a decision. A HeuristicPolicy is handed one rover
+    at a time, in agent order, so in sequential mode each rover sees the moves of the agents that acted
+    before it. A BatchedRoverPolicy is handed all live rovers at once, before the other agents act.
+
+    Attributes:
+        __radius (Optional[int]): The radius of the observation windows, None for Config.rover_sensing_radius.
+    """
+
+    def __init__(self, radius: Optional[int] = None) -> None:
+        """
+        Initialise the RoverPolicy object.
+
+        Args:
+            radius (Optional[int]): The radius of the observation windows, Config.rover_sensing_radius by
+                default.
+        """
+        self.__radius = radius
+
+    def get_radius(self) -> Optional[int]:
+        """Get the radius of the observation windows, None for Config.rover_sensing_radius."""
+        return self.__radius
+
+    @abstractmethod
+    def act(self, mars: Mars, rovers: List[Rover]) -> None:
+        """
+        Decide for rovers and let each follow its decision.
+
+        Args:
+            mars (Mars): The Mars environment.
+            rovers (List[Rover]): The rovers that need a decision.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release what the policy holds, e.g. a connection; called when the simulation closes."""
+
+
+class HeuristicPolicy(RoverPolicy):
+    """
+    The hand-written behaviour of Rover.act, the default policy.
+
+    Every rover reads the world and submits its intents on its own, in agent order.
+    """
+
+    def act(self, mars: Mars, rovers: List[Rover]) -> None:
+        """
+        Let every rover act on its own.
+
+        Args:
+            mars (Mars): The Mars environment.
+            rovers (List[Rover]): The rovers that need a decision.
+        """
+        for rover in rovers:
+            rover.act(mars)
+
+
+class BatchedRoverPolicy(RoverPolicy):
+    """
+    Decides the moves of every rover that needs a decision in one batch.
+
+    Once per step the simulator hands the policy all live rovers. The policy gathers their observations
+    with Mars.get_rover_observations in one call, passes the whole batch to decide, and lets every rover
+    follow its action. Subclasses implement decide, e.g. by running a model over the batch.
+
+    Actions are those of BatchedMars, so a policy trained on batched worlds drives the rovers of a
+    simulation: STAY, or 1 + i to move in DIRECTIONS[i]. Moving onto a rock picks it up.
+
+    Policies that decide in one batch see the world as it was at the start of the step; in sequential mode
+    the rovers move first, then the other agents act.
+    """
+    DIRECTIONS = BatchedMars.DIRECTIONS
+    STAY = BatchedMars.STAY
+
+    def act(self, mars: Mars, rovers: List[Rover]) -> None:
+        """
+        Decide for a batch of rovers and let each follow its action.
+
+        Args:
+            mars (Mars): The Mars environment.
+            rovers (List[Rover]): The rovers that need a decision.
+
+        Raises:
+            ValueError: If the policy returns the wrong number of actions or an unknown action.
+        """
+        if not rovers:
+            return
+        windows, vitals = mars.get_rover_observations(self.get_radius(), rovers)
+        actions = self.decide(windows, vitals)
+        if len(actions) != len(rovers):
+            raise ValueError(f"Expected {len(rovers)} actions, got {len(actions)}")
+        directions = BatchedRoverPolicy.DIRECTIONS
+        for rover, action in zip(rovers, actions):
+            action = int(action)
+            if not 0 <= action <= len(directions):
+                raise ValueError(f"Unknown rover action: {action}")
+            rover.follow_action(mars, None if action == BatchedRoverPolicy.STAY else directions[action - 1])
+
+    @abstractmethod
+    def decide(self, windows: memoryview, vitals: memoryview) -> Sequence[int]:
+        """
+        Choose the action of every rover of a batch.
+
+        Args:
+            windows (memoryview): The windows of type codes centred on every rover, shaped
+                (rovers, side, side); numpy.asarray wraps it without copying.
+            vitals (memoryview): The battery, shield and carrying state of every rover, shaped (rovers, 3).
+
+        Returns:
+            Sequence[int]: The action of every rover, in the order of the batch.
+        """
+        pass
+
+
+class RandomPolicy(BatchedRoverPolicy):
+    """
+    Moves every rover in a random direction, a baseline for learned policies.
+
+    Attributes:
+        __random_pool (RandomPool): The source of the random actions.
+    """
+
+    def __init__(self, seed: Optional[int] = None, radius: Optional[int] = None) -> None:
+        """
+        Initialise the RandomPolicy object.
+
+        Args:
+            seed (Optional[int]): The seed of the actions, drawn from the random module if not given.
+            radius (Optional[int]): The radius of the observation windows.
+        """
+        super().__init__(radius)
+        self.__random_pool = RandomPool(seed)
+
+    def decide(self, windows: memoryview, vitals: memoryview) -> Sequence[int]:
+        """
+        Choose a random move for every rover of a batch.
+
+        Args:
+            windows (memoryview): The windows of type codes centred on every rover.
+            vitals (memoryview): The battery, shield and carrying state of every rover.
+
+        Returns:
+            Sequence[int]: A random move for every rover.
+        """
+        count = len(BatchedRoverPolicy.DIRECTIONS)
+        return [1 + (value * count >> 32) for value in self.__random_pool.take(len(vitals))]
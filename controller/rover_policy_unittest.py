@@ -0,0 +1,144 @@
+import contextlib
+import io
+import random
+import unittest
+from controller.config import Config
+from controller.rover_policy import BatchedRoverPolicy, HeuristicPolicy, RandomPolicy, RoverPolicy
+from model.location import Location
+from model.mars import Mars
+from model.rover import Rover
+
+
+class FixedPolicy(BatchedRoverPolicy):
+    """Moves every rover the same way and records the batches it was asked about."""
+
+    def __init__(self, action):
+        super().__init__(1)
+        self.action = action
+        self.batches = []
+        self.closed = False
+
+    def decide(self, windows, vitals):
+        self.batches.append((windows.shape, vitals.tolist()))
+        return [self.action] * len(vitals)
+
+    def close(self):
+        self.closed = True
+
+
+class TestRoverPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+
+    def add_rover(self, location):
+        rover = Rover(location, Location(10, 10))
+        self.mars.set_agent(rover, location)
+        self.mars.add_rover(rover)
+        return rover
+
+    def test_one_decision_per_batch(self):
+        rovers = [self.add_rover(Location(x, 2)) for x in (2, 5, 8)]
+        policy = FixedPolicy(1 + BatchedRoverPolicy.DIRECTIONS.index((0, 1)))
+        policy.act(self.mars, rovers)
+        self.assertEqual(len(policy.batches), 1)
+        self.assertEqual(policy.batches[0][0], (3, 3, 3))
+        self.assertEqual([rover.get_location() for rover in rovers], [Location(x, 3) for x in (2, 5, 8)])
+        self.assertEqual([rover.get_battery_level() for rover in rovers], [95.0] * 3)
+
+    def test_moving_onto_a_rock_picks_it_up(self):
+        rover = self.add_rover(Location(2, 2))
+        self.mars.place_rock(Location(3, 2))
+        FixedPolicy(1 + BatchedRoverPolicy.DIRECTIONS.index((1, 0))).act(self.mars, [rover])
+        self.assertTrue(rover.has_rock())
+        self.assertEqual(rover.get_location(), Location(3, 2))
+
+    def test_blocked_moves_and_staying_cost_nothing(self):
+        rover = self.add_rover(Location(2, 2))
+        self.add_rover(Location(3, 2))
+        FixedPolicy(1 + BatchedRoverPolicy.DIRECTIONS.index((1, 0))).act(self.mars, [rover])
+        FixedPolicy(BatchedRoverPolicy.STAY).act(self.mars, [rover])
+        self.assertEqual(rover.get_location(), Location(2, 2))
+        self.assertEqual(rover.get_battery_level(), 100.0)
+
+    def test_unknown_actions(self):
+        rover = self.add_rover(Location(2, 2))
+        with self.assertRaises(ValueError):
+            FixedPolicy(len(BatchedRoverPolicy.DIRECTIONS) + 1).act(self.mars, [rover])
+
+    def test_random_policy_moves(self):
+        rover = self.add_rover(Location(2, 2))
+        RandomPolicy(seed=1).act(self.mars, [rover])
+        self.assertEqual(self.mars.get_distance(rover.get_location(), Location(2, 2)), 1)
+
+    def test_policies_must_implement_their_decisions(self):
+        with self.assertRaises(TypeError):
+            RoverPolicy()
+        with self.assertRaises(TypeError):
+            BatchedRoverPolicy()
+        self.assertNotIsInstance(HeuristicPolicy(), BatchedRoverPolicy)
+
+
+class TestSimulatorPolicies(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (Config.world_size, Config.renderer, Config.stalemate_window, Config.rover_policy)
+        Config.world_size, Config.renderer, Config.stalemate_window = 30, "none", 0
+
+    def tearDown(self):
+        Config.world_size, Config.renderer, Config.stalemate_window, Config.rover_policy = self.saved
+
+    def run_simulation(self, policy_name, steps=40):
+        from controller.simulator import Simulator
+        Config.rover_policy = policy_name
+        random.seed(7)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            for _ in range(steps):
+                if not simulator.step():
+                    break
+            simulator.close()
+        return simulator
+
+    def test_heuristic_is_the_default(self):
+        self.assertEqual(Config.rover_policy, "heuristic")
+        self.assertIsInstance(self.run_simulation("heuristic", 1).get_rover_policy(), HeuristicPolicy)
+
+    def test_batched_policy_drives_the_rovers(self):
+        from controller.simulator import Simulator
+        Config.rover_policy = "heuristic"
+        random.seed(7)
+        policy = FixedPolicy(BatchedRoverPolicy.STAY)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            simulator.set_rover_policy(policy)
+            rovers = list(simulator._Simulator__mars.get_all_rovers())
+            locations = [rover.get_location() for rover in rovers]
+            for _ in range(5):
+                simulator.step()
+        self.assertEqual(len(policy.batches), 5)
+        self.assertEqual(policy.batches[0][0][0], len(rovers))
+        self.assertEqual([rover.get_location() for rover in rovers], locations)
+
+    def test_replaced_policy_is_closed(self):
+        from controller.simulator import Simulator
+        first, second = FixedPolicy(BatchedRoverPolicy.STAY), FixedPolicy(BatchedRoverPolicy.STAY)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator = Simulator()
+            simulator.set_rover_policy(first)
+            simulator.set_rover_policy(second)
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+
+    def test_random_policy_runs(self):
+        rovers = self.run_simulation("random")._Simulator__mars.get_all_rovers()
+        self.assertTrue(any(rover.get_battery_level() < 100.0 for rover in rovers))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            self.run_simulation("clairvoyant")
+
+
+if __name__ == '__main__':
+    unittest.main()
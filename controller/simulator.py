@@ -1,13 +1,27 @@
-import random
-import time
+import contextlib
+import os
+from typing import Optional
+from controller.agent_order import AgentOrder
 from controller.config import Config
+from controller.intent_resolver import IntentResolver
+from controller.metrics import MetricsCollector
+from controller.parallel_stepper import ParallelStepper
+from controller.policy_service import RemotePolicy
+from controller.progress_monitor import ProgressMonitor
+from controller.rollout_planner import RolloutPlanner
+from controller.rover_policy import BatchedRoverPolicy, HeuristicPolicy, RandomPolicy, RoverPolicy
 from model.alien import Alien
+from model.alien_proximity import AlienProximity
+from model.heatmap import Heatmap
 from model.location import Location
 from model.mars import Mars
+from model.random_pool import RandomPool
 from model.rock import Rock
 from model.spacecraft import Spacecraft
 from model.rover import Rover
-from view.gui import Gui
+from view.diff_server import DiffServer, DiffStream
+from view.frame_exporter import FrameExporter
+from view.terminal import TerminalRenderer
 
 
 class Simulator:
@@ -22,12 +36,89 @@ class Simulator:
         self.__simulation_step = 0
         self.__mars = Mars()
         self.__agents = []
+        self.__spacecraft = None
+        self.__aliens = []
+        self.__alien_proximity = AlienProximity()
+        self.__progress_monitor = ProgressMonitor(Config.stalemate_window)
+        self.__intent_resolver = IntentResolver()
+        self.__parallel_stepper = None
+        self.__rollout_planner = None
+        if Config.rollout_candidates > 0 and Config.parallel_workers > 0:
+            # The planner looks for the aliens near a rover in the Mars grid, where parallel mode keeps none
+            raise ValueError("The rollout planner cannot be used with parallel workers")
+        if Config.rollout_candidates > 0:
+            self.__rollout_planner = RolloutPlanner(Config.rollout_candidates, Config.rollout_count,
+                                                    Config.rollout_horizon, Config.rollout_workers)
+        self.__rover_policy = Simulator.__create_rover_policy(Config.rover_policy)
+        self.__agent_order = AgentOrder(Config.agent_order, self.__mars.get_width(), self.__mars.get_height(),
+                                        Config.agent_order_block_bits, self.__mars.get_random_pool())
         self.__generate_initial_population()
+        if Config.parallel_workers > 0:
+            # From here on the aliens live in shared memory only
+            aliens = [agent for agent in self.__agents if isinstance(agent, Alien)]
+            self.__agents = [agent for agent in self.__agents if not isinstance(agent, Alien)]
+            self.__parallel_stepper = ParallelStepper(self.__mars, aliens, Config.parallel_workers)
         self.__is_running = False
 
         agent_colours = {Spacecraft: "red", Rover: "blue", Alien: "green", Rock: "black", None: "white"}
-        self.__gui = Gui(self.__mars, agent_colours)
-        self.__gui.render()
+        self.__gui = None
+        self.__terminal = None
+        if Config.renderer == "terminal":
+            self.__terminal = TerminalRenderer(self.__mars, agent_colours, max_fps=Config.max_fps)
+        elif Config.renderer == "tk":
+            # Imported here so headless runs do not need Tk at all
+            from view.gui import Gui
+            self.__gui = Gui(self.__mars, agent_colours)
+            self.__gui.render()
+
+        self.__frame_exporter = None
+        if Config.frame_export_every > 0:
+            self.__frame_exporter = FrameExporter(self.__mars, agent_colours, Config.frame_export_directory,
+                                                  Config.frame_export_every, Config.frame_export_scale,
+                                                  Config.frame_export_format, Config.frame_export_threaded)
+
+        self.__metrics = None
+        if Config.metrics_every > 0:
+            self.__metrics = MetricsCollector(Config.metrics_every)
+
+        self.__diff_stream = None
+        self.__diff_server = None
+        if Config.diff_server_enabled:
+            self.__diff_stream = DiffStream(self.__mars, Config.diff_server_history)
+            self.__diff_server = DiffServer(self.__diff_stream, agent_colours, Config.diff_server_port)
+            self.__diff_server.start()
+            print(f"Streaming the simulation at http://{DiffServer.HOST}:{self.__diff_server.get_port()}/")
+
+    @staticmethod
+    def __create_rover_policy(name: str) -> RoverPolicy:
+        """
+        Create the rover policy named in the configuration.
+
+        Raises:
+            ValueError: If the name is unknown.
+        """
+        if name == "heuristic":
+            return HeuristicPolicy()
+        if name == "random":
+            return RandomPolicy(Config.random_seed)
+        if name == "remote":
+            return RemotePolicy(Config.rover_policy_port)
+        raise ValueError(f"Unknown rover policy: {name}")
+
+    def get_rover_policy(self) -> RoverPolicy:
+        """Get the policy deciding the moves of the rovers."""
+        return self.__rover_policy
+
+    def set_rover_policy(self, policy: RoverPolicy) -> None:
+        """
+        Replace the policy deciding the moves of the rovers, e.g. with a learned one, closing the old one.
+
+        Args:
+            policy (RoverPolicy): The new policy.
+        """
+        if policy is not self.__rover_policy:
+            self.__rover_policy.close()
+        self.__rover_policy = policy
 
     def __generate_initial_population(self) -> None:
         """
@@ -35,73 +126,158 @@ class Simulator:
 
         Adds a spacecraft in the center, rovers next to the spacecraft, and random aliens and rocks across the grid.
         """
-        centre_x = self.__mars.get_width() // 2
-        centre_y = self.__mars.get_height() // 2
+        agents = Simulator.populate(self.__mars)
+        self.__spacecraft = agents[0]
+        self.__spacecraft.set_planner(self.__rollout_planner)
+        self.__agents.extend(agents)
+
+    @staticmethod
+    def populate(mars: Mars) -> list:
+        """
+        Place an initial population of agents on an empty Mars, drawing from its random pool.
+
+        Adds a spacecraft in the center, rovers next to the spacecraft, and random aliens and rocks across the grid.
+
+        Args:
+            mars (Mars): The Mars environment.
+
+        Returns:
+            list: The agents placed, the spacecraft first, then the rovers and the aliens. Rocks are terrain
+                and not included.
+        """
+        centre_x = mars.get_width() // 2
+        centre_y = mars.get_height() // 2
         spacecraft_location = Location(centre_x, centre_y)
         spacecraft = Spacecraft(spacecraft_location)
-        self.__mars.set_agent(spacecraft, spacecraft_location)
-        self.__agents.append(spacecraft)
+        mars.set_agent(spacecraft, spacecraft_location)
+        agents = [spacecraft]
+
+        random_pool = mars.get_random_pool()
 
         # Generate rovers adjacent to spacecraft
         for _ in range(Config.initial_num_rovers):
-            free_locations = self.__mars.get_free_adjacent_locations(spacecraft_location)
+            free_locations = mars.get_free_adjacent_locations(spacecraft_location)
             if len(free_locations) > 0:
-                rover_location = random.choice(free_locations)
+                rover_location = random_pool.choice(free_locations)
                 rover = Rover(rover_location, spacecraft_location)
-                self.__mars.set_agent(rover, rover_location)
-                self.__agents.append(rover)
-
-        # Generate random aliens and rocks
-        for y in range(self.__mars.get_height()):
-            for x in range(self.__mars.get_width()):
-                location = Location(x, y)
-
-                if self.__mars.get_agent(location) is None:
+                mars.set_agent(rover, rover_location)
+                mars.add_rover(rover)
+                agents.append(rover)
 
-                    probability = random.random()
+        # Generate random aliens and rocks, drawing one row of raw values at a time and comparing them
+        # against the probabilities scaled to the same range
+        alien_threshold = int(Config.alien_creation_probability * RandomPool.SCALE)
+        rock_threshold = int(Config.rock_creation_probability * RandomPool.SCALE)
+        width = mars.get_width()
+        type_codes = mars.get_type_codes()
+        for y in range(mars.get_height()):
+            for x, draw in enumerate(random_pool.take(width)):
+                if type_codes[y * width + x] != Mars.EMPTY_CODE:
+                    continue
 
-                    if probability < Config.alien_creation_probability:
-                        alien = Alien(location)
-                        self.__mars.set_agent(alien, location)
-                        self.__agents.append(alien)
+                if draw < alien_threshold:
+                    location = Location(x, y)
+                    alien = Alien(location)
+                    mars.set_agent(alien, location)
+                    agents.append(alien)
 
-                    elif probability < Config.rock_creation_probability:
-                        rock = Rock(location)
-                        self.__mars.set_agent(rock, location)
-                        self.__agents.append(rock)
+                elif draw < rock_threshold:
+                    # Rocks are terrain in Mars and never act, so they are not kept as agents
+                    mars.place_rock(Location(x, y))
+        return agents
 
     def run(self) -> None:
-        """Run the simulation."""
+        """
+        Run the simulation.
+
+        The GUI steps the simulation at its own pace and renders the latest state at a capped frame rate,
+        so rendering no longer slows the simulation down. Without a GUI the simulation is stepped until it
+        ends or Config.max_steps is reached.
+        """
         self.__is_running = True
+        if self.__gui is not None:
+            self.__gui.run(self.step)
+        elif self.__terminal is not None:
+            # The agents report to standard output, which would scroll the map away
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                self.__run_headless()
+            self.__terminal.close()
+        else:
+            self.__run_headless()
+        self.__is_running = False
+        self.close()
+        if self.__metrics is not None:
+            self.__metrics.export(Config.metrics_path)
+        if Config.heatmap_directory:
+            self.__save_heatmaps(Config.heatmap_directory)
 
-        while self.__is_running:
-            self.__update()
-            self.__render()
-            time.sleep(Config.sim_delay)
-            if self.__gui.is_closed():
-                self.__is_running = False
+    def close(self) -> None:
+        """Release the frame exporter, the diff server, the worker processes and the rover policy at the end of run."""
+        if self.__frame_exporter is not None:
+            self.__frame_exporter.close()
+            self.__frame_exporter = None
+        if self.__diff_server is not None:
+            self.__diff_server.stop()
+            self.__diff_server = None
+        if self.__parallel_stepper is not None:
+            self.__parallel_stepper.close()
+            self.__parallel_stepper = None
+        if self.__rollout_planner is not None:
+            self.__rollout_planner.close()
+            self.__rollout_planner = None
+        self.__rover_policy.close()
 
-            # Check if all rovers are destroyed or no rocks remaining
-            if self.__all_rovers_destroyed() or self.__no_rocks_remaining():
-                self.__is_running = False
+    def __save_heatmaps(self, directory: str) -> None:
+        """Save every heatmap layer as a .npy file and a PNG image."""
+        os.makedirs(directory, exist_ok=True)
+        heatmap = self.__mars.get_heatmap()
+        for name in Heatmap.LAYERS:
+            heatmap.save_npy(os.path.join(directory, name + ".npy"), name)
+            heatmap.save_png(os.path.join(directory, name + ".png"), name)
 
-    def __all_rovers_destroyed(self) -> bool:
-        """Check if all rovers are destroyed."""
-        for agent in self.__agents:
-            if isinstance(agent, Rover) and not agent.is_destroyed():
-                return False
-        return True
+    def __run_headless(self) -> None:
+        """Step the simulation until it ends or Config.max_steps is reached, drawing to the terminal if any."""
+        while self.step():
+            if self.__terminal is not None:
+                self.__terminal.render(f"Step {self.__simulation_step}")
+            if 0 < Config.max_steps <= self.__simulation_step:
+                break
 
-    def __no_rocks_remaining(self) -> bool:
-        """Check if no rocks remaining."""
-        for agent in self.__agents:
-            if isinstance(agent, Rock):
-                return False
+    def step(self) -> bool:
+        """
+        Advance the simulation by one step.
+
+        Returns:
+            bool: True if the simulation should continue, False once it has ended.
+        """
+        self.__mars.get_heatmap().tick(self.__simulation_step)
+        self.__update()
+        self.__simulation_step += 1
+        if self.__frame_exporter is not None:
+            self.__frame_exporter.capture(self.__simulation_step)
+        if self.__diff_stream is not None:
+            self.__diff_stream.record(self.__simulation_step)
+        if self.__metrics is not None:
+            aliens = self.__aliens
+            if self.__parallel_stepper is not None and self.__metrics.is_due(self.__simulation_step):
+                aliens = self.__parallel_stepper.get_aliens()
+            self.__metrics.record(self.__simulation_step, self.__spacecraft, self.__mars.get_all_rovers(), aliens)
+
+        reason = self.__progress_monitor.check(self.__simulation_step, self.__mars, self.__spacecraft)
+        if reason is not None:
+            print(f"Simulation ended after {self.__simulation_step} steps: {reason}")
+            self.__is_running = False
+            return False
         return True
 
-    def __render(self) -> None:
-        """Render the current state of the simulation."""
-        self.__gui.render()
+    def get_end_reason(self) -> Optional[str]:
+        """
+        Get why the simulation ended.
+
+        Returns:
+            Optional[str]: One of the ProgressMonitor reason codes, or None while the simulation can continue.
+        """
+        return self.__progress_monitor.get_end_reason()
 
     def __update(self) -> None:
         """Update the simulation state."""
@@ -118,10 +294,78 @@ class Simulator:
         # Remove destroyed rovers from the list of agents
         for agent in agents_to_remove:
             self.__agents.remove(agent)
+            self.__mars.remove_rover(agent)
             self.__mars.set_agent(None, agent.get_location())
 
+        # Add rovers created by the spacecraft since the last step
+        known_rover_ids = {agent.get_id() for agent in self.__agents if isinstance(agent, Rover)}
+        for rover in self.__mars.get_all_rovers():
+            if rover.get_id() not in known_rover_ids:
+                self.__agents.append(rover)
+
+        self.__agent_order.sort(self.__agents)
+        self.__sense_aliens()
+
+        if self.__parallel_stepper is not None:
+            # The other agents decide here first; the aliens then decide and mostly move in the worker
+            # processes, all against the world as it was at the start of the step
+            self.__mars.begin_intents()
+            self.__act(self.__agents)
+            spacecraft_location = self.__spacecraft.get_location() if self.__spacecraft is not None else None
+            self.__parallel_stepper.step(self.__mars.end_intents(), self.__intent_resolver,
+                                         self.__mars.get_all_rovers(), spacecraft_location)
+        elif Config.update_mode == "synchronous":
+            # Every agent decides against the world as it was at the start of the step, then all the
+            # intents are committed together
+            self.__mars.begin_intents()
+            self.__act(self.__agents)
+            self.__intent_resolver.commit(self.__mars, self.__mars.end_intents())
+        else:
+            self.__act(self.__agents)
+
+    def __act(self, agents: list) -> None:
+        """
+        Let agents act in order, handing the rovers to the rover policy.
+
+        A batched policy decides for all the rovers at once, before the other agents act; any other policy
+        decides for each rover in its turn.
+        """
+        if not isinstance(self.__rover_policy, BatchedRoverPolicy):
+            for agent in agents:
+                if isinstance(agent, Rover):
+                    self.__rover_policy.act(self.__mars, [agent])
+                else:
+                    agent.act(self.__mars)
+            return
+        self.__rover_policy.act(self.__mars, [agent for agent in agents if isinstance(agent, Rover)])
+        for agent in agents:
+            if not isinstance(agent, Rover):
+                agent.act(self.__mars)
+
+    def __sense_aliens(self) -> None:
+        """Run one batched proximity query for all active aliens instead of letting each scan on its own."""
+        aliens = []
+        rovers = []
+        spacecraft_location = None
+        self.__aliens = []
         for agent in self.__agents:
-            agent.act(self.__mars)
+            if isinstance(agent, Alien):
+                self.__aliens.append(agent)
+                if not agent.is_hibernating():
+                    aliens.append(agent)
+            elif isinstance(agent, Rover):
+                rovers.append(agent)
+            elif isinstance(agent, Spacecraft):
+                spacecraft_location = agent.get_location()
+
+        if self.__parallel_stepper is not None:
+            return  # The aliens are kept and sensed for in the worker processes
+        if Config.update_mode == "synchronous":
+            # Ties between equally near rovers go to the first one listed, so list them in an order of their own
+            rovers.sort(key=lambda rover: rover.get_id())
+        results = self.__alien_proximity.query(self.__mars, aliens, rovers, spacecraft_location)
+        for alien, (nearest_rover, sensed_spacecraft_location) in zip(aliens, results):
+            alien.sense(nearest_rover, sensed_spacecraft_location)
 
 
 if __name__ == "__main__":
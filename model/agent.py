@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
     from model.environment import Environment
+    from model.intent import Intent
     from model.location import Location
 
 
 class Agent(ABC):
-    """Represents an agent with a location."""
+    """
+    Represents an agent with a location.
+
+    Subclasses define TYPE_CODE, the non-zero byte that marks their cells in the occupancy grid of the
+    environment. Code 0 is reserved for empty cells.
+
+    Agents and their subclasses declare __slots__, so instances carry no per-instance __dict__. Slot names
+    are name-mangled like any other private attribute, e.g. _Rover__battery_level.
+    """
+    __slots__ = ("__location",)
 
     def __init__(self, location: Location) -> None:
         """
@@ -42,10 +53,34 @@ class Agent(ABC):
         """
         return f"Agent at {self.__location}"
 
+    def clone(self) -> Agent:
+        """
+        Copy the agent, e.g. for a forked world that needs to change it.
+
+        Subclasses copy the containers they change in place, so the copy and the original evolve apart.
+
+        Returns:
+            Agent: The copy.
+        """
+        return copy.copy(self)
+
     @abstractmethod
     def act(self, environment: Environment) -> None:
         pass
 
+    def apply_intent(self, environment: Environment, intent: Intent) -> None:
+        """
+        Carry out an intent this agent submitted while acting.
+
+        Parameters:
+            environment (Environment): The environment the agent acts in.
+            intent (Intent): The intent to carry out.
+
+        Raises:
+            ValueError: If the agent does not submit intents of that kind.
+        """
+        raise ValueError(f"{type(self).__name__} cannot apply {intent.get_kind()} intents")
+
     def get_location(self) -> Location:
         """
         Get the location of the agent.
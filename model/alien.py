@@ -1,9 +1,9 @@
 from __future__ import annotations
-import random
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from model.rover import Rover
 from controller.config import Config
 from model.agent import Agent
+from model.intent import Intent
 from model.spacecraft import Spacecraft
 from model.location import Location  # Import Location class
 
@@ -19,7 +19,11 @@ class Alien(Agent):
     Attributes:
         __energy (int): The energy level of the alien.
         __hibernating (bool): A flag indicating whether the alien is hibernating.
+        __sensed (tuple): The nearest rover and the spacecraft location sensed in bulk for this step, or None.
     """
+    __slots__ = ("__energy", "__hibernating", "__sensed")
+    TYPE_CODE = 3
+
     def __init__(self, location: Location) -> None:
         """
         Initialize the Alien object.
@@ -30,6 +34,59 @@ class Alien(Agent):
         super().__init__(location)
         self.__energy = 100
         self.__hibernating = False
+        self.__sensed: Optional[Tuple[Optional[Rover], Optional[Location]]] = None
+
+    def clone(self) -> Alien:
+        """
+        Copy the alien; the copy senses on its own, since the rovers sensed for this one are not its world's.
+
+        Returns:
+            Alien: The copy.
+        """
+        alien = super().clone()
+        alien.__sensed = None
+        return alien
+
+    def is_hibernating(self) -> bool:
+        """
+        Check if the alien is hibernating.
+
+        Returns:
+            bool: True if the alien is hibernating, False otherwise.
+        """
+        return self.__hibernating
+
+    def get_energy(self) -> int:
+        """
+        Get the energy level of the alien.
+
+        Returns:
+            int: The energy level of the alien.
+        """
+        return self.__energy
+
+    def set_state(self, energy: int, hibernating: bool) -> None:
+        """
+        Overwrite the energy level and hibernation flag, e.g. with the outcome of acting in a worker process.
+
+        Args:
+            energy (int): The new energy level.
+            hibernating (bool): Whether the alien is hibernating.
+        """
+        self.__energy = energy
+        self.__hibernating = hibernating
+
+    def sense(self, nearest_rover: Optional[Rover], spacecraft_location: Optional[Location]) -> None:
+        """
+        Provide the result of a batched proximity query for the next call to act.
+
+        When set, act uses these instead of scanning the cells around the alien itself.
+
+        Args:
+            nearest_rover (Optional[Rover]): The nearest rover within sensing range, if any.
+            spacecraft_location (Optional[Location]): The spacecraft location if within sensing range.
+        """
+        self.__sensed = (nearest_rover, spacecraft_location)
 
     def act(self, mars: Mars) -> None:
         """
@@ -48,21 +105,29 @@ class Alien(Agent):
             # print("hibernating")
             return
 
-        spacecraft_location = self.__sense_spacecraft_location(mars)
+        sensed, self.__sensed = self.__sensed, None
+        if sensed is not None:
+            spacecraft_location = sensed[1]
+        else:
+            spacecraft_location = self.__sense_spacecraft_location(mars)
 
         if spacecraft_location and self.__is_near_spacecraft(mars, spacecraft_location):
             self.__move_away_from_spacecraft(mars, spacecraft_location)
             # print(f"Alien {self.get_location()} moved away from the spacecraft")
         else:
-            rovers = self.__scan_for_rovers(mars)
+            if sensed is not None:
+                # The sensed rover may have been destroyed earlier in this step
+                rovers = [sensed[0]] if sensed[0] is not None and not sensed[0].is_destroyed() else []
+            else:
+                rovers = self.__scan_for_rovers(mars)
             if len(rovers) > 0:
                 chosen_rover = self.__choose_rover_to_chase(rovers)
                 if chosen_rover:
-                    self.__move_towards_rover(mars, chosen_rover)
-                    print(f"Alien {self.get_location()} chasing rover {chosen_rover.get_id()} {chosen_rover.get_location()}")
-                    if self.__is_adjacent_to_chasing_rover(mars, chosen_rover):
+                    location = self.__move_towards_rover(mars, chosen_rover)
+                    print(f"Alien {location} chasing rover {chosen_rover.get_id()} {chosen_rover.get_location()}")
+                    if self.__is_adjacent_to_chasing_rover(mars, chosen_rover, location):
                         print("Alien adjacent")
-                        self.__attack_rover(chosen_rover)
+                        mars.submit(Intent(self, Intent.ATTACK, other=chosen_rover))
                         print("Alien attacking")
                         print(f"Rover {chosen_rover.get_id()}- Shield Level: {chosen_rover.get_shield()}")
             else:
@@ -85,9 +150,7 @@ class Alien(Agent):
                 x = (current_location.get_x() + x_offset) % Config.world_size
                 y = (current_location.get_y() + y_offset) % Config.world_size
                 sensed_location = Location(x, y)
-                agent = mars.get_agent(sensed_location)
-                if isinstance(agent, Spacecraft):
-                    # self.__move_away_from_spacecraft(mars, sensed_location)
+                if mars.get_type_code(sensed_location) == Spacecraft.TYPE_CODE:
                     return sensed_location
 
     def __is_near_spacecraft(self, mars: Mars, spacecraft_location: Location) -> bool:
@@ -130,10 +193,10 @@ class Alien(Agent):
 
         if len(free_locations) > 0:
             if target_location in free_locations:
-                self.__move(mars, target_location)
+                mars.submit(Intent(self, Intent.MOVE, target_location))
             else:
                 # If the chosen location isn't free, move to any available free location
-                self.__move(mars, random.choice(free_locations))
+                mars.submit(Intent(self, Intent.MOVE, options=free_locations))
 
     def __move(self, mars: Mars, new_location: Location) -> None:
         """
@@ -147,6 +210,7 @@ class Alien(Agent):
         mars.set_agent(self, new_location)
         self.set_location(new_location)
         mars.set_agent(None, previous_location)
+        mars.get_heatmap().record_alien_move(new_location.get_x(), new_location.get_y())
 
     def __move_randomly(self, mars: Mars) -> None:
         """
@@ -157,8 +221,7 @@ class Alien(Agent):
         """
         free_locations = mars.get_free_adjacent_locations(self.get_location())
         if free_locations and self.__energy > 0:
-            random_free_location = random.choice(free_locations)
-            self.__move(mars, random_free_location)
+            mars.submit(Intent(self, Intent.MOVE, options=free_locations))
 
     def __scan_for_rovers(self, mars: Mars) -> List[Rover]:
         """
@@ -181,11 +244,9 @@ class Alien(Agent):
                 y = (current_location.get_y() + y_offset) % Config.world_size
                 adjacent_location = Location(x, y)
 
-                # Check if there's a rover at the adjacent location
-                agent = mars.get_agent(adjacent_location)
-                if isinstance(agent, Rover):
-                    found_rovers.append(agent)
-                    # print(f"Alien found rover found at location: {adjacent_location}")
+                # Check the type code first, so only rover cells are looked up
+                if mars.get_type_code(adjacent_location) == Rover.TYPE_CODE:
+                    found_rovers.append(mars.get_agent(adjacent_location))
 
         return found_rovers
 
@@ -204,13 +265,16 @@ class Alien(Agent):
             return rovers[0]  # Choose the first rover found
         return None
 
-    def __move_towards_rover(self, mars: Mars, rover: Rover):
+    def __move_towards_rover(self, mars: Mars, rover: Rover) -> Location:
         """
         Move the alien towards a rover.
 
         Args:
             mars (Mars): The Mars environment.
             rover (Rover): The rover to move towards.
+
+        Returns:
+            Location: The location the alien moves to, or its current location if the way is blocked.
         """
         current_x = self.get_location().get_x()
         current_y = self.get_location().get_y()
@@ -223,38 +287,62 @@ class Alien(Agent):
 
         new_location = Location(current_x + dir_x, current_y + dir_y)
         if new_location in mars.get_free_adjacent_locations(self.get_location()):
-            self.__move(mars, new_location)
-            self.__energy -= 20
+            mars.submit(Intent(self, Intent.CHASE, new_location))
+            return new_location
+        return self.get_location()
 
-    def __is_adjacent_to_chasing_rover(self, mars: Mars, rover: Rover):
+    def __is_adjacent_to_chasing_rover(self, mars: Mars, rover: Rover, location: Optional[Location] = None):
         """
         Check if the alien is adjacent to the rover it is chasing.
 
         Args:
             mars (Mars): The Mars environment.
             rover (Rover): The rover being chased.
+            location (Optional[Location]): The location to check from, defaults to the alien's location.
 
         Returns:
             bool: True if the alien is adjacent to the chasing rover, False otherwise.
         """
-        current_location = self.get_location()
+        current_location = location or self.get_location()
         adjacent_locations = mars.get_adjacent_locations(current_location)
         if rover.get_location() in adjacent_locations:
             return True
         return False
 
-    def __attack_rover(self, rover: Rover):
+    def __attack_rover(self, rover: Rover, mars: Optional[Mars] = None):
         """
         Attack a rover.
 
         Args:
             rover (Rover): The rover being attacked.
+            mars (Mars): The Mars environment, used to record where the attack happened.
         """
         self.__energy -= 20
         # print(f"Alien's current energy level: {self.__energy}")
         rover.sustain_damage(25)
+        if mars is not None:
+            mars.get_heatmap().record_attack(rover.get_location().get_x(), rover.get_location().get_y())
         print(f"Alien attacking Rover {rover.get_id()}")
 
+    def apply_intent(self, mars: Mars, intent: Intent) -> None:
+        """
+        Carry out an intent the alien submitted while acting.
+
+        Args:
+            mars (Mars): The Mars environment.
+            intent (Intent): The intent to carry out.
+        """
+        kind = intent.get_kind()
+        if kind == Intent.MOVE:
+            self.__move(mars, intent.get_location())
+        elif kind == Intent.CHASE:
+            self.__move(mars, intent.get_location())
+            self.__energy -= 20
+        elif kind == Intent.ATTACK:
+            self.__attack_rover(intent.get_other(), mars)
+        else:
+            super().apply_intent(mars, intent)
+
     def __restore_energy(self):
         """Restore energy levels for the alien."""
         self.__energy = min(self.__energy + 10, 100)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from model.alien import Alien
+    from model.location import Location
+    from model.mars import Mars
+    from model.rover import Rover
+
+
+class AlienProximity:
+    """
+    Batched proximity queries for all aliens in one simulation step.
+
+    Instead of every alien scanning the 49 cells around it, rover positions are copied once per step into
+    flat coordinate arrays and bucketed on a coarse grid whose cells are at least one sensing radius wide.
+    Each alien then only measures wrapped distances to the rovers in its own and the eight neighbouring
+    buckets, and to the spacecraft.
+
+    Attributes:
+        __radius (int): The sensing radius of the aliens.
+    """
+
+    def __init__(self, radius: int = 3) -> None:
+        """
+        Initialise the AlienProximity object.
+
+        Args:
+            radius (int): The sensing radius of the aliens.
+        """
+        self.__radius = radius
+
+    def query(self, mars: Mars, aliens: List[Alien], rovers: List[Rover],
+              spacecraft_location: Optional[Location]) -> List[Tuple[Optional[Rover], Optional[Location]]]:
+        """
+        Compute, for every alien at once, the nearest rover and whether the spacecraft lies within radius.
+
+        Args:
+            mars (Mars): The Mars environment.
+            aliens (List[Alien]): The aliens to sense for.
+            rovers (List[Rover]): The rovers that can be sensed.
+            spacecraft_location (Optional[Location]): The location of the spacecraft, if any.
+
+        Returns:
+            List[Tuple[Optional[Rover], Optional[Location]]]: For every alien, the nearest rover within radius
+            and the spacecraft location if it lies within radius; None where nothing was sensed.
+        """
+        width, height, radius = mars.get_width(), mars.get_height(), self.__radius
+        columns = max(1, width // max(radius, 1))
+        rows = max(1, height // max(radius, 1))
+
+        rover_xs = array("i", (rover.get_location().get_x() % width for rover in rovers))
+        rover_ys = array("i", (rover.get_location().get_y() % height for rover in rovers))
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index in range(len(rovers)):
+            key = (rover_xs[index] * columns // width, rover_ys[index] * rows // height)
+            buckets.setdefault(key, []).append(index)
+        neighbour_columns = [-1, 0, 1] if columns >= 3 else list(range(columns))
+        neighbour_rows = [-1, 0, 1] if rows >= 3 else list(range(rows))
+
+        if spacecraft_location is not None:
+            spacecraft_x = spacecraft_location.get_x() % width
+            spacecraft_y = spacecraft_location.get_y() % height
+
+        results = []
+        for alien in aliens:
+            location = alien.get_location()
+            x, y = location.get_x() % width, location.get_y() % height
+
+            nearest_spacecraft = None
+            if spacecraft_location is not None:
+                dx = abs(x - spacecraft_x)
+                dy = abs(y - spacecraft_y)
+                if max(min(dx, width - dx), min(dy, height - dy)) <= radius:
+                    nearest_spacecraft = spacecraft_location
+
+            bucket_x, bucket_y = x * columns // width, y * rows // height
+            nearest_rover, nearest_key = None, None
+            for offset_y in neighbour_rows:
+                for offset_x in neighbour_columns:
+                    key_x = (bucket_x + offset_x) % columns if columns >= 3 else offset_x
+                    key_y = (bucket_y + offset_y) % rows if rows >= 3 else offset_y
+                    for index in buckets.get((key_x, key_y), ()):
+                        dx = abs(x - rover_xs[index])
+                        dy = abs(y - rover_ys[index])
+                        distance = max(min(dx, width - dx), min(dy, height - dy))
+                        if distance <= radius:
+                            key = (distance, index)
+                            if nearest_key is None or key < nearest_key:
+                                nearest_rover, nearest_key = rovers[index], key
+            results.append((nearest_rover, nearest_spacecraft))
+        return results
@@ -0,0 +1,62 @@
+import random
+import unittest
+from model.alien import Alien
+from model.alien_proximity import AlienProximity
+from model.location import Location
+from model.mars import Mars
+from model.rover import Rover
+
+
+class TestAlienProximity(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.proximity = AlienProximity(radius=3)
+        self.spacecraft_location = Location(10, 10)
+
+    def test_nearest_rover_within_radius(self):
+        alien = Alien(Location(0, 0))
+        far_rover = Rover(Location(3, 3), self.spacecraft_location)
+        near_rover = Rover(Location(19, 1), self.spacecraft_location)
+
+        results = self.proximity.query(self.mars, [alien], [far_rover, near_rover], self.spacecraft_location)
+
+        self.assertIs(results[0][0], near_rover)
+        self.assertIsNone(results[0][1])
+
+    def test_rover_out_of_radius(self):
+        alien = Alien(Location(0, 0))
+        rover = Rover(Location(4, 0), self.spacecraft_location)
+
+        results = self.proximity.query(self.mars, [alien], [rover], self.spacecraft_location)
+
+        self.assertEqual(results, [(None, None)])
+
+    def test_spacecraft_within_radius_wraps(self):
+        alien = Alien(Location(18, 18))
+
+        results = self.proximity.query(self.mars, [alien], [], Location(1, 0))
+
+        self.assertEqual(results[0][1], Location(1, 0))
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        aliens = [Alien(Location(rng.randrange(20), rng.randrange(20))) for _ in range(50)]
+        rovers = [Rover(Location(rng.randrange(20), rng.randrange(20)), self.spacecraft_location)
+                  for _ in range(15)]
+
+        results = self.proximity.query(self.mars, aliens, rovers, self.spacecraft_location)
+
+        for alien, (rover, spacecraft_location) in zip(aliens, results):
+            distances = [self.mars.get_distance(alien.get_location(), other.get_location()) for other in rovers]
+            in_range = [distance for distance in distances if distance <= 3]
+            if in_range:
+                self.assertEqual(self.mars.get_distance(alien.get_location(), rover.get_location()), min(in_range))
+            else:
+                self.assertIsNone(rover)
+            near = self.mars.get_distance(alien.get_location(), self.spacecraft_location) <= 3
+            self.assertEqual(spacecraft_location is not None, near)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from model.alien import Alien
+from model.heatmap import Heatmap
 from model.mars import Mars
 from model.location import Location
 from model.rover import Rover
@@ -84,6 +85,27 @@ class TestAlien(unittest.TestCase):
         self.assertEqual(self.alien._Alien__energy, initial_energy - 20)
         self.assertEqual(rover.get_shield(), initial_rover_shield - 25)
 
+    def test_attack_rover_records_heatmap(self):
+        rover_location = Location(1, 0)
+        rover = Rover(rover_location, self.alien_location)
+        self.mars.set_agent(rover, rover_location)
+
+        self.alien._Alien__attack_rover(rover, self.mars)
+
+        self.assertEqual(self.mars.get_heatmap().get_layer(Heatmap.ATTACKS)[1], 1)
+
+    def test_act_uses_sensed_rover(self):
+        rover_location = Location(2, 0)
+        rover = Rover(rover_location, Location(10, 10))
+        self.mars.set_agent(rover, rover_location)
+        self.mars.set_agent(self.alien, self.alien_location)
+
+        self.alien.sense(rover, None)
+        self.alien.act(self.mars)
+
+        self.assertEqual(self.alien.get_location(), Location(1, 0))
+        self.assertEqual(rover.get_shield(), 75)
+
     def test_restore_energy(self):
         self.alien._Alien__energy = 50
         self.alien._Alien__hibernating = True
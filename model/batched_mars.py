@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import random
+from typing import Optional, Tuple
+
+from controller.config import Config
+from model.alien import Alien
+from model.mars import Mars
+from model.observation_windows import ObservationWindows
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+try:
+    import numpy
+except ImportError:  # NumPy is only needed for batched worlds
+    numpy = None
+
+
+class BatchedMars:
+    """
+    Many small, independent Mars worlds stepped together, e.g. to feed a reinforcement learning loop.
+
+    Every world is one slice of a stacked K x H x W array of type codes, and the agents are rows of per-world
+    tables: rover positions, batteries, shields and rocks, alien positions, energy and hibernation. A step
+    applies the same rules to all worlds at once with array operations, so its cost is a few dozen NumPy
+    calls however many worlds there are, instead of a Python method call per agent per world.
+
+    The rules are a condensed version of the object model in synchronous mode:
+    - Rovers take one action each: 0 to stay, or 1 to 8 to move in one of DIRECTIONS. A move costs
+      MOVE_COST battery and enters an empty cell, or a rock cell to pick the rock up if the rover carries
+      none.
+    - Aliens hibernate when their energy runs low and wake up restored, move away from the spacecraft within
+      SENSING_RADIUS, chase the nearest rover within SENSING_RADIUS and attack it once adjacent, and
+      otherwise wander to a random free neighbour.
+    - Every agent decides against the world as it was at the start of the step; when several claim the
+      same cell a random one of them gets it and the others stay put. Attacks need the alien adjacent to its
+      rover once everyone has moved.
+    - A rover next to the spacecraft recharges fully and delivers its rock, earning a reward of 1.
+
+    A world is done when all its rovers are destroyed, when no rocks are left, or after max_steps steps,
+    and it is reset right away, so the observations returned with a done flag are the first of the next
+    episode.
+
+    Observations are gathered into preallocated buffers rather than built per rover: the windows of type
+    codes of radius window_radius centred on every rover, wrapping around the edges, and the vitals of every
+    rover: battery and shield scaled to [0, 1] and whether it carries a rock. The buffers are overwritten by
+    the next step; copy them to keep them.
+
+    Attributes:
+        __num_worlds (int): The number of worlds K.
+        __size (int): The width and height of every world.
+        __num_rovers (int): The number of rovers per world.
+        __num_aliens (int): The number of aliens per world.
+        __max_steps (int): The length after which an episode ends, 0 for no limit.
+        __window_radius (int): The radius of the observation windows.
+        __random (numpy.random.Generator): The generator of every random decision.
+        __grids (numpy.ndarray): The type codes of all worlds, K x H x W.
+        __rover_xs, __rover_ys (numpy.ndarray): The rover positions, K x R.
+        __batteries (numpy.ndarray): The rover battery levels, K x R.
+        __shields (numpy.ndarray): The rover shield levels, K x R.
+        __carrying (numpy.ndarray): Whether each rover carries a rock, K x R.
+        __alive (numpy.ndarray): Whether each rover is still intact, K x R.
+        __alien_xs, __alien_ys (numpy.ndarray): The alien positions, K x A.
+        __energy (numpy.ndarray): The alien energy levels, K x A.
+        __hibernating (numpy.ndarray): Whether each alien is hibernating, K x A.
+        __rock_counts (numpy.ndarray): The rocks left on the ground of every world.
+        __delivered (numpy.ndarray): The rocks delivered in the current episode of every world.
+        __steps (numpy.ndarray): The steps taken in the current episode of every world.
+        __windows (numpy.ndarray): The observation windows, K x R x (2r + 1) x (2r + 1).
+        __vitals (numpy.ndarray): The observed rover vitals, K x R x 3.
+        __observation_windows (ObservationWindows): Gathers the windows.
+    """
+    DIRECTIONS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+    STAY = 0  # Action 1 + i moves in DIRECTIONS[i]
+
+    MOVE_COST = 5.0
+    CHASE_COST = 20
+    ATTACK_COST = 20
+    ATTACK_DAMAGE = 25
+    HIBERNATION_ENERGY = 20
+    RESTORE_RATE = 10
+    SENSING_RADIUS = 3
+
+    def __init__(self, num_worlds: int, size: Optional[int] = None, num_rovers: Optional[int] = None,
+                 num_aliens: Optional[int] = None, max_steps: int = 500, window_radius: Optional[int] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        Initialise the BatchedMars object and reset every world.
+
+        Args:
+            num_worlds (int): The number of worlds K.
+            size (Optional[int]): The width and height of every world, Config.world_size by default.
+            num_rovers (Optional[int]): The rovers per world, Config.initial_num_rovers by default, at most 8.
+            num_aliens (Optional[int]): The aliens per world, by default the expected number of aliens of a
+                generated Mars world.
+            max_steps (int): The length after which an episode ends, 0 for no limit.
+            window_radius (Optional[int]): The radius of the observation windows, Config.rover_sensing_radius
+                by default.
+            seed (Optional[int]): The seed of the worlds, Config.random_seed or one drawn from the random
+                module by default.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If there are no worlds, the worlds are too small, there are more rovers than cells
+                next to the spacecraft or more aliens than the world has room for, or the windows would wrap
+                onto themselves.
+        """
+        if numpy is None:
+            raise ImportError("Batched worlds require NumPy")
+        size = Config.world_size if size is None else size
+        num_rovers = Config.initial_num_rovers if num_rovers is None else num_rovers
+        if num_aliens is None:
+            num_aliens = round(Config.alien_creation_probability * size * size)
+        window_radius = Config.rover_sensing_radius if window_radius is None else window_radius
+        if seed is None:
+            seed = random.getrandbits(64) if Config.random_seed is None else Config.random_seed
+        if num_worlds < 1:
+            raise ValueError("There must be at least one world")
+        if size < 3:
+            raise ValueError("Worlds must be at least 3 cells wide")
+        if not 0 <= num_rovers <= len(BatchedMars.DIRECTIONS):
+            raise ValueError(f"There is room for at most {len(BatchedMars.DIRECTIONS)} rovers next to the spacecraft")
+        if not 0 <= num_aliens <= size * size - len(BatchedMars.DIRECTIONS) - 1:
+            raise ValueError(f"There is no room for {num_aliens} aliens in a world of size {size}")
+
+        self.__num_worlds = num_worlds
+        self.__size = size
+        self.__num_rovers = num_rovers
+        self.__num_aliens = num_aliens
+        self.__max_steps = max_steps
+        self.__window_radius = window_radius
+        self.__random = numpy.random.default_rng(seed)
+
+        shape = (num_worlds, num_rovers)
+        self.__grids = numpy.zeros((num_worlds, size, size), dtype=numpy.uint8)
+        self.__rover_xs = numpy.zeros(shape, dtype=numpy.int64)
+        self.__rover_ys = numpy.zeros(shape, dtype=numpy.int64)
+        self.__batteries = numpy.zeros(shape, dtype=numpy.float32)
+        self.__shields = numpy.zeros(shape, dtype=numpy.int32)
+        self.__carrying = numpy.zeros(shape, dtype=bool)
+        self.__alive = numpy.zeros(shape, dtype=bool)
+        self.__alien_xs = numpy.zeros((num_worlds, num_aliens), dtype=numpy.int64)
+        self.__alien_ys = numpy.zeros((num_worlds, num_aliens), dtype=numpy.int64)
+        self.__energy = numpy.zeros((num_worlds, num_aliens), dtype=numpy.int32)
+        self.__hibernating = numpy.zeros((num_worlds, num_aliens), dtype=bool)
+        self.__rock_counts = numpy.zeros(num_worlds, dtype=numpy.int64)
+        self.__delivered = numpy.zeros(num_worlds, dtype=numpy.int64)
+        self.__steps = numpy.zeros(num_worlds, dtype=numpy.int64)
+
+        side = 2 * window_radius + 1
+        self.__windows = numpy.zeros((num_worlds, num_rovers, side, side), dtype=numpy.uint8)
+        self.__vitals = numpy.zeros((num_worlds, num_rovers, 3), dtype=numpy.float32)
+        self.__observation_windows = ObservationWindows(size, size, window_radius)
+        # The index of the first cell of every world in the flattened stack
+        self.__world_bases = (numpy.arange(num_worlds) * size * size)[:, None]
+        self.__direction_xs = numpy.array([0] + [dx for dx, _ in BatchedMars.DIRECTIONS])
+        self.__direction_ys = numpy.array([0] + [dy for _, dy in BatchedMars.DIRECTIONS])
+        self.reset()
+
+    def get_num_worlds(self) -> int:
+        """Get the number of worlds K."""
+        return self.__num_worlds
+
+    def get_size(self) -> int:
+        """Get the width and height of every world."""
+        return self.__size
+
+    def get_num_rovers(self) -> int:
+        """Get the number of rovers per world."""
+        return self.__num_rovers
+
+    def get_grids(self) -> numpy.ndarray:
+        """Get the type codes of all worlds, K x H x W; a live view, not a copy."""
+        return self.__grids
+
+    def get_rover_locations(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Get the x and y coordinates of every rover, each K x R."""
+        return self.__rover_xs, self.__rover_ys
+
+    def get_alive(self) -> numpy.ndarray:
+        """Get whether each rover is still intact, K x R."""
+        return self.__alive
+
+    def get_delivered(self) -> numpy.ndarray:
+        """Get the rocks delivered in the current episode of every world."""
+        return self.__delivered
+
+    def get_steps(self) -> numpy.ndarray:
+        """Get the steps taken in the current episode of every world."""
+        return self.__steps
+
+    def reset(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Start a new episode in every world.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: The observation windows and vitals of every rover.
+        """
+        self.__reset_worlds(numpy.arange(self.__num_worlds))
+        return self.get_observations()
+
+    def step(self, actions) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Step every world once, resetting the worlds whose episode ends.
+
+        Args:
+            actions: The action of every rover, K x R integers in [0, 8]; ignored for destroyed rovers.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: The observation windows and
+            vitals of every rover, the reward of every rover, K x R, and whether each world's episode ended.
+
+        Raises:
+            ValueError: If the actions have the wrong shape or values.
+        """
+        actions = numpy.asarray(actions)
+        if actions.shape != self.__alive.shape:
+            raise ValueError(f"Expected actions of shape {self.__alive.shape}, got {actions.shape}")
+        if actions.size and (actions.min() < 0 or actions.max() > len(BatchedMars.DIRECTIONS)):
+            raise ValueError(f"Actions must be between 0 and {len(BatchedMars.DIRECTIONS)}")
+
+        size = self.__size
+        cells = self.__grids.reshape(self.__num_worlds, size * size)
+        worlds = numpy.arange(self.__num_worlds)[:, None]
+        self.__steps += 1
+
+        # Rovers: one move each towards an empty cell, or a rock if they have room for it
+        target_xs = (self.__rover_xs + self.__direction_xs[actions]) % size
+        target_ys = (self.__rover_ys + self.__direction_ys[actions]) % size
+        target_codes = cells[worlds, target_ys * size + target_xs]
+        rover_moves = ((actions != BatchedMars.STAY) & self.__alive & (self.__batteries >= BatchedMars.MOVE_COST)
+                       & ((target_codes == Mars.EMPTY_CODE) | ((target_codes == Rock.TYPE_CODE) & ~self.__carrying)))
+
+        # Aliens: hibernating ones restore energy, tired ones fall asleep, the others move
+        energy, hibernating = self.__energy, self.__hibernating
+        waking = hibernating.copy()
+        energy[waking] = numpy.minimum(energy[waking] + BatchedMars.RESTORE_RATE, 100)
+        hibernating[waking & (energy == 100)] = False
+        falling_asleep = ~waking & (energy <= BatchedMars.HIBERNATION_ENERGY)
+        hibernating[falling_asleep] = True
+        active = ~waking & ~falling_asleep
+        alien_xs, alien_ys = self.__alien_xs, self.__alien_ys
+
+        centre = size // 2
+        away_xs = self.__wrap(alien_xs - centre)
+        away_ys = self.__wrap(alien_ys - centre)
+        radius = BatchedMars.SENSING_RADIUS
+        fleeing = active & (numpy.abs(away_xs) <= radius) & (numpy.abs(away_ys) <= radius)
+
+        # The nearest live rover within sensing range of every alien, K x A x R
+        rover_dxs = self.__wrap(self.__rover_xs[:, None, :] - alien_xs[:, :, None])
+        rover_dys = self.__wrap(self.__rover_ys[:, None, :] - alien_ys[:, :, None])
+        distances = numpy.maximum(numpy.abs(rover_dxs), numpy.abs(rover_dys))
+        distances[~numpy.broadcast_to(self.__alive[:, None, :], distances.shape)] = size
+        chased = distances.argmin(axis=2) if self.__num_rovers else numpy.zeros_like(alien_xs)
+        chasing = active & ~fleeing & (numpy.take_along_axis(distances, chased[:, :, None], 2)[:, :, 0] <= radius
+                                       if self.__num_rovers else False)
+
+        step_xs = numpy.where(fleeing, numpy.sign(away_xs), 0)
+        step_ys = numpy.where(fleeing, numpy.sign(away_ys), 0)
+        if self.__num_rovers:
+            step_xs = numpy.where(chasing, numpy.sign(numpy.take_along_axis(rover_dxs, chased[:, :, None], 2)[:, :, 0]),
+                                  step_xs)
+            step_ys = numpy.where(chasing, numpy.sign(numpy.take_along_axis(rover_dys, chased[:, :, None], 2)[:, :, 0]),
+                                  step_ys)
+        alien_targets = ((alien_ys + step_ys) % size) * size + (alien_xs + step_xs) % size
+        steered_free = cells[worlds, alien_targets] == Mars.EMPTY_CODE
+
+        # Wanderers, and fleeing aliens whose way is blocked, pick a random free neighbour
+        neighbours = (((alien_ys[:, :, None] + self.__direction_ys[None, None, 1:]) % size) * size
+                      + (alien_xs[:, :, None] + self.__direction_xs[None, None, 1:]) % size)
+        free = cells[worlds[:, :, None], neighbours] == Mars.EMPTY_CODE
+        keys = numpy.where(free, self.__random.random(free.shape), -1.0)
+        random_targets = numpy.take_along_axis(neighbours, keys.argmax(axis=2)[:, :, None], 2)[:, :, 0]
+        wandering = active & ~chasing & ~(fleeing & steered_free)
+        alien_moves = (wandering & free.any(axis=2)) | ((chasing | fleeing) & steered_free)
+        alien_targets = numpy.where(wandering, random_targets, alien_targets)
+
+        # Every cell goes to a random one of the agents claiming it
+        rover_targets = target_ys * size + target_xs
+        claims = numpy.concatenate(((rover_targets + self.__world_bases)[rover_moves],
+                                    (alien_targets + self.__world_bases)[alien_moves]))
+        order = numpy.lexsort((self.__random.random(len(claims)), claims))
+        first = numpy.ones(len(claims), dtype=bool)
+        first[1:] = claims[order[1:]] != claims[order[:-1]]
+        granted = numpy.zeros(len(claims), dtype=bool)
+        granted[order[first]] = True
+        num_rover_claims = int(rover_moves.sum())
+        rover_moves[rover_moves] = granted[:num_rover_claims]
+        alien_moves[alien_moves] = granted[num_rover_claims:]
+
+        flat = self.__grids.reshape(-1)
+        rover_bases = numpy.broadcast_to(self.__world_bases, rover_moves.shape)[rover_moves]
+        alien_bases = numpy.broadcast_to(self.__world_bases, alien_moves.shape)[alien_moves]
+        # Targets were all empty or rocks, so clearing every source first cannot erase a mover
+        flat[rover_bases + self.__rover_ys[rover_moves] * size + self.__rover_xs[rover_moves]] = Mars.EMPTY_CODE
+        flat[alien_bases + alien_ys[alien_moves] * size + alien_xs[alien_moves]] = Mars.EMPTY_CODE
+        flat[rover_bases + rover_targets[rover_moves]] = Rover.TYPE_CODE
+        flat[alien_bases + alien_targets[alien_moves]] = Alien.TYPE_CODE
+
+        picked_up = rover_moves & (target_codes == Rock.TYPE_CODE)
+        self.__carrying |= picked_up
+        self.__rock_counts -= picked_up.sum(axis=1)
+        self.__batteries[rover_moves] -= BatchedMars.MOVE_COST
+        self.__rover_xs[rover_moves] = target_xs[rover_moves]
+        self.__rover_ys[rover_moves] = target_ys[rover_moves]
+        alien_xs[alien_moves] = alien_targets[alien_moves] % size
+        alien_ys[alien_moves] = alien_targets[alien_moves] // size
+        energy[alien_moves & chasing] -= BatchedMars.CHASE_COST
+
+        # Chasing aliens attack their rover if it is adjacent once everyone has moved
+        if self.__num_rovers:
+            chased_xs = numpy.take_along_axis(self.__rover_xs, chased, 1)
+            chased_ys = numpy.take_along_axis(self.__rover_ys, chased, 1)
+            attacking = chasing & (numpy.abs(self.__wrap(chased_xs - alien_xs)) <= 1) \
+                & (numpy.abs(self.__wrap(chased_ys - alien_ys)) <= 1) \
+                & numpy.take_along_axis(self.__alive, chased, 1)
+            energy[attacking] -= BatchedMars.ATTACK_COST
+            attacked_worlds, attacking_aliens = numpy.nonzero(attacking)
+            numpy.subtract.at(self.__shields, (attacked_worlds, chased[attacked_worlds, attacking_aliens]),
+                              BatchedMars.ATTACK_DAMAGE)
+            destroyed = self.__alive & (self.__shields <= 0)
+            self.__shields[destroyed] = 0
+            self.__alive[destroyed] = False
+            self.__carrying[destroyed] = False
+            flat[numpy.broadcast_to(self.__world_bases, destroyed.shape)[destroyed]
+                 + self.__rover_ys[destroyed] * size + self.__rover_xs[destroyed]] = Mars.EMPTY_CODE
+
+        # Rovers next to the spacecraft recharge and deliver their rock
+        docked = self.__alive & (numpy.abs(self.__rover_xs - centre) <= 1) & (numpy.abs(self.__rover_ys - centre) <= 1)
+        self.__batteries[docked] = 100.0
+        delivering = docked & self.__carrying
+        self.__carrying[delivering] = False
+        self.__delivered += delivering.sum(axis=1)
+        rewards = delivering.astype(numpy.float32)
+
+        dones = ~self.__alive.any(axis=1) | ((self.__rock_counts == 0) & ~self.__carrying.any(axis=1))
+        if self.__max_steps > 0:
+            dones |= self.__steps >= self.__max_steps
+        if dones.any():
+            self.__reset_worlds(numpy.flatnonzero(dones))
+        windows, vitals = self.get_observations()
+        return windows, vitals, rewards, dones
+
+    def get_observations(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Gather the observation of every rover into the preallocated buffers.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: The windows of type codes centred on every rover,
+            K x R x (2r + 1) x (2r + 1), and the battery, shield and carrying state of every rover, K x R x 3.
+        """
+        self.__observation_windows.gather_codes(self.__grids.reshape(-1), self.__rover_xs, self.__rover_ys,
+                                                self.__windows, self.__world_bases)
+        self.__vitals[:, :, 0] = self.__batteries / 100.0
+        self.__vitals[:, :, 1] = self.__shields / 100.0
+        self.__vitals[:, :, 2] = self.__carrying
+        return self.__windows, self.__vitals
+
+    def __reset_worlds(self, worlds: numpy.ndarray) -> None:
+        """
+        Generate new worlds in the given slots.
+
+        Rocks are scattered with the densities of a generated Mars world, the spacecraft lands in the centre
+        with the cells around it cleared, the rovers are placed on random cells next to it, and the aliens on
+        random empty cells.
+
+        Args:
+            worlds (numpy.ndarray): The indices of the worlds to reset.
+        """
+        size, count = self.__size, len(worlds)
+        draws = self.__random.random((count, size, size))
+        grids = numpy.where((draws >= Config.alien_creation_probability) & (draws < Config.rock_creation_probability),
+                            Rock.TYPE_CODE, Mars.EMPTY_CODE).astype(numpy.uint8)
+        centre = size // 2
+        grids[:, centre - 1:centre + 2, centre - 1:centre + 2] = Mars.EMPTY_CODE
+        grids[:, centre, centre] = Spacecraft.TYPE_CODE
+
+        sides = numpy.argsort(self.__random.random((count, len(BatchedMars.DIRECTIONS))), axis=1)
+        sides = sides[:, :self.__num_rovers] + 1
+        rover_xs = (centre + self.__direction_xs[sides]) % size
+        rover_ys = (centre + self.__direction_ys[sides]) % size
+        grids[numpy.arange(count)[:, None], rover_ys, rover_xs] = Rover.TYPE_CODE
+
+        cells = grids.reshape(count, size * size)
+        if self.__num_aliens:
+            keys = numpy.where(cells == Mars.EMPTY_CODE, self.__random.random(cells.shape), 2.0)
+            alien_cells = numpy.argpartition(keys, self.__num_aliens - 1, axis=1)[:, :self.__num_aliens]
+            cells[numpy.arange(count)[:, None], alien_cells] = Alien.TYPE_CODE
+            self.__alien_xs[worlds] = alien_cells % size
+            self.__alien_ys[worlds] = alien_cells // size
+
+        self.__grids[worlds] = grids
+        self.__rover_xs[worlds] = rover_xs
+        self.__rover_ys[worlds] = rover_ys
+        self.__batteries[worlds] = 100.0
+        self.__shields[worlds] = 100
+        self.__carrying[worlds] = False
+        self.__alive[worlds] = True
+        self.__energy[worlds] = 100
+        self.__hibernating[worlds] = False
+        self.__rock_counts[worlds] = (cells == Rock.TYPE_CODE).sum(axis=1)
+        self.__delivered[worlds] = 0
+        self.__steps[worlds] = 0
+
+    def __wrap(self, offsets: numpy.ndarray) -> numpy.ndarray:
+        """Wrap coordinate differences around the torus into [-size / 2, size / 2)."""
+        half = self.__size // 2
+        return (offsets + half) % self.__size - half
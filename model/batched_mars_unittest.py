@@ -0,0 +1,103 @@
+import unittest
+from model import batched_mars
+from model.alien import Alien
+from model.batched_mars import BatchedMars
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+
+numpy = batched_mars.numpy
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestBatchedMars(unittest.TestCase):
+
+    def setUp(self):
+        self.worlds = BatchedMars(6, size=12, num_rovers=4, num_aliens=5, max_steps=0, window_radius=2, seed=3)
+
+    def count(self, code):
+        return (self.worlds.get_grids() == code).sum(axis=(1, 2))
+
+    def random_actions(self, generator):
+        return generator.integers(0, len(BatchedMars.DIRECTIONS) + 1, size=(6, 4))
+
+    def test_reset_populates_every_world(self):
+        self.assertEqual(self.count(Spacecraft.TYPE_CODE).tolist(), [1] * 6)
+        self.assertEqual(self.count(Rover.TYPE_CODE).tolist(), [4] * 6)
+        self.assertEqual(self.count(Alien.TYPE_CODE).tolist(), [5] * 6)
+        self.assertTrue(self.count(Rock.TYPE_CODE).min() > 0)
+
+    def test_observations_are_contiguous_windows(self):
+        windows, vitals = self.worlds.get_observations()
+        self.assertEqual(windows.shape, (6, 4, 5, 5))
+        self.assertEqual(vitals.shape, (6, 4, 3))
+        self.assertTrue(windows.flags["C_CONTIGUOUS"] and vitals.flags["C_CONTIGUOUS"])
+        grids = self.worlds.get_grids()
+        xs, ys = self.worlds.get_rover_locations()
+        for world in range(6):
+            for rover in range(4):
+                x, y = xs[world, rover], ys[world, rover]
+                # Rolling the rover to the centre of the grid makes the window a plain slice
+                rolled = numpy.roll(grids[world], (6 - y, 6 - x), axis=(0, 1))
+                numpy.testing.assert_array_equal(windows[world, rover], rolled[4:9, 4:9])
+                self.assertEqual(windows[world, rover, 2, 2], Rover.TYPE_CODE)
+        numpy.testing.assert_array_equal(vitals[:, :, :2], 1.0)
+
+    def test_steps_keep_grid_and_tables_consistent(self):
+        generator = numpy.random.default_rng(0)
+        for _ in range(50):
+            self.worlds.step(self.random_actions(generator))
+            self.assertEqual(self.count(Spacecraft.TYPE_CODE).tolist(), [1] * 6)
+            self.assertEqual(self.count(Alien.TYPE_CODE).tolist(), [5] * 6)
+            alive = self.worlds.get_alive()
+            self.assertEqual(self.count(Rover.TYPE_CODE).tolist(), alive.sum(axis=1).tolist())
+            xs, ys = self.worlds.get_rover_locations()
+            world_indices = numpy.nonzero(alive)[0]
+            codes = self.worlds.get_grids()[world_indices, ys[alive], xs[alive]]
+            self.assertTrue((codes == Rover.TYPE_CODE).all())
+
+    def test_move_costs_battery_and_staying_is_free(self):
+        worlds = BatchedMars(1, size=12, num_rovers=1, num_aliens=0, max_steps=0, seed=4)
+        xs, ys = worlds.get_rover_locations()
+        direction = BatchedMars.DIRECTIONS.index((numpy.sign(xs[0, 0] - 6), numpy.sign(ys[0, 0] - 6)))
+        worlds.get_grids()[0][:] = numpy.where(worlds.get_grids()[0] == Rock.TYPE_CODE, 0, worlds.get_grids()[0])
+        _, vitals, _, _ = worlds.step([[direction + 1]])
+        self.assertAlmostEqual(float(vitals[0, 0, 0]), 0.95)
+        _, vitals, _, _ = worlds.step([[BatchedMars.STAY]])
+        self.assertAlmostEqual(float(vitals[0, 0, 0]), 0.95)
+
+    def test_delivery_at_the_spacecraft(self):
+        self.worlds._BatchedMars__carrying[2, 1] = True
+        _, _, rewards, _ = self.worlds.step(numpy.zeros((6, 4), dtype=int))
+        self.assertEqual(rewards[2, 1], 1.0)
+        self.assertEqual(rewards.sum(), 1.0)
+        self.assertEqual(self.worlds.get_delivered().tolist(), [0, 0, 1, 0, 0, 0])
+
+    def test_finished_worlds_reset(self):
+        worlds = BatchedMars(3, size=12, num_rovers=2, num_aliens=1, max_steps=3, seed=5)
+        for step in range(1, 4):
+            _, _, _, dones = worlds.step(numpy.zeros((3, 2), dtype=int))
+            self.assertEqual(dones.tolist(), [step == 3] * 3)
+        self.assertEqual(worlds.get_steps().tolist(), [0, 0, 0])
+
+    def test_same_seed_same_run(self):
+        runs = []
+        for _ in range(2):
+            worlds = BatchedMars(4, size=10, num_rovers=3, num_aliens=3, max_steps=20, seed=8)
+            generator = numpy.random.default_rng(1)
+            for _ in range(40):
+                worlds.step(generator.integers(0, 9, size=(4, 3)))
+            runs.append(worlds.get_grids().copy())
+        numpy.testing.assert_array_equal(runs[0], runs[1])
+
+    def test_invalid_actions(self):
+        with self.assertRaises(ValueError):
+            self.worlds.step(numpy.zeros((6, 3), dtype=int))
+        with self.assertRaises(ValueError):
+            self.worlds.step(numpy.full((6, 4), 9))
+        with self.assertRaises(ValueError):
+            BatchedMars(2, size=12, num_rovers=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Sequence, Set, TYPE_CHECKING
 
 from controller.config import Config
 
@@ -60,6 +60,47 @@ class Environment(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_type_codes(self) -> bytearray:
+        """
+        Retrieve the occupancy grid of the environment.
+
+        Returns:
+            bytearray: The TYPE_CODE of the agent in every cell, or 0 for empty cells, in row-major order.
+        """
+        pass
+
+    @abstractmethod
+    def get_type_counts(self) -> Sequence[int]:
+        """
+        Retrieve the number of cells holding each type code.
+
+        Returns:
+            Sequence[int]: The number of cells per type code, indexed by the code.
+        """
+        pass
+
+    @abstractmethod
+    def track_dirty_cells(self) -> Set[int]:
+        """
+        Start tracking the cells whose type code changes.
+
+        Returns:
+            Set[int]: A set that receives the row-major index of every changed cell. The caller clears it
+            after processing the changes.
+        """
+        pass
+
+    @abstractmethod
+    def untrack_dirty_cells(self, dirty_cells: Set[int]) -> None:
+        """
+        Stop tracking changes for a set returned by track_dirty_cells.
+
+        Args:
+            dirty_cells (Set[int]): The set to stop updating.
+        """
+        pass
+
     def get_height(self) -> int:
         """
         Get the height of the environment.
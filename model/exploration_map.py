@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from typing import List, Optional, TYPE_CHECKING
+from weakref import WeakSet
+
+from model.location import Location
+
+if TYPE_CHECKING:
+    from model.sector import Sector
+
+
+class ExplorationMap:
+    """
+    Fleet-wide fog-of-war map shared by all rovers.
+
+    Keeps one byte per cell for whether any rover has sensed the cell and one byte per cell for whether a
+    rock was seen there. Rovers write to it as they sense, and idle rovers use it to find the nearest
+    unexplored frontier instead of wandering randomly.
+
+    Attributes:
+        __width (int): The width of the map.
+        __height (int): The height of the map.
+        __explored (bytearray): 1 for every cell a rover has sensed, 0 otherwise.
+        __rock_sightings (bytearray): 1 for every cell where a rock was last seen, 0 otherwise.
+        __unexplored_count (int): The number of cells not yet sensed.
+        __unexplored_per_column (array): The number of cells not yet sensed in every column.
+        __sharers (Optional[WeakSet]): The live maps sharing this map's cell arrays, itself included.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Initialise the ExplorationMap object.
+
+        Args:
+            width (int): The width of the map.
+            height (int): The height of the map.
+        """
+        self.__width = width
+        self.__height = height
+        self.__explored = bytearray(width * height)
+        self.__rock_sightings = bytearray(width * height)
+        self.__unexplored_count = width * height
+        self.__unexplored_per_column = array("i", [height]) * width
+        self.__sharers: Optional[WeakSet] = None
+
+    def fork(self) -> ExplorationMap:
+        """
+        Create a copy-on-write copy of the map, e.g. for a forked world.
+
+        The copy shares the cell arrays with this map. A map that records an observation while another live
+        map still shares them copies them first, whole.
+
+        Returns:
+            ExplorationMap: The copy.
+        """
+        fork = ExplorationMap.__new__(ExplorationMap)
+        fork.__width = self.__width
+        fork.__height = self.__height
+        fork.__explored = self.__explored
+        fork.__rock_sightings = self.__rock_sightings
+        fork.__unexplored_count = self.__unexplored_count
+        fork.__unexplored_per_column = self.__unexplored_per_column
+        if self.__sharers is None:
+            self.__sharers = WeakSet((self,))
+        self.__sharers.add(fork)
+        fork.__sharers = self.__sharers
+        return fork
+
+    def __getstate__(self) -> dict:
+        """Pickle the cell arrays but not the maps sharing them; an unpickled map owns its arrays."""
+        state = dict(self.__dict__)
+        state["_ExplorationMap__sharers"] = None
+        return state
+
+    def __unshare(self) -> None:
+        """Stop sharing the cell arrays before an observation, copying them if another live map still reads them."""
+        sharers, self.__sharers = self.__sharers, None
+        sharers.discard(self)
+        if sharers:
+            self.__explored = bytearray(self.__explored)
+            self.__rock_sightings = bytearray(self.__rock_sightings)
+            self.__unexplored_per_column = array("i", self.__unexplored_per_column)
+
+    def clear(self) -> None:
+        """Forget everything that has been explored."""
+        if self.__sharers is not None:
+            self.__sharers.discard(self)
+            self.__sharers = None
+        self.__explored = bytearray(self.__width * self.__height)
+        self.__rock_sightings = bytearray(self.__width * self.__height)
+        self.__unexplored_count = self.__width * self.__height
+        self.__unexplored_per_column = array("i", [self.__height]) * self.__width
+
+    def observe(self, x: int, y: int, has_rock: bool) -> None:
+        """
+        Record that a cell has been sensed and whether a rock was seen there.
+
+        Args:
+            x (int): The x-coordinate of the cell, wrapped onto the map.
+            y (int): The y-coordinate of the cell, wrapped onto the map.
+            has_rock (bool): Whether a rock was seen in the cell.
+        """
+        if self.__sharers is not None:
+            self.__unshare()
+        x %= self.__width
+        index = (y % self.__height) * self.__width + x
+        if not self.__explored[index]:
+            self.__explored[index] = 1
+            self.__unexplored_count -= 1
+            self.__unexplored_per_column[x] -= 1
+        self.__rock_sightings[index] = 1 if has_rock else 0
+
+    def observe_window(self, location: Location, radius: int, window: bytes, rock_code: int) -> None:
+        """
+        Record a whole sensor window at once, as extracted by Mars.get_window.
+
+        Rows are written with slice assignments; only cells sensed for the first time are visited one by
+        one, so the cost of a repeated observation grows with the window height rather than its area.
+
+        Args:
+            location (Location): The centre of the window.
+            radius (int): The radius the window was extracted with.
+            window (bytes): The type codes of the window in row-major order.
+            rock_code (int): The type code marking rocks.
+        """
+        if self.__sharers is not None:
+            self.__unshare()
+        width, height = self.__width, self.__height
+        explored, sightings = self.__explored, self.__rock_sightings
+        size = 2 * radius + 1
+        rock_table = self.__match_table(rock_code)
+        x_start = (location.get_x() - radius) % width
+        for row in range(size):
+            row_codes = window[row * size:(row + 1) * size]
+            row_start = ((location.get_y() - radius + row) % height) * width
+            if x_start + size <= width:
+                segments = ((x_start, row_codes),)
+            else:
+                split = width - x_start
+                segments = ((x_start, row_codes[:split]), (0, row_codes[split:]))
+            for segment_x, segment_codes in segments:
+                start = row_start + segment_x
+                end = start + len(segment_codes)
+                unexplored = explored.find(0, start, end)
+                while unexplored != -1:
+                    explored[unexplored] = 1
+                    self.__unexplored_count -= 1
+                    self.__unexplored_per_column[unexplored - row_start] -= 1
+                    unexplored = explored.find(0, unexplored + 1, end)
+                sightings[start:end] = segment_codes.translate(rock_table)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        """Return True if the cell has been sensed by any rover."""
+        return self.__explored[(y % self.__height) * self.__width + (x % self.__width)] == 1
+
+    def has_rock_sighting(self, x: int, y: int) -> bool:
+        """Return True if a rock was last seen in the cell."""
+        return self.__rock_sightings[(y % self.__height) * self.__width + (x % self.__width)] == 1
+
+    def get_unexplored_count(self) -> int:
+        """Return the number of cells that have not been sensed yet."""
+        return self.__unexplored_count
+
+    def get_rock_sighting_count(self) -> int:
+        """Return the number of cells where a rock is currently believed to be."""
+        return self.__rock_sightings.count(1)
+
+    def get_unexplored_count_in(self, sector: Sector) -> int:
+        """Return the number of cells in a sector that have not been sensed yet."""
+        return sum(self.__unexplored_per_column[sector.get_x_start():sector.get_x_end()])
+
+    def get_column_weights(self, expected_rock_density: float) -> List[float]:
+        """
+        Estimate how many rocks every column holds, from sightings and from the cells not yet explored.
+
+        Args:
+            expected_rock_density (float): The expected fraction of unexplored cells holding a rock.
+
+        Returns:
+            List[float]: The estimated number of rocks in every column.
+        """
+        width = self.__width
+        return [self.__rock_sightings[x::width].count(1) + unexplored * expected_rock_density
+                for x, unexplored in enumerate(self.__unexplored_per_column)]
+
+    def nearest_frontier(self, location: Location, sector: Optional[Sector] = None) -> Optional[Location]:
+        """
+        Find the nearest unexplored cell, searching rings of growing radius around a location.
+
+        The cost grows with the square of the distance to the frontier rather than with the map area.
+
+        Args:
+            location (Location): The location to search from.
+            sector (Sector): If given, prefer unexplored cells inside this sector while it has any left.
+
+        Returns:
+            Optional[Location]: The nearest unexplored cell, or None if the whole map has been explored.
+        """
+        if self.__unexplored_count == 0:
+            return None
+        if sector is not None and self.get_unexplored_count_in(sector) == 0:
+            sector = None
+        width, height, explored = self.__width, self.__height, self.__explored
+        origin_x, origin_y = location.get_x(), location.get_y()
+        max_radius = max(width, height) // 2 + 1
+        for radius in range(0, max_radius + 1):
+            for dx, dy in self.__ring(radius):
+                x = (origin_x + dx) % width
+                y = (origin_y + dy) % height
+                if not explored[y * width + x] and (sector is None or sector.contains(x)):
+                    return Location(x, y)
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __match_table(type_code: int) -> bytes:
+        """
+        Build a bytes.translate table mapping one type code to 1 and every other code to 0.
+
+        Args:
+            type_code (int): The type code to match.
+        """
+        return bytes(1 if code == type_code else 0 for code in range(256))
+
+    @staticmethod
+    def __ring(radius: int):
+        """
+        Yield the offsets on the square ring at a Chebyshev distance from the origin.
+
+        Args:
+            radius (int): The distance of the ring from the origin.
+        """
+        if radius == 0:
+            yield 0, 0
+            return
+        for d in range(-radius, radius + 1):
+            yield d, -radius
+            yield d, radius
+        for d in range(-radius + 1, radius):
+            yield -radius, d
+            yield radius, d
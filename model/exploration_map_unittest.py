@@ -0,0 +1,65 @@
+import unittest
+from model.exploration_map import ExplorationMap
+from model.location import Location
+
+
+class TestExplorationMap(unittest.TestCase):
+
+    def setUp(self):
+        self.exploration_map = ExplorationMap(10, 10)
+
+    def test_observe_marks_explored(self):
+        self.exploration_map.observe(2, 3, False)
+        self.assertTrue(self.exploration_map.is_explored(2, 3))
+        self.assertFalse(self.exploration_map.is_explored(3, 2))
+        self.assertEqual(self.exploration_map.get_unexplored_count(), 99)
+
+    def test_observe_wraps_coordinates(self):
+        self.exploration_map.observe(-1, 10, False)
+        self.assertTrue(self.exploration_map.is_explored(9, 0))
+
+    def test_rock_sightings(self):
+        self.exploration_map.observe(1, 1, True)
+        self.assertTrue(self.exploration_map.has_rock_sighting(1, 1))
+        self.exploration_map.observe(1, 1, False)
+        self.assertFalse(self.exploration_map.has_rock_sighting(1, 1))
+        self.assertEqual(self.exploration_map.get_unexplored_count(), 99)
+
+    def test_fork_copies_on_first_observation(self):
+        self.exploration_map.observe(1, 1, True)
+        fork = self.exploration_map.fork()
+        fork.observe_window(Location(5, 5), 1, bytes(9), 4)
+        self.exploration_map.observe(1, 1, False)
+        self.assertTrue(fork.has_rock_sighting(1, 1))
+        self.assertFalse(self.exploration_map.has_rock_sighting(1, 1))
+        self.assertTrue(fork.is_explored(5, 5))
+        self.assertFalse(self.exploration_map.is_explored(5, 5))
+        self.assertEqual((fork.get_unexplored_count(), self.exploration_map.get_unexplored_count()), (90, 99))
+
+    def test_nearest_frontier_is_own_cell_when_unexplored(self):
+        self.assertEqual(self.exploration_map.nearest_frontier(Location(4, 4)), Location(4, 4))
+
+    def test_nearest_frontier_skips_explored_ring(self):
+        for x in range(3, 6):
+            for y in range(3, 6):
+                self.exploration_map.observe(x, y, False)
+        frontier = self.exploration_map.nearest_frontier(Location(4, 4))
+        self.assertFalse(self.exploration_map.is_explored(frontier.get_x(), frontier.get_y()))
+        self.assertEqual(max(abs(frontier.get_x() - 4), abs(frontier.get_y() - 4)), 2)
+
+    def test_nearest_frontier_wraps(self):
+        for x in range(10):
+            for y in range(10):
+                if (x, y) != (9, 0):
+                    self.exploration_map.observe(x, y, False)
+        self.assertEqual(self.exploration_map.nearest_frontier(Location(0, 9)), Location(9, 0))
+
+    def test_nearest_frontier_none_when_explored(self):
+        for x in range(10):
+            for y in range(10):
+                self.exploration_map.observe(x, y, False)
+        self.assertIsNone(self.exploration_map.nearest_frontier(Location(0, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
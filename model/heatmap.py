@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Dict, Optional, Union
+
+from view.image_writer import ImageWriter
+
+
+class Heatmap:
+    """
+    Per-cell activity counters accumulated over a whole run.
+
+    Every layer is one flat array in row-major order, allocated once and updated in place, so recording an
+    event costs one index computation and one addition. Layers can be saved as NumPy .npy files, readable
+    with numpy.load, or as greyscale PNG images. A layer can also be kept in a block shared with other
+    processes, which then record into it in place.
+
+    Attributes:
+        __width (int): The width of the map.
+        __height (int): The height of the map.
+        __layers (Dict[str, Union[array, memoryview]]): The counters of every layer, views for shared layers.
+        __rock_since (array): The step since which the rock in every cell has been waiting.
+        __step (int): The current simulation step.
+    """
+    ROVER_VISITS = "rover_visits"
+    ALIEN_VISITS = "alien_visits"
+    BATTERY_SPENT = "battery_spent"
+    ATTACKS = "attacks"
+    ROCK_DWELL = "rock_dwell"
+    LAYERS = (ROVER_VISITS, ALIEN_VISITS, BATTERY_SPENT, ATTACKS, ROCK_DWELL)
+    TYPECODES = {ROVER_VISITS: "I", ALIEN_VISITS: "I", BATTERY_SPENT: "d", ATTACKS: "I", ROCK_DWELL: "q"}
+    NPY_KINDS = {"I": "u", "q": "i", "d": "f"}
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Initialise the Heatmap object.
+
+        Args:
+            width (int): The width of the map.
+            height (int): The height of the map.
+        """
+        self.__width = width
+        self.__height = height
+        self.__layers: Dict[str, Union[array, memoryview]] = {}
+        self.__rock_since = array("q")
+        self.__step = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Reset every counter to zero, in place for shared layers."""
+        size = self.__width * self.__height
+        for name, typecode in Heatmap.TYPECODES.items():
+            layer = self.__layers.get(name)
+            if isinstance(layer, memoryview):
+                layer[:] = array(typecode, [0]) * size
+            else:
+                self.__layers[name] = array(typecode, [0]) * size
+        self.__rock_since = array("q", [0]) * size
+        self.__step = 0
+
+    def __getstate__(self) -> dict:
+        """Pickle the heatmap, copying shared layers into arrays of its own."""
+        state = dict(self.__dict__)
+        state["_Heatmap__layers"] = {name: Heatmap.__copy(name, layer) for name, layer in self.__layers.items()}
+        return state
+
+    def share_layer(self, name: str, buffer: Optional[memoryview]) -> None:
+        """
+        Keep a layer in a block shared with other processes, or back in an array of its own.
+
+        The counters recorded so far are copied in once; from then on the other processes record into the
+        block in place.
+
+        Args:
+            name (str): One of LAYERS.
+            buffer (Optional[memoryview]): Room for width * height counters of the layer, or None to copy the
+                layer out of the block it is kept in, e.g. before the block is closed.
+        """
+        layer = self.__layers[name]
+        if isinstance(layer, memoryview):
+            self.__layers[name] = Heatmap.__copy(name, layer)
+            layer.release()
+        if buffer is not None:
+            layer = self.__layers[name]
+            shared = buffer[:len(layer) * layer.itemsize].cast(layer.typecode)
+            shared[:] = layer
+            self.__layers[name] = shared
+
+    @staticmethod
+    def __copy(name: str, layer: Union[array, memoryview]) -> array:
+        """Copy a shared layer into an array; arrays are returned as they are."""
+        if not isinstance(layer, memoryview):
+            return layer
+        copy = array(Heatmap.TYPECODES[name])
+        copy.frombytes(layer.tobytes())
+        return copy
+
+    def tick(self, step: int) -> None:
+        """
+        Advance to a new simulation step.
+
+        Args:
+            step (int): The current simulation step.
+        """
+        self.__step = step
+
+    def record_rover_move(self, x: int, y: int, battery_spent: float) -> None:
+        """Count a rover entering a cell and the battery it spent doing so."""
+        index = (y % self.__height) * self.__width + (x % self.__width)
+        self.__layers[Heatmap.ROVER_VISITS][index] += 1
+        self.__layers[Heatmap.BATTERY_SPENT][index] += battery_spent
+
+    def record_alien_move(self, x: int, y: int) -> None:
+        """Count an alien entering a cell."""
+        self.__layers[Heatmap.ALIEN_VISITS][(y % self.__height) * self.__width + (x % self.__width)] += 1
+
+    def record_attack(self, x: int, y: int) -> None:
+        """Count an alien attack on a rover in a cell."""
+        self.__layers[Heatmap.ATTACKS][(y % self.__height) * self.__width + (x % self.__width)] += 1
+
+    def record_rock_pickup(self, x: int, y: int) -> None:
+        """Add the number of steps the rock in a cell waited before a rover picked it up."""
+        index = (y % self.__height) * self.__width + (x % self.__width)
+        self.__layers[Heatmap.ROCK_DWELL][index] += self.__step - self.__rock_since[index]
+        self.__rock_since[index] = self.__step
+
+    def get_layer(self, name: str) -> Union[array, memoryview]:
+        """
+        Get the counters of a layer.
+
+        The array, or the view of a shared layer, is not copied, so callers must treat it as read-only.
+
+        Args:
+            name (str): One of LAYERS.
+        """
+        return self.__layers[name]
+
+    def save_npy(self, path: str, name: str) -> None:
+        """
+        Save a layer as a NumPy .npy file of shape (height, width), without needing NumPy.
+
+        Args:
+            path (str): The file to write.
+            name (str): One of LAYERS.
+        """
+        layer = self.__layers[name]
+        byte_order = "<" if sys.byteorder == "little" else ">"
+        descr = byte_order + Heatmap.NPY_KINDS[Heatmap.TYPECODES[name]] + str(layer.itemsize)
+        header = repr({"descr": descr, "fortran_order": False, "shape": (self.__height, self.__width)})
+        # Version 1.0 headers are padded with spaces so the data starts on a 64-byte boundary
+        header_length = len(header) + 1
+        header += " " * (-(10 + header_length) % 64) + "\n"
+        with open(path, "wb") as file:
+            file.write(b"\x93NUMPY\x01\x00")
+            file.write(len(header).to_bytes(2, "little"))
+            file.write(header.encode("latin1"))
+            file.write(layer.tobytes())
+
+    def save_png(self, path: str, name: str, scale: int = 1) -> None:
+        """
+        Save a layer as a greyscale PNG image, scaled so the highest counter is white.
+
+        Args:
+            path (str): The file to write.
+            name (str): One of LAYERS.
+            scale (int): The size of one cell in pixels.
+        """
+        layer = self.__layers[name]
+        peak = max(layer) or 1
+        width = self.__width * scale
+        rows = []
+        for y in range(self.__height):
+            row = bytes(int(value * 255 / peak) for value in layer[y * self.__width:(y + 1) * self.__width])
+            wide = bytearray(width)
+            for offset in range(scale):
+                wide[offset::scale] = row
+            rows.append(bytes(wide) * scale)
+        ImageWriter.write_png(path, width, self.__height * scale, b"".join(rows), channels=1)
+
+
+class DiscardingHeatmap(Heatmap):
+    """A heatmap that records nothing, e.g. for forked worlds whose activity is hypothetical."""
+
+    def __init__(self) -> None:
+        """Initialise the DiscardingHeatmap object, without any cells."""
+        super().__init__(0, 0)
+
+    def record_rover_move(self, x: int, y: int, battery_spent: float) -> None:
+        """Ignore a rover entering a cell."""
+
+    def record_alien_move(self, x: int, y: int) -> None:
+        """Ignore an alien entering a cell."""
+
+    def record_attack(self, x: int, y: int) -> None:
+        """Ignore an attack."""
+
+    def record_rock_pickup(self, x: int, y: int) -> None:
+        """Ignore a rock pickup."""
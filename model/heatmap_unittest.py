@@ -0,0 +1,80 @@
+import ast
+import os
+import struct
+import tempfile
+import unittest
+from model.heatmap import Heatmap
+
+
+class TestHeatmap(unittest.TestCase):
+
+    def setUp(self):
+        self.heatmap = Heatmap(4, 3)
+
+    def test_rover_move(self):
+        self.heatmap.record_rover_move(1, 2, 5.0)
+        self.heatmap.record_rover_move(5, 2, 5.0)
+        self.assertEqual(self.heatmap.get_layer(Heatmap.ROVER_VISITS)[9], 2)
+        self.assertEqual(self.heatmap.get_layer(Heatmap.BATTERY_SPENT)[9], 10.0)
+
+    def test_alien_move_and_attack(self):
+        self.heatmap.record_alien_move(0, 0)
+        self.heatmap.record_attack(3, 1)
+        self.assertEqual(self.heatmap.get_layer(Heatmap.ALIEN_VISITS)[0], 1)
+        self.assertEqual(self.heatmap.get_layer(Heatmap.ATTACKS)[7], 1)
+
+    def test_rock_dwell(self):
+        self.heatmap.tick(7)
+        self.heatmap.record_rock_pickup(2, 0)
+        self.heatmap.tick(10)
+        self.heatmap.record_rock_pickup(2, 0)
+        self.assertEqual(self.heatmap.get_layer(Heatmap.ROCK_DWELL)[2], 10)
+
+    def test_clear(self):
+        self.heatmap.record_attack(0, 0)
+        self.heatmap.clear()
+        self.assertEqual(sum(self.heatmap.get_layer(Heatmap.ATTACKS)), 0)
+
+    def test_shared_layer(self):
+        self.heatmap.record_alien_move(1, 0)
+        block = bytearray(12 * 4)
+        self.heatmap.share_layer(Heatmap.ALIEN_VISITS, memoryview(block))
+        memoryview(block).cast("I")[2] = 5  # Recorded by another process
+        self.heatmap.record_alien_move(1, 0)
+        self.assertEqual(memoryview(block).cast("I")[1], 2)
+        self.heatmap.clear()
+        self.assertEqual(sum(memoryview(block).cast("I")), 0)
+        self.heatmap.record_alien_move(2, 0)
+        self.heatmap.share_layer(Heatmap.ALIEN_VISITS, None)
+        block[:] = bytes(len(block))
+        self.assertEqual(self.heatmap.get_layer(Heatmap.ALIEN_VISITS)[2], 1)
+
+    def test_save_npy(self):
+        self.heatmap.record_rover_move(1, 2, 2.5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "battery.npy")
+            self.heatmap.save_npy(path, Heatmap.BATTERY_SPENT)
+            with open(path, "rb") as file:
+                data = file.read()
+        self.assertEqual(data[:8], b"\x93NUMPY\x01\x00")
+        header_length = int.from_bytes(data[8:10], "little")
+        self.assertEqual((10 + header_length) % 64, 0)
+        header = ast.literal_eval(data[10:10 + header_length].decode("latin1"))
+        self.assertEqual(header["shape"], (3, 4))
+        self.assertEqual(header["descr"][1:], "f8")
+        values = struct.unpack(header["descr"][0] + "12d", data[10 + header_length:])
+        self.assertEqual(values[9], 2.5)
+
+    def test_save_png(self):
+        self.heatmap.record_attack(0, 0)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "attacks.png")
+            self.heatmap.save_png(path, Heatmap.ATTACKS, scale=2)
+            with open(path, "rb") as file:
+                data = file.read()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        self.assertEqual(struct.unpack(">IIBB", data[16:26]), (8, 6, 8, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from model.agent import Agent
+    from model.location import Location
+
+
+class Intent:
+    """
+    An effect an agent wants to have on the world or on another agent.
+
+    Agents decide what to do by reading the environment and submit every effect on shared state as an
+    intent to Mars.submit. In sequential mode Mars hands it straight back to the agent's apply_intent, so
+    each agent sees the effects of the agents that acted before it. In synchronous mode Mars only collects
+    the intents, every agent decides against the same unchanged world, and an IntentResolver commits them
+    all at the end of the step.
+
+    Moves either name their destination or leave it to be drawn from a list of options when the intent is
+    applied, so random picks are made in the order intents are committed rather than decided.
+
+    Attributes:
+        __agent (Agent): The agent that wants the effect.
+        __kind (str): What the agent wants to do, one of the kinds below.
+        __location (Optional[Location]): The cell the intent is about, e.g. the destination of a move.
+        __options (Optional[Sequence[Location]]): The destinations to pick from if no location is given.
+        __other (Any): The other party, e.g. the rover attacked, or the sensor window observed.
+    """
+    __slots__ = ("__agent", "__kind", "__location", "__options", "__other")
+
+    OBSERVE = "observe"  # Record a sensor window in the exploration map
+    ASSIGN_SECTORS = "assign_sectors"  # Rebalance the home sectors of the fleet
+    MOVE = "move"
+    CHASE = "chase"  # Move towards a rover, costing an alien energy
+    PICK_UP = "pick_up"  # Move onto a rock and pick it up
+    CREATE_ROVER = "create_rover"  # Place a new rover
+    ATTACK = "attack"
+    RECHARGE = "recharge"  # Recharge fully at the spacecraft
+    SHARE_BATTERY = "share_battery"  # Ask another rover to share its battery
+    TAKE_ROCK = "take_rock"  # Take the rock of another rover
+    DOCK = "dock"  # Collect the rock of an adjacent rover at the spacecraft
+
+    # Kinds that claim a cell; only one claim per cell is committed in a synchronous step
+    MOVEMENTS = (MOVE, CHASE, PICK_UP, CREATE_ROVER)
+    # The order in which the kinds are committed in a synchronous step
+    PHASES = ((OBSERVE,), (ASSIGN_SECTORS,), MOVEMENTS, (ATTACK,), (RECHARGE, SHARE_BATTERY, TAKE_ROCK), (DOCK,))
+
+    def __init__(self, agent: Agent, kind: str, location: Optional[Location] = None,
+                 options: Optional[Sequence[Location]] = None, other: Any = None) -> None:
+        """
+        Initialise the Intent object.
+
+        Args:
+            agent (Agent): The agent that wants the effect.
+            kind (str): What the agent wants to do.
+            location (Optional[Location]): The cell the intent is about.
+            options (Optional[Sequence[Location]]): The destinations to pick from if no location is given.
+            other (Any): The other party of the intent.
+        """
+        self.__agent = agent
+        self.__kind = kind
+        self.__location = location
+        self.__options = options
+        self.__other = other
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the intent.
+
+        Returns:
+            str: The string representation of the intent.
+        """
+        return f"Intent({self.__kind}, {self.__agent!r}, {self.__location!r})"
+
+    def get_agent(self) -> Agent:
+        """Get the agent that wants the effect."""
+        return self.__agent
+
+    def get_kind(self) -> str:
+        """Get what the agent wants to do."""
+        return self.__kind
+
+    def get_location(self) -> Optional[Location]:
+        """Get the cell the intent is about, None while a destination is still to be picked."""
+        return self.__location
+
+    def set_location(self, location: Location) -> None:
+        """Set the cell the intent is about, e.g. the destination picked from the options."""
+        self.__location = location
+
+    def get_options(self) -> Optional[Sequence[Location]]:
+        """Get the destinations to pick from if no location is given."""
+        return self.__options
+
+    def get_other(self) -> Any:
+        """Get the other party of the intent."""
+        return self.__other
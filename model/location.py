@@ -1,5 +1,6 @@
 class Location:
     """Represents a location with integer x and y coordinates."""
+    __slots__ = ("__x", "__y")
 
     def __init__(self, x: int, y: int) -> None:
         """
@@ -19,6 +20,10 @@ class Location:
         return self.__x == other.get_x() and self.__y == other.get_y()
         # return self.__x == other.get_x() and self.__y == other.get_y()
 
+    def __hash__(self) -> int:
+        """Return a hash based on the coordinates, consistent with __eq__."""
+        return hash((self.__x, self.__y))
+
     def __repr__(self) -> str:
         """Return a string representation of the location."""
         return f"Location({self.__x}, {self.__y})"
@@ -1,18 +1,42 @@
 from __future__ import annotations
 
-from typing import List, Optional, TYPE_CHECKING
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+from weakref import WeakSet
 
 from controller.config import Config
 from model.environment import Environment
+from model.exploration_map import ExplorationMap
+from model.heatmap import DiscardingHeatmap, Heatmap
 from model.location import Location
+from model.observation_windows import ObservationWindows
+from model.random_pool import RandomPool
+from model.rock import Rock
 
 if TYPE_CHECKING:
     from model.agent import Agent
+    from model.intent import Intent
     from model.rover import Rover
 
 
 class Mars(Environment):
-    """Represents an environment modeled after Mars."""
+    """
+    Represents an environment modeled after Mars.
+
+    Mars keeps an occupancy grid with one byte per cell holding the TYPE_CODE of the agent in the cell, or
+    EMPTY_CODE. Sensors read windows of that grid instead of querying cells one by one, and the number of
+    cells holding each code is kept up to date as agents are placed.
+
+    Agents submit their effects on shared state as intents. Outside a synchronous step they are applied
+    right away; between begin_intents and end_intents they are only collected, so every agent decides
+    against the same world.
+
+    Rocks are terrain: they exist only as ROCK codes in the occupancy grid, and a Rock object is created
+    on demand when a caller asks for the agent in a rock cell. Only the other agents are kept as objects,
+    in a dictionary keyed by cell index, so memory grows with the number of active agents rather than with
+    the map area.
+    """
+    EMPTY_CODE = 0
 
     def __init__(self):
         """
@@ -21,14 +45,157 @@ class Mars(Environment):
         Initialises a grid with dimensions based on the world size specified in the Config module.
         """
         super().__init__()
-        self.__grid: List[List[Optional[Agent, None]]] = [
-            [None for _ in range(self.get_width())] for _ in range(self.get_height())
-        ]
+        self.__grid: Dict[int, Agent] = {}
+        self.__type_codes: Union[bytearray, memoryview] = bytearray(self.get_width() * self.get_height())
+        self.__type_code_buffer: Optional[memoryview] = None  # The shared block the grid lives in, if any
+        self.__type_counts = array("l", [0]) * 256
+        self.__type_counts[Mars.EMPTY_CODE] = len(self.__type_codes)
+        self.__dirty_cell_sets: List[Set[int]] = []
         self.rovers: List[Rover] = []  # Initialize the list to store all rovers
+        self.__exploration_map = ExplorationMap(self.get_width(), self.get_height())
+        self.__heatmap = Heatmap(self.get_width(), self.get_height())
+        self.__random_pool = RandomPool(Config.random_seed)
+        self.__pending_intents: Optional[List[Intent]] = None
+        self.__observation_windows: Optional[ObservationWindows] = None
+        self.__sharers: Optional[WeakSet] = None  # The live worlds sharing this world's grid, itself included
+        self.__owned: Dict[int, Agent] = {}  # The agents a fork has copied, keyed by id of the original
+
+    def fork(self, seed: Optional[int] = None) -> Mars:
+        """
+        Creates a copy-on-write copy of the world, e.g. for a lookahead rollout.
+
+        The fork shares the occupancy grid, the agents and the exploration map with this world. A world that
+        changes the grid or the exploration map while another live world still shares them copies them first,
+        whole, so every fork that writes costs one copy of the grid, O(width * height), and so does the next
+        write of this world if a fork is still alive by then. Once the forks are discarded, this world owns
+        its grid alone again and writes without copying. The fork copies an agent only when own is called for
+        it, so a rollout that moves a few agents copies just those. Agents that are not owned must not be
+        changed through the fork.
+
+        The fork has its own random pool, records no heatmap and tracks no dirty cells. The fork of a world whose
+        grid lives in a shared block gets a copy of the grid right away, since other processes change the block.
+
+        Args:
+            seed (Optional[int]): The seed of the fork's random pool, drawn from this world's pool if not given.
+
+        Returns:
+            Mars: The fork.
+        """
+        fork = Mars.__new__(Mars)
+        Environment.__init__(fork)
+        if self.__sharers is None:
+            self.__sharers = WeakSet((self,))
+        self.__sharers.add(fork)
+        fork.__sharers = self.__sharers
+        fork.__grid = self.__grid
+        fork.__type_codes = self.__type_codes if self.__type_code_buffer is None else bytearray(self.__type_codes)
+        fork.__type_code_buffer = None
+        fork.__type_counts = array("l", self.__type_counts)
+        fork.__dirty_cell_sets = []
+        fork.rovers = list(self.rovers)
+        fork.__exploration_map = self.__exploration_map.fork()
+        fork.__heatmap = DiscardingHeatmap()
+        fork.__random_pool = RandomPool(self.__random_pool.next_value() if seed is None else seed)
+        fork.__pending_intents = None
+        fork.__observation_windows = None
+        fork.__owned = {}
+        return fork
+
+    def own(self, agent: Agent) -> Agent:
+        """
+        Replaces an agent of a fork with a copy of its own, which the fork may then change.
+
+        Args:
+            agent (Agent): The agent, as shared with the world the fork was made from, or already owned.
+
+        Returns:
+            Agent: The fork's copy of the agent, placed in the grid and the fleet instead of the original.
+        """
+        owned = self.__owned.get(id(agent))
+        if owned is not None:
+            return owned
+        owned = agent.clone()
+        self.__owned[id(agent)] = owned
+        self.__owned[id(owned)] = owned
+        location = agent.get_location()
+        index = (location.get_y() % Config.world_size) * Config.world_size + location.get_x() % Config.world_size
+        if self.__grid.get(index) is agent:
+            self.__unshare()
+            self.__grid[index] = owned
+        for position, rover in enumerate(self.rovers):
+            if rover is agent:
+                self.rovers[position] = owned
+        return owned
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the world, e.g. to play it out in another process.
+
+        The unpickled world owns its grid; it shares it with no other world or process and tracks no dirty
+        cells.
+
+        Returns:
+            dict: The state of the world.
+        """
+        state = dict(self.__dict__)
+        state["_Mars__sharers"] = None
+        state["_Mars__dirty_cell_sets"] = []
+        state["_Mars__observation_windows"] = None
+        if self.__type_code_buffer is not None:
+            state["_Mars__type_codes"] = bytearray(self.__type_codes)
+            state["_Mars__type_code_buffer"] = None
+        return state
+
+    def __unshare(self) -> None:
+        """Stop sharing the grid before changing it, copying it if another live world still reads it."""
+        sharers, self.__sharers = self.__sharers, None
+        if sharers is None:
+            return
+        sharers.discard(self)
+        if sharers:
+            self.__grid = dict(self.__grid)
+            if self.__type_code_buffer is None:
+                self.__type_codes = bytearray(self.__type_codes)
+
+    def share_type_codes(self, buffer: Optional[memoryview]) -> None:
+        """
+        Keep the occupancy grid in a block shared with other processes, or back in a bytearray of its own.
+
+        The grid is copied in once; from then on the other processes read and change it in place. Cells they
+        change are reported with mark_changed. A grid changed elsewhere must keep the type counts intact, e.g.
+        by moving agents only, since the counts are only maintained for changes made through this world.
+
+        Args:
+            buffer (Optional[memoryview]): At least width * height bytes to keep the grid in, or None to copy
+                the grid out of the block it is kept in, e.g. before the block is closed.
+        """
+        if self.__sharers is not None:
+            self.__unshare()
+        if self.__type_code_buffer is not None:
+            self.__type_codes = bytearray(self.__type_code_buffer)
+            self.__type_code_buffer.release()
+            self.__type_code_buffer = None
+        if buffer is not None:
+            shared = buffer[:len(self.__type_codes)]
+            shared[:] = self.__type_codes
+            self.__type_codes = self.__type_code_buffer = shared
 
     def clear(self) -> None:
         """Clears all agents from the grid."""
-        self.__grid = [[None for _ in range(Config.world_size)] for _ in range(Config.world_size)]
+        if self.__sharers is not None:
+            self.__sharers.discard(self)
+            self.__sharers = None
+        self.__grid = {}
+        if self.__type_code_buffer is not None:
+            self.__type_codes[:] = bytes(len(self.__type_codes))
+        else:
+            self.__type_codes = bytearray(Config.world_size * Config.world_size)
+        self.__type_counts = array("l", [0]) * 256
+        self.__type_counts[Mars.EMPTY_CODE] = len(self.__type_codes)
+        for dirty_cells in self.__dirty_cell_sets:
+            dirty_cells.update(range(len(self.__type_codes)))
+        self.__exploration_map.clear()
+        self.__heatmap.clear()
 
     def get_agent(self, location: Location) -> Optional[Agent, None]:
         """
@@ -43,7 +210,10 @@ class Mars(Environment):
         if location:
             wrapped_x = location.get_x() % Config.world_size
             wrapped_y = location.get_y() % Config.world_size
-            return self.__grid[wrapped_y][wrapped_x]
+            index = wrapped_y * Config.world_size + wrapped_x
+            if self.__type_codes[index] == Rock.TYPE_CODE:
+                return Rock(Location(wrapped_x, wrapped_y))
+            return self.__grid.get(index)
 
         return None
 
@@ -75,9 +245,10 @@ class Mars(Environment):
             List[Location]: A list of free adjacent positions.
         """
         adjacent_locations = self.get_adjacent_locations(location)
+        codes, size = self.__type_codes, Config.world_size
         free_locations = []
         for adjacent_location in adjacent_locations:
-            if self.get_agent(adjacent_location) is None:
+            if codes[adjacent_location.get_y() * size + adjacent_location.get_x()] == Mars.EMPTY_CODE:
                 free_locations.append(adjacent_location)
         return free_locations
 
@@ -85,14 +256,245 @@ class Mars(Environment):
         """
         Places an agent at a specific location, wrapping around the grid edges if necessary.
 
+        Rocks are stored as terrain only, so the Rock object itself is not kept.
+
         Args:
             agent (Agent): The agent to be placed.
             location (Location): The location where the agent should be placed.
         """
         if location:
+            if self.__sharers is not None:
+                self.__unshare()
             wrapped_x = location.get_x() % Config.world_size
             wrapped_y = location.get_y() % Config.world_size
-            self.__grid[wrapped_y][wrapped_x] = agent
+            index = wrapped_y * Config.world_size + wrapped_x
+            type_code = agent.TYPE_CODE if agent is not None else Mars.EMPTY_CODE
+            if agent is None or type_code == Rock.TYPE_CODE:
+                self.__grid.pop(index, None)
+            else:
+                self.__grid[index] = agent
+            self.__set_type_code(index, type_code)
+
+    def place_rock(self, location: Location) -> None:
+        """
+        Places a rock at a specific location without creating a Rock object.
+
+        Args:
+            location (Location): The location where the rock should be placed.
+        """
+        self.set_type_code(location, Rock.TYPE_CODE)
+
+    def set_type_code(self, location: Location, type_code: int) -> None:
+        """
+        Places a type code at a specific location without an agent object, e.g. for agents kept elsewhere.
+
+        get_agent returns None for such cells, except for rocks.
+
+        Args:
+            location (Location): The location to change.
+            type_code (int): The new type code of the cell.
+        """
+        if self.__sharers is not None:
+            self.__unshare()
+        index = (location.get_y() % Config.world_size) * Config.world_size + location.get_x() % Config.world_size
+        self.__grid.pop(index, None)
+        self.__set_type_code(index, type_code)
+
+    def get_type_code(self, location: Location) -> int:
+        """
+        Returns the TYPE_CODE of the agent at a location, or EMPTY_CODE, without looking the agent up.
+
+        Args:
+            location (Location): The location to check.
+
+        Returns:
+            int: The type code of the cell.
+        """
+        return self.__type_codes[(location.get_y() % Config.world_size) * Config.world_size
+                                 + location.get_x() % Config.world_size]
+
+    def has_rock(self, location: Location) -> bool:
+        """
+        Checks whether a location holds a rock, without creating a Rock object.
+
+        Args:
+            location (Location): The location to check.
+
+        Returns:
+            bool: True if the location holds a rock, False otherwise.
+        """
+        index = (location.get_y() % Config.world_size) * Config.world_size + location.get_x() % Config.world_size
+        return self.__type_codes[index] == Rock.TYPE_CODE
+
+    def __set_type_code(self, index: int, type_code: int) -> None:
+        """Update the occupancy grid, the type counts and the dirty cells for one cell."""
+        previous_type_code = self.__type_codes[index]
+        if previous_type_code != type_code:
+            self.__type_codes[index] = type_code
+            self.__type_counts[previous_type_code] -= 1
+            self.__type_counts[type_code] += 1
+            for dirty_cells in self.__dirty_cell_sets:
+                dirty_cells.add(index)
+
+    def get_type_codes(self) -> Union[bytearray, memoryview]:
+        """
+        Returns the occupancy grid, one TYPE_CODE byte per cell in row-major order.
+
+        The grid is shared, not copied, so callers must treat it as read-only. It is a view of a shared block
+        while share_type_codes keeps it in one.
+        """
+        return self.__type_codes
+
+    def get_type_counts(self) -> array:
+        """
+        Returns the number of cells holding each type code, maintained incrementally by set_agent.
+
+        The counts are shared, not copied, so callers must treat them as read-only.
+        """
+        return self.__type_counts
+
+    def track_dirty_cells(self) -> Set[int]:
+        """
+        Start tracking the cells whose type code changes, e.g. for incremental rendering.
+
+        Every caller gets its own set, so several renderers can consume changes independently.
+
+        Returns:
+            Set[int]: A set that receives the row-major index of every changed cell. The caller clears it
+            after processing the changes.
+        """
+        dirty_cells: Set[int] = set()
+        self.__dirty_cell_sets.append(dirty_cells)
+        return dirty_cells
+
+    def mark_changed(self, cells: Iterable[int]) -> None:
+        """
+        Report cells whose type codes another process changed in the shared grid to the dirty cell trackers.
+
+        Args:
+            cells (Iterable[int]): The row-major indices of the changed cells.
+        """
+        for dirty_cells in self.__dirty_cell_sets:
+            dirty_cells.update(cells)
+
+    def untrack_dirty_cells(self, dirty_cells: Set[int]) -> None:
+        """
+        Stop tracking changes for a set returned by track_dirty_cells.
+
+        Args:
+            dirty_cells (Set[int]): The set to stop updating.
+        """
+        self.__dirty_cell_sets = [tracked for tracked in self.__dirty_cell_sets if tracked is not dirty_cells]
+
+    def get_distance(self, location: Location, other: Location) -> int:
+        """
+        Returns the number of king moves between two locations, wrapping around the grid edges.
+
+        Args:
+            location (Location): The first location.
+            other (Location): The second location.
+
+        Returns:
+            int: The wrapped Chebyshev distance between the locations.
+        """
+        dx = abs(location.get_x() - other.get_x()) % self.get_width()
+        dy = abs(location.get_y() - other.get_y()) % self.get_height()
+        return max(min(dx, self.get_width() - dx), min(dy, self.get_height() - dy))
+
+    def get_max_window_radius(self) -> int:
+        """Returns the largest window radius that does not wrap onto itself."""
+        return (min(self.get_width(), self.get_height()) - 1) // 2
+
+    def get_window(self, location: Location, radius: int) -> bytes:
+        """
+        Extracts the square window of the occupancy grid centred on a location, wrapping around the edges.
+
+        Every row is copied with at most two slices, so the cost grows with the window height rather than
+        with the number of cells.
+
+        Args:
+            location (Location): The centre of the window.
+            radius (int): The distance from the centre to the edge of the window.
+
+        Returns:
+            bytes: The (2 * radius + 1) ** 2 type codes of the window in row-major order.
+        """
+        if radius > self.get_max_window_radius():
+            raise ValueError(f"Window radius {radius} is larger than the grid allows")
+        width, height = self.get_width(), self.get_height()
+        size = 2 * radius + 1
+        x_start = (location.get_x() - radius) % width
+        x_end = x_start + size
+        codes = self.__type_codes
+        rows = []
+        for dy in range(-radius, radius + 1):
+            row_start = ((location.get_y() + dy) % height) * width
+            if x_end <= width:
+                rows.append(codes[row_start + x_start:row_start + x_end])
+            else:
+                rows.append(codes[row_start + x_start:row_start + width])
+                rows.append(codes[row_start:row_start + x_end - width])
+        return b"".join(rows)
+
+    def find_agents_in_window(self, window: bytes, location: Location, radius: int,
+                              type_code: int) -> List[Agent]:
+        """
+        Finds the agents of one type in a window extracted by get_window, nearest first.
+
+        Only matching cells are visited; the centre cell is skipped. Rocks are created for the matching rock
+        cells only.
+
+        Args:
+            window (bytes): The window returned by get_window.
+            location (Location): The centre of the window.
+            radius (int): The radius the window was extracted with.
+            type_code (int): The TYPE_CODE of the agents to find.
+
+        Returns:
+            List[Agent]: The matching agents sorted by distance, then row, then column.
+        """
+        size = 2 * radius + 1
+        centre = radius * size + radius
+        width, height = self.get_width(), self.get_height()
+        x, y = location.get_x() - radius, location.get_y() - radius
+        hits = []
+        position = window.find(type_code)
+        while position != -1:
+            if position != centre:
+                row, column = divmod(position, size)
+                distance = max(abs(row - radius), abs(column - radius))
+                hits.append((distance, position, (x + column) % width, (y + row) % height))
+            position = window.find(type_code, position + 1)
+        hits.sort()
+        if type_code == Rock.TYPE_CODE:
+            return [Rock(Location(hit_x, hit_y)) for _, _, hit_x, hit_y in hits]
+        grid = self.__grid
+        return [grid[hit_y * width + hit_x] for _, _, hit_x, hit_y in hits]
+
+    def get_rover_observations(self, radius: Optional[int] = None,
+                               rovers: Optional[List[Rover]] = None) -> Tuple[memoryview, memoryview]:
+        """
+        Gathers the egocentric observations of many rovers in one call, e.g. for a learned policy.
+
+        The buffers behind the views are reused by the next call, so callers copy what they want to keep.
+
+        Args:
+            radius (Optional[int]): The distance from the centre of a window to its edge,
+                Config.rover_sensing_radius by default.
+            rovers (Optional[List[Rover]]): The rovers to observe, all rovers by default.
+
+        Returns:
+            Tuple[memoryview, memoryview]: The windows of type codes centred on every rover, unsigned bytes
+            shaped (rovers, 2 * radius + 1, 2 * radius + 1), and the battery, shield and carrying state of
+            every rover, floats shaped (rovers, 3), both in the order of the rovers.
+
+        Raises:
+            ValueError: If the windows would wrap onto themselves.
+        """
+        radius = Config.rover_sensing_radius if radius is None else radius
+        if self.__observation_windows is None or self.__observation_windows.get_radius() != radius:
+            self.__observation_windows = ObservationWindows(self.get_width(), self.get_height(), radius)
+        return self.__observation_windows.gather(self.__type_codes, self.rovers if rovers is None else rovers)
 
     def get_width(self) -> int:
         """Returns the width of the Mars grid."""
@@ -104,13 +506,74 @@ class Mars(Environment):
 
     def get_free_locations(self) -> List[Location]:
         free_locations = []
-        for x in range(self.get_width()):
-            for y in range(self.get_height()):
-                location = Location(x, y)
-                if self.get_agent(location) is None:
-                    free_locations.append(location)
+        width = self.get_width()
+        # Views of a shared grid cannot be searched, so those are copied first
+        codes = self.__type_codes if self.__type_code_buffer is None else bytes(self.__type_codes)
+        for x in range(width):
+            column = codes[x::width]
+            y = column.find(Mars.EMPTY_CODE)
+            while y != -1:
+                free_locations.append(Location(x, y))
+                y = column.find(Mars.EMPTY_CODE, y + 1)
         return free_locations
 
+    def get_exploration_map(self) -> ExplorationMap:
+        """
+        Get the fog-of-war map shared by all rovers.
+
+        Returns:
+            ExplorationMap: The fleet-wide exploration map.
+        """
+        return self.__exploration_map
+
+    def get_heatmap(self) -> Heatmap:
+        """
+        Get the per-cell activity counters of the run.
+
+        Returns:
+            Heatmap: The visits, battery use, attacks and rock waiting times per cell.
+        """
+        return self.__heatmap
+
+    def get_random_pool(self) -> RandomPool:
+        """
+        Get the source of the random decisions made during the run.
+
+        Returns:
+            RandomPool: The batched random numbers shared by all agents.
+        """
+        return self.__random_pool
+
+    def submit(self, intent: Intent) -> None:
+        """
+        Apply an intent, or collect it while a synchronous step is deciding.
+
+        A move without a location is sent to a random one of its options first.
+
+        Args:
+            intent (Intent): The effect an agent wants to have.
+        """
+        if self.__pending_intents is not None:
+            self.__pending_intents.append(intent)
+            return
+        if intent.get_location() is None and intent.get_options():
+            intent.set_location(self.__random_pool.choice(intent.get_options()))
+        intent.get_agent().apply_intent(self, intent)
+
+    def begin_intents(self) -> None:
+        """Start collecting submitted intents instead of applying them."""
+        self.__pending_intents = []
+
+    def end_intents(self) -> List[Intent]:
+        """
+        Stop collecting intents and apply submitted ones right away again.
+
+        Returns:
+            List[Intent]: The intents submitted since begin_intents, in submission order.
+        """
+        intents, self.__pending_intents = self.__pending_intents or [], None
+        return intents
+
     def get_all_rovers(self) -> List[Rover]:
         """
         Get all rovers present on Mars.
@@ -119,3 +582,22 @@ class Mars(Environment):
             List[Rover]: A list of all rovers.
         """
         return self.rovers
+
+    def add_rover(self, rover: Rover) -> None:
+        """
+        Register a rover as part of the fleet on Mars.
+
+        Args:
+            rover (Rover): The rover to register.
+        """
+        self.rovers.append(rover)
+
+    def remove_rover(self, rover: Rover) -> None:
+        """
+        Remove a rover from the fleet on Mars, e.g. after it has been destroyed.
+
+        Args:
+            rover (Rover): The rover to remove.
+        """
+        if rover in self.rovers:
+            self.rovers.remove(rover)
@@ -0,0 +1,221 @@
+import pickle
+import unittest
+from model.alien import Alien
+from model.heatmap import Heatmap
+from model.intent import Intent
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+from model.rover import Rover
+
+
+class TestMars(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+
+    def test_set_agent_updates_type_codes(self):
+        location = Location(3, 2)
+        self.mars.set_agent(Rock(location), location)
+        self.assertEqual(self.mars.get_type_codes()[2 * self.mars.get_width() + 3], Rock.TYPE_CODE)
+        self.mars.set_agent(None, location)
+        self.assertEqual(self.mars.get_type_codes()[2 * self.mars.get_width() + 3], Mars.EMPTY_CODE)
+
+    def test_type_counts(self):
+        counts = self.mars.get_type_counts()
+        area = self.mars.get_width() * self.mars.get_height()
+        self.assertEqual(counts[Mars.EMPTY_CODE], area)
+
+        rover = Rover(Location(1, 0), Location(5, 5))
+        self.mars.set_agent(Rock(Location(2, 0)), Location(2, 0))
+        self.mars.set_agent(rover, Location(1, 0))
+        self.mars.set_agent(rover, Location(2, 0))
+        self.mars.set_agent(None, Location(1, 0))
+
+        self.assertEqual(counts[Rover.TYPE_CODE], 1)
+        self.assertEqual(counts[Rock.TYPE_CODE], 0)
+        self.assertEqual(counts[Mars.EMPTY_CODE], area - 1)
+
+        self.mars.clear()
+        self.assertEqual(self.mars.get_type_counts()[Rover.TYPE_CODE], 0)
+
+    def test_track_dirty_cells(self):
+        dirty_cells = self.mars.track_dirty_cells()
+        other_dirty_cells = self.mars.track_dirty_cells()
+        rover = Rover(Location(1, 0), Location(5, 5))
+        self.mars.set_agent(rover, Location(1, 0))
+        self.mars.set_agent(rover, Location(2, 0))
+        self.mars.set_agent(None, Location(1, 0))
+        self.mars.set_agent(None, Location(3, 0))
+        self.assertEqual(dirty_cells, {1, 2})
+        self.assertEqual(other_dirty_cells, {1, 2})
+
+        self.mars.untrack_dirty_cells(other_dirty_cells)
+        dirty_cells.clear()
+        self.mars.set_agent(None, Location(2, 0))
+        self.assertEqual(dirty_cells, {2})
+        self.assertEqual(other_dirty_cells, {1, 2})
+
+    def test_get_distance_wraps(self):
+        self.assertEqual(self.mars.get_distance(Location(0, 0), Location(19, 19)), 1)
+        self.assertEqual(self.mars.get_distance(Location(2, 3), Location(5, 4)), 3)
+
+    def test_get_window_wraps(self):
+        location = Location(19, 0)
+        self.mars.set_agent(Rock(location), location)
+        window = self.mars.get_window(Location(0, 19), 1)
+        self.assertEqual(len(window), 9)
+        self.assertEqual(window[2 * 3 + 0], Rock.TYPE_CODE)
+        self.assertEqual(window.count(Rock.TYPE_CODE), 1)
+
+    def test_get_window_rejects_large_radius(self):
+        with self.assertRaises(ValueError):
+            self.mars.get_window(Location(0, 0), self.mars.get_max_window_radius() + 1)
+
+    def test_find_agents_in_window_sorted_by_distance(self):
+        far_rock = Rock(Location(3, 0))
+        near_rock = Rock(Location(19, 19))
+        rover = Rover(Location(0, 0), Location(5, 5))
+        for agent in (far_rock, near_rock, rover):
+            self.mars.set_agent(agent, agent.get_location())
+
+        window = self.mars.get_window(Location(0, 0), 3)
+        rocks = self.mars.find_agents_in_window(window, Location(0, 0), 3, Rock.TYPE_CODE)
+        rovers = self.mars.find_agents_in_window(window, Location(0, 0), 3, Rover.TYPE_CODE)
+
+        self.assertEqual([rock.get_location() for rock in rocks], [Location(19, 19), Location(3, 0)])
+        self.assertEqual(rovers, [])
+
+    def test_rocks_are_terrain(self):
+        self.mars.place_rock(Location(2, 3))
+        self.mars.set_agent(Rock(Location(4, 4)), Location(4, 4))
+
+        self.assertTrue(self.mars.has_rock(Location(2, 3)))
+        self.assertEqual(self.mars.get_type_counts()[Rock.TYPE_CODE], 2)
+        rock = self.mars.get_agent(Location(4, 4))
+        self.assertIsInstance(rock, Rock)
+        self.assertEqual(rock.get_location(), Location(4, 4))
+        self.assertEqual(self.mars._Mars__grid, {})
+
+    def test_agent_replaces_rock(self):
+        self.mars.place_rock(Location(1, 1))
+        rover = Rover(Location(1, 1), Location(5, 5))
+        self.mars.set_agent(rover, Location(1, 1))
+
+        self.assertFalse(self.mars.has_rock(Location(1, 1)))
+        self.assertIs(self.mars.get_agent(Location(1, 1)), rover)
+        self.mars.set_agent(None, Location(1, 1))
+        self.assertIsNone(self.mars.get_agent(Location(1, 1)))
+        self.assertIn(Location(1, 1), self.mars.get_free_locations())
+
+    def test_fork_shares_the_grid_until_written(self):
+        self.mars.place_rock(Location(2, 2))
+        fork = self.mars.fork(1)
+        self.assertIs(fork._Mars__type_codes, self.mars._Mars__type_codes)
+
+        fork.place_rock(Location(3, 3))
+        self.mars.set_agent(None, Location(2, 2))
+        self.assertTrue(fork.has_rock(Location(3, 3)))
+        self.assertTrue(fork.has_rock(Location(2, 2)))
+        self.assertFalse(self.mars.has_rock(Location(3, 3)))
+        self.assertFalse(self.mars.has_rock(Location(2, 2)))
+        self.assertEqual(fork.get_type_counts()[Rock.TYPE_CODE], 2)
+        self.assertEqual(self.mars.get_type_counts()[Rock.TYPE_CODE], 0)
+
+    def test_world_owns_its_grid_again_once_forks_are_discarded(self):
+        codes = self.mars._Mars__type_codes
+        fork = self.mars.fork(1)
+        self.mars.place_rock(Location(1, 1))
+        self.assertIsNot(self.mars._Mars__type_codes, codes)
+        self.assertFalse(fork.has_rock(Location(1, 1)))
+
+        codes = self.mars._Mars__type_codes
+        exploration_map = self.mars.get_exploration_map()
+        explored = exploration_map._ExplorationMap__explored
+        fork = self.mars.fork(2)
+        del fork
+        self.mars.place_rock(Location(2, 2))
+        exploration_map.observe(2, 2, True)
+        self.assertIs(self.mars._Mars__type_codes, codes)
+        self.assertIs(exploration_map._ExplorationMap__explored, explored)
+
+    def test_fork_copies_owned_agents_only(self):
+        rover = Rover(Location(1, 1), Location(5, 5))
+        alien = Alien(Location(3, 1))
+        self.mars.set_agent(rover, Location(1, 1))
+        self.mars.add_rover(rover)
+        self.mars.set_agent(alien, Location(3, 1))
+        fork = self.mars.fork(1)
+
+        owned = fork.own(rover)
+        self.assertIsNot(owned, rover)
+        self.assertIs(fork.own(rover), owned)
+        self.assertIs(fork.own(owned), owned)
+        self.assertIs(fork.get_agent(Location(1, 1)), owned)
+        self.assertEqual(fork.get_all_rovers(), [owned])
+        self.assertIs(fork.get_agent(Location(3, 1)), alien)
+
+        owned.sustain_damage(25)
+        owned.set_target_location(Location(2, 2))
+        fork.submit(Intent(owned, Intent.MOVE, Location(2, 1)))
+        self.assertEqual(rover.get_shield(), 100)
+        self.assertEqual(rover.get_location(), Location(1, 1))
+        self.assertIs(self.mars.get_agent(Location(1, 1)), rover)
+        self.assertIsNone(self.mars.get_agent(Location(2, 1)))
+        self.assertIs(self.mars.get_all_rovers()[0], rover)
+        self.assertIs(fork.get_agent(Location(2, 1)), owned)
+        self.assertEqual(sum(self.mars.get_heatmap().get_layer(Heatmap.ROVER_VISITS)), 0)
+
+    def test_fork_keeps_the_exploration_map_apart(self):
+        self.mars.get_exploration_map().observe(1, 1, True)
+        fork = self.mars.fork(1)
+        fork.get_exploration_map().observe(2, 2, False)
+        self.assertTrue(fork.get_exploration_map().is_explored(1, 1))
+        self.assertFalse(self.mars.get_exploration_map().is_explored(2, 2))
+
+    def test_pickled_fork_owns_its_grid(self):
+        rover = Rover(Location(1, 1), Location(5, 5))
+        self.mars.set_agent(rover, Location(1, 1))
+        self.mars.add_rover(rover)
+        self.mars.get_exploration_map().observe(1, 1, True)
+        fork = self.mars.fork(1)
+        copy, copied_rover = pickle.loads(pickle.dumps((fork, rover)))
+        self.assertIsNone(copy._Mars__sharers)
+        self.assertIs(copy.get_agent(Location(1, 1)), copied_rover)
+        self.assertEqual(copy.get_all_rovers(), [copied_rover])
+        self.assertTrue(copy.get_exploration_map().is_explored(1, 1))
+
+        copy.place_rock(Location(3, 3))
+        copy.get_exploration_map().observe(2, 2, False)
+        self.assertFalse(self.mars.has_rock(Location(3, 3)))
+        self.assertFalse(self.mars.get_exploration_map().is_explored(2, 2))
+
+    def test_shared_grid(self):
+        self.mars.place_rock(Location(1, 1))
+        block = bytearray(self.mars.get_width() * self.mars.get_height() + 16)
+        self.mars.share_type_codes(memoryview(block))
+        self.assertEqual(block[self.mars.get_width() + 1], Rock.TYPE_CODE)
+
+        # Another process moves an alien code without an object and reports the cells
+        dirty_cells = self.mars.track_dirty_cells()
+        block[0], block[1] = Mars.EMPTY_CODE, Alien.TYPE_CODE
+        self.mars.mark_changed([0, 1])
+        self.assertEqual(dirty_cells, {0, 1})
+        self.assertEqual(self.mars.get_type_code(Location(1, 0)), Alien.TYPE_CODE)
+        self.assertIsNone(self.mars.get_agent(Location(1, 0)))
+        self.assertNotIn(Location(1, 0), self.mars.get_free_locations())
+
+        self.mars.set_type_code(Location(2, 0), Alien.TYPE_CODE)
+        self.assertEqual(block[2], Alien.TYPE_CODE)
+        fork = self.mars.fork(1)
+        fork.place_rock(Location(3, 0))
+        self.assertEqual(block[3], Mars.EMPTY_CODE)
+        self.assertEqual(pickle.loads(pickle.dumps(self.mars)).get_type_code(Location(2, 0)), Alien.TYPE_CODE)
+
+        self.mars.share_type_codes(None)
+        block[2] = Mars.EMPTY_CODE
+        self.assertEqual(self.mars.get_type_code(Location(2, 0)), Alien.TYPE_CODE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from array import array
+from typing import Optional, Sequence, Tuple, TYPE_CHECKING
+
+try:
+    import numpy
+except ImportError:  # NumPy only speeds up the gathering of many windows
+    numpy = None
+
+if TYPE_CHECKING:
+    from model.rover import Rover
+
+
+class ObservationWindows:
+    """
+    Gathers the egocentric observations of many rovers at once into preallocated buffers.
+
+    The observation of a rover is the square window of type codes of radius radius centred on it, wrapping
+    around the edges, and its vitals: battery and shield scaled to [0, 1] and 1.0 if it carries a rock. All
+    windows are written back to back into one bytearray and all vitals into one float array, and they are
+    returned as shaped memoryviews of those buffers, so no per-rover objects are built. The views are indexed
+    with full tuples, flattened with cast("B"), and wrapped by numpy.asarray without copying.
+
+    With NumPy every window cell is gathered with one numpy.take over precomputed offsets. Without it every
+    window row is one slice of a padded copy of the grid.
+
+    The buffers are reused by the next gather, so callers copy what they want to keep. They are replaced
+    rather than resized when more rovers need room, so views handed out earlier stay valid.
+
+    Attributes:
+        __width (int): The width of the grid.
+        __height (int): The height of the grid.
+        __radius (int): The distance from the centre of a window to its edge.
+        __side (int): The width and height of a window.
+        __capacity (int): The number of rovers the buffers have room for.
+        __windows (bytearray): The windows of the last gather, back to back in row-major order.
+        __vitals (array): The vitals of the last gather, three per rover.
+        __xs (array): The x coordinates of the rovers of the last gather.
+        __ys (array): The y coordinates of the rovers of the last gather.
+    """
+    VITALS = 3  # Battery, shield, carrying
+
+    def __init__(self, width: int, height: int, radius: int) -> None:
+        """
+        Initialise the ObservationWindows object.
+
+        Args:
+            width (int): The width of the grid.
+            height (int): The height of the grid.
+            radius (int): The distance from the centre of a window to its edge.
+
+        Raises:
+            ValueError: If the windows would wrap onto themselves.
+        """
+        if radius < 0 or 2 * radius + 1 > min(width, height):
+            raise ValueError(f"Window radius {radius} is larger than the grid allows")
+        self.__width = width
+        self.__height = height
+        self.__radius = radius
+        self.__side = 2 * radius + 1
+        self.__capacity = 0
+        self.__windows = bytearray()
+        self.__vitals = array("f")
+        self.__xs = array("q")
+        self.__ys = array("q")
+        if numpy is not None:
+            offsets = numpy.arange(-radius, radius + 1)
+            self.__row_offsets = offsets[:, None]
+            self.__column_offsets = offsets[None, :]
+
+    def get_radius(self) -> int:
+        """Get the distance from the centre of a window to its edge."""
+        return self.__radius
+
+    def get_side(self) -> int:
+        """Get the width and height of a window."""
+        return self.__side
+
+    def gather(self, type_codes: bytearray, rovers: Sequence[Rover]) -> Tuple[memoryview, memoryview]:
+        """
+        Gather the windows and vitals of rovers.
+
+        Args:
+            type_codes (bytearray): The occupancy grid, one type code per cell in row-major order.
+            rovers (Sequence[Rover]): The rovers to observe.
+
+        Returns:
+            Tuple[memoryview, memoryview]: The windows, unsigned bytes shaped (rovers, side, side), and the
+            vitals, floats shaped (rovers, 3), both in the order of the rovers; empty one-dimensional views if
+            there are no rovers.
+        """
+        count = len(rovers)
+        if count > self.__capacity:
+            self.__reserve(max(count, 2 * self.__capacity))
+        xs, ys, vitals = self.__xs, self.__ys, self.__vitals
+        for index, rover in enumerate(rovers):
+            location = rover.get_location()
+            xs[index] = location.get_x()
+            ys[index] = location.get_y()
+            vitals[3 * index] = rover.get_battery_level() / 100.0
+            vitals[3 * index + 1] = rover.get_shield() / 100.0
+            vitals[3 * index + 2] = 1.0 if rover.has_rock() else 0.0
+
+        window_area = self.__side * self.__side
+        if numpy is None:
+            self.__copy_rows(type_codes, count)
+        elif count:
+            out = numpy.frombuffer(self.__windows, dtype=numpy.uint8, count=count * window_area)
+            self.gather_codes(numpy.frombuffer(type_codes, dtype=numpy.uint8),
+                              numpy.frombuffer(xs, dtype=numpy.int64, count=count),
+                              numpy.frombuffer(ys, dtype=numpy.int64, count=count),
+                              out.reshape(count, self.__side, self.__side))
+        if not count:
+            # Memoryviews cannot have a zero in their shape
+            return memoryview(b""), memoryview(array("f"))
+        windows = memoryview(self.__windows)[:count * window_area].cast("B", (count, self.__side, self.__side))
+        vitals = memoryview(self.__vitals)[:count * ObservationWindows.VITALS].cast("B").cast(
+            "f", (count, ObservationWindows.VITALS))
+        return windows, vitals
+
+    def gather_codes(self, type_codes: numpy.ndarray, xs: numpy.ndarray, ys: numpy.ndarray, out: numpy.ndarray,
+                     bases: Optional[numpy.ndarray] = None) -> None:
+        """
+        Gather the windows centred on many positions with NumPy, e.g. for the stacked grids of BatchedMars.
+
+        Args:
+            type_codes (numpy.ndarray): The flattened grids.
+            xs (numpy.ndarray): The x coordinates of the centres, of any shape.
+            ys (numpy.ndarray): The y coordinates of the centres, of the same shape.
+            out (numpy.ndarray): The buffer to write, shaped like the centres followed by (side, side).
+            bases (Optional[numpy.ndarray]): The index of the first cell of the grid of every centre in
+                type_codes, broadcast against the centres; None for a single grid.
+        """
+        width = self.__width
+        rows = (ys[..., None, None] + self.__row_offsets) % self.__height
+        columns = (xs[..., None, None] + self.__column_offsets) % width
+        indices = rows * width + columns
+        if bases is not None:
+            indices += bases[..., None, None]
+        numpy.take(type_codes, indices, out=out)
+
+    def __copy_rows(self, type_codes: bytearray, count: int) -> None:
+        """
+        Copy every window row with one slice of a copy of the grid padded by the radius on every side.
+
+        With the padding no window wraps, so every window row is a plain slice and the rows of all windows
+        are joined at C speed into the buffer.
+        """
+        width, height, radius, side = self.__width, self.__height, self.__radius, self.__side
+        padded_width = width + 2 * radius
+        padded_rows = []
+        for y in range(-radius, height + radius):
+            row_start = (y % height) * width
+            padded_rows.append(type_codes[row_start + width - radius:row_start + width])
+            padded_rows.append(type_codes[row_start:row_start + width])
+            padded_rows.append(type_codes[row_start:row_start + radius])
+        padded = b"".join(padded_rows)
+        # The padded grid starts radius rows and columns before the grid, so a window starts at its centre
+        row_offsets = [dy * padded_width for dy in range(side)]
+        windows = b"".join([padded[y * padded_width + x + offset:y * padded_width + x + offset + side]
+                            for x, y in zip(self.__xs[:count], self.__ys[:count]) for offset in row_offsets])
+        self.__windows[:len(windows)] = windows
+
+    def __reserve(self, capacity: int) -> None:
+        """Replace the buffers with ones that have room for a number of rovers."""
+        self.__capacity = capacity
+        self.__windows = bytearray(capacity * self.__side * self.__side)
+        self.__vitals = array("f", bytes(4 * capacity * ObservationWindows.VITALS))
+        self.__xs = array("q", bytes(8 * capacity))
+        self.__ys = array("q", bytes(8 * capacity))
@@ -0,0 +1,81 @@
+import random
+import unittest
+from unittest import mock
+from model import observation_windows
+from model.location import Location
+from model.mars import Mars
+from model.observation_windows import ObservationWindows
+from model.rock import Rock
+from model.rover import Rover
+
+
+class TestObservationWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        random.seed(2)
+        width, height = self.mars.get_width(), self.mars.get_height()
+        for _ in range(60):
+            location = Location(random.randrange(width), random.randrange(height))
+            self.mars.set_agent(Rock(location), location)
+        # Rovers in the corners and on the edges wrap around
+        for x, y in ((0, 0), (width - 1, height - 1), (width - 1, 4), (7, 0), (5, 6)):
+            rover = Rover(Location(x, y), Location(10, 10))
+            self.mars.set_agent(rover, Location(x, y))
+            self.mars.add_rover(rover)
+
+    def check_observations(self, radius):
+        windows, vitals = self.mars.get_rover_observations(radius)
+        rovers = self.mars.get_all_rovers()
+        side = 2 * radius + 1
+        self.assertEqual(windows.shape, (len(rovers), side, side))
+        self.assertEqual(vitals.shape, (len(rovers), 3))
+        codes, values = windows.tobytes(), vitals.tolist()
+        for index, rover in enumerate(rovers):
+            window = codes[index * side * side:(index + 1) * side * side]
+            self.assertEqual(window, self.mars.get_window(rover.get_location(), radius))
+            self.assertEqual(windows[index, radius, radius], Rover.TYPE_CODE)
+            self.assertEqual(values[index], [rover.get_battery_level() / 100.0,
+                                             rover.get_shield() / 100.0, float(rover.has_rock())])
+
+    def test_windows_match_get_window(self):
+        for radius in (0, 1, 3):
+            self.check_observations(radius)
+
+    @unittest.skipIf(observation_windows.numpy is None, "NumPy is not installed")
+    def test_windows_match_without_numpy(self):
+        with mock.patch.object(observation_windows, "numpy", None):
+            self.mars = Mars()
+            self.setUp()
+            for radius in (0, 2):
+                self.check_observations(radius)
+
+    def test_vitals_follow_the_rovers(self):
+        rover = self.mars.get_all_rovers()[1]
+        rover.sustain_damage(25)
+        rover.set_rock(Rock(Location(0, 1)))
+        self.check_observations(1)
+
+    def test_earlier_views_survive_more_rovers(self):
+        windows, _ = self.mars.get_rover_observations(1)
+        first = windows.tobytes()
+        for x in range(20):
+            rover = Rover(Location(x, 12), Location(10, 10))
+            self.mars.set_agent(rover, Location(x, 12))
+            self.mars.add_rover(rover)
+        self.check_observations(1)
+        self.assertEqual(windows.tobytes(), first)
+
+    def test_no_rovers(self):
+        self.mars.rovers = []
+        windows, vitals = self.mars.get_rover_observations(1)
+        self.assertEqual((len(windows), len(vitals)), (0, 0))
+
+    def test_radius_too_large(self):
+        with self.assertRaises(ValueError):
+            ObservationWindows(5, 5, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import random
+import sys
+from array import array
+from itertools import islice
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class RandomPool:
+    """
+    A per-simulation source of random numbers drawn in large batches.
+
+    Agents make many small random decisions per step, e.g. picking one of up to eight free neighbours. Rather
+    than calling into the random module for each of them, the pool fills an array of 32-bit values from one
+    randbytes call and hands them out one at a time, or in bulk with take, refilling when it runs out. Picks
+    over k options scale a value into [0, k) with a multiply and shift, so they need no rejection loop and
+    allocate nothing.
+
+    Runs are reproducible: with a seed the sequence depends only on that seed, and without one the pool is
+    seeded from the random module, so seeding that module still fixes the whole run.
+
+    Attributes:
+        __random (random.Random): The generator the batches are drawn from.
+        __batch_size (int): The number of values drawn per refill.
+        __values (Iterator[int]): The unused values of the current batch, unsigned 32-bit integers.
+        __next_value (Callable[[], int]): The bound __next__ of __values, saving an attribute lookup per value.
+    """
+    BATCH_SIZE = 4096
+    SCALE = 2 ** 32
+
+    def __init__(self, seed: Optional[int] = None, batch_size: int = BATCH_SIZE) -> None:
+        """
+        Initialise the RandomPool object.
+
+        Args:
+            seed (Optional[int]): The seed of the pool, drawn from the random module if not given.
+            batch_size (int): The number of values drawn per refill.
+        """
+        self.__random = random.Random(random.getrandbits(64) if seed is None else seed)
+        self.__batch_size = batch_size
+        self.__values: Iterator[int] = iter(())
+        self.__next_value: Callable[[], int] = self.__values.__next__
+
+    def next_value(self) -> int:
+        """
+        Take the next value from the batch, refilling it first if it is used up.
+
+        Returns:
+            int: A uniformly distributed integer in [0, 2 ** 32).
+        """
+        try:
+            return self.__next_value()
+        except StopIteration:
+            self.__refill()
+            return self.__next_value()
+
+    def take(self, count: int) -> array:
+        """
+        Take the next values in bulk, e.g. one per cell of a row.
+
+        Comparing these against thresholds scaled by SCALE avoids converting every value to a float.
+
+        Args:
+            count (int): The number of values to take.
+
+        Returns:
+            array: The uniformly distributed unsigned 32-bit integers.
+        """
+        values = array("I", islice(self.__values, count))
+        while len(values) < count:
+            self.__refill()
+            values.extend(islice(self.__values, count - len(values)))
+        return values
+
+    def random(self) -> float:
+        """
+        Get a random float, a drop-in replacement for random.random.
+
+        Returns:
+            float: A uniformly distributed float in [0, 1).
+        """
+        try:
+            value = self.__next_value()
+        except StopIteration:
+            self.__refill()
+            value = self.__next_value()
+        return value / RandomPool.SCALE
+
+    def randbelow(self, k: int) -> int:
+        """
+        Pick one of k options.
+
+        The bias of scaling a 32-bit value is below k / 2 ** 32, far too small to matter for the handful of
+        options agents choose between.
+
+        Args:
+            k (int): The number of options, at least 1.
+
+        Returns:
+            int: A uniformly distributed integer in [0, k).
+        """
+        try:
+            value = self.__next_value()
+        except StopIteration:
+            self.__refill()
+            value = self.__next_value()
+        return (value * k) >> 32
+
+    def choice(self, options: Sequence[T]) -> T:
+        """
+        Pick a random element, a drop-in replacement for random.choice.
+
+        Args:
+            options (Sequence[T]): The options to pick from.
+
+        Returns:
+            T: One of the options.
+
+        Raises:
+            IndexError: If there are no options.
+        """
+        try:
+            value = self.__next_value()
+        except StopIteration:
+            self.__refill()
+            value = self.__next_value()
+        # An empty sequence is indexed at 0, which raises the IndexError
+        return options[(value * len(options)) >> 32]
+
+    def __refill(self) -> None:
+        """Replace the used-up batch with fresh values."""
+        values = array("I")
+        values.frombytes(self.__random.randbytes(self.__batch_size * values.itemsize))
+        # Keep the sequence independent of the platform's byte order
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.__values = iter(values)
+        self.__next_value = self.__values.__next__
@@ -0,0 +1,60 @@
+import random
+import unittest
+from model.random_pool import RandomPool
+
+
+class TestRandomPool(unittest.TestCase):
+
+    def test_same_seed_same_sequence(self):
+        first, second = RandomPool(42), RandomPool(42)
+        self.assertEqual([first.next_value() for _ in range(100)], [second.next_value() for _ in range(100)])
+        self.assertNotEqual([RandomPool(43).next_value() for _ in range(100)],
+                            [RandomPool(42).next_value() for _ in range(100)])
+
+    def test_sequence_independent_of_batch_size(self):
+        small, large = RandomPool(5, batch_size=3), RandomPool(5, batch_size=1000)
+        self.assertEqual([small.next_value() for _ in range(20)], [large.next_value() for _ in range(20)])
+
+    def test_seeded_from_random_module(self):
+        random.seed(9)
+        first = [RandomPool().next_value() for _ in range(10)]
+        random.seed(9)
+        second = [RandomPool().next_value() for _ in range(10)]
+        self.assertEqual(first, second)
+
+    def test_refills(self):
+        pool = RandomPool(1, batch_size=4)
+        values = [pool.next_value() for _ in range(10)]
+        self.assertTrue(all(0 <= value < RandomPool.SCALE for value in values))
+        self.assertGreater(len(set(values)), 1)
+
+    def test_take_continues_the_sequence(self):
+        bulk, single = RandomPool(6, batch_size=7), RandomPool(6, batch_size=7)
+        values = bulk.take(10)
+        self.assertEqual(len(values), 10)
+        self.assertEqual(list(values) + [bulk.next_value()], [single.next_value() for _ in range(11)])
+
+    def test_random_range(self):
+        pool = RandomPool(2)
+        values = [pool.random() for _ in range(1000)]
+        self.assertTrue(all(0.0 <= value < 1.0 for value in values))
+        self.assertAlmostEqual(sum(values) / len(values), 0.5, delta=0.05)
+
+    def test_randbelow_is_uniform(self):
+        pool = RandomPool(3)
+        counts = [0] * 8
+        for _ in range(8000):
+            counts[pool.randbelow(8)] += 1
+        self.assertTrue(all(900 < count < 1100 for count in counts))
+        self.assertEqual(pool.randbelow(1), 0)
+
+    def test_choice(self):
+        pool = RandomPool(4)
+        options = ["a", "b", "c"]
+        self.assertEqual({pool.choice(options) for _ in range(100)}, set(options))
+        with self.assertRaises(IndexError):
+            pool.choice([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 
 class Rock(Agent):
+    __slots__ = ()
+    TYPE_CODE = 4
 
     def __init__(self, location: Location) -> None:
         super().__init__(location)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from controller.config import Config
+from model.location import Location
+
+
+class RockMemory:
+    """
+    Bounded, expiring memory of rock locations kept by a rover.
+
+    Entries are keyed by cell coordinates so membership, insertion and removal are O(1). The internal
+    ordering always follows the time an entry was last confirmed, so expired entries sit at the front and
+    can be dropped without scanning the whole memory.
+
+    Attributes:
+        LRU (str): Evict the entry that was confirmed least recently.
+        DISTANCE (str): Evict the entry furthest from the rover.
+        AGE (str): Evict the entry that was first seen earliest.
+        __capacity (int): The maximum number of remembered locations.
+        __ttl (int): The number of steps an entry survives without being confirmed, or 0 for no expiry.
+        __eviction_policy (str): The policy used when the memory is full.
+        __entries (OrderedDict[Tuple[int, int], List]): Maps cells to [location, first_seen, last_seen].
+    """
+    LRU = "lru"
+    DISTANCE = "distance"
+    AGE = "age"
+
+    def __init__(self, capacity: int = None, ttl: int = None, eviction_policy: str = None) -> None:
+        """
+        Initialise the RockMemory object.
+
+        Args:
+            capacity (int): The maximum number of remembered locations, defaults to Config.rover_memory_capacity.
+            ttl (int): Steps an entry lives without confirmation, defaults to Config.rover_memory_ttl.
+            eviction_policy (str): One of LRU, DISTANCE or AGE, defaults to Config.rover_memory_eviction.
+        """
+        self.__capacity = Config.rover_memory_capacity if capacity is None else capacity
+        self.__ttl = Config.rover_memory_ttl if ttl is None else ttl
+        self.__eviction_policy = Config.rover_memory_eviction if eviction_policy is None else eviction_policy
+        if self.__eviction_policy not in (self.LRU, self.DISTANCE, self.AGE):
+            raise ValueError(f"Unknown eviction policy: {self.__eviction_policy}")
+        self.__entries: Dict[Tuple[int, int], List] = OrderedDict()
+        self.__now = 0
+
+    def __len__(self) -> int:
+        """Return the number of remembered locations."""
+        return len(self.__entries)
+
+    def __contains__(self, location: Location) -> bool:
+        """Return True if the location is remembered."""
+        return (location.get_x(), location.get_y()) in self.__entries
+
+    def __iter__(self) -> Iterator[Location]:
+        """Iterate over the remembered locations, least recently confirmed first."""
+        return (entry[0] for entry in self.__entries.values())
+
+    def copy(self) -> RockMemory:
+        """
+        Copy the memory, e.g. for a copy of its rover.
+
+        Returns:
+            RockMemory: A memory with the same settings and entries that changes independently of this one.
+        """
+        memory = RockMemory(self.__capacity, self.__ttl, self.__eviction_policy)
+        memory.__entries = OrderedDict((key, list(entry)) for key, entry in self.__entries.items())
+        memory.__now = self.__now
+        return memory
+
+    def tick(self, now: int) -> None:
+        """
+        Advance the memory clock and drop entries whose time-to-live has run out.
+
+        Args:
+            now (int): The current step of the owning rover.
+        """
+        self.__now = now
+        if self.__ttl <= 0:
+            return
+        entries = self.__entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if now - entry[2] < self.__ttl:
+                break
+            del entries[key]
+
+    def remember(self, location: Location, origin: Optional[Location] = None) -> None:
+        """
+        Remember or refresh a rock location, evicting another entry if the memory is full.
+
+        Args:
+            location (Location): The location of the rock.
+            origin (Location): The current location of the rover, used by the DISTANCE policy.
+        """
+        key = (location.get_x(), location.get_y())
+        entry = self.__entries.get(key)
+        if entry is not None:
+            entry[2] = self.__now
+            self.__entries.move_to_end(key)
+            return
+        if self.__capacity <= 0:
+            return
+        if len(self.__entries) >= self.__capacity:
+            self.__evict(origin)
+        self.__entries[key] = [location, self.__now, self.__now]
+
+    def remove(self, location: Location) -> None:
+        """
+        Forget a rock location if it is remembered.
+
+        Args:
+            location (Location): The location to forget.
+        """
+        self.__entries.pop((location.get_x(), location.get_y()), None)
+
+    def observe(self, location: Location, has_rock: bool) -> None:
+        """
+        Confirm or drop a remembered location after the rover has looked at it again.
+
+        Args:
+            location (Location): The observed location.
+            has_rock (bool): Whether a rock is still present at the location.
+        """
+        key = (location.get_x(), location.get_y())
+        entry = self.__entries.get(key)
+        if entry is None:
+            return
+        if has_rock:
+            entry[2] = self.__now
+            self.__entries.move_to_end(key)
+        else:
+            del self.__entries[key]
+
+    def get_locations(self) -> List[Location]:
+        """
+        Get the remembered locations.
+
+        Returns:
+            List[Location]: The remembered locations, least recently confirmed first.
+        """
+        return [entry[0] for entry in self.__entries.values()]
+
+    def __evict(self, origin: Optional[Location]) -> None:
+        """
+        Evict a single entry according to the eviction policy.
+
+        Args:
+            origin (Location): The current location of the rover, used by the DISTANCE policy.
+        """
+        entries = self.__entries
+        if self.__eviction_policy == self.AGE:
+            victim = min(entries, key=lambda key: entries[key][1])
+        elif self.__eviction_policy == self.DISTANCE and origin is not None:
+            size = Config.world_size
+            origin_x, origin_y = origin.get_x(), origin.get_y()
+
+            def distance(key: Tuple[int, int]) -> int:
+                dx = abs(key[0] - origin_x) % size
+                dy = abs(key[1] - origin_y) % size
+                return max(min(dx, size - dx), min(dy, size - dy))
+
+            victim = max(entries, key=distance)
+        else:
+            victim = next(iter(entries))
+        del entries[victim]
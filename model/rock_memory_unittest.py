@@ -0,0 +1,83 @@
+import unittest
+from model.location import Location
+from model.rock_memory import RockMemory
+
+
+class TestRockMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = RockMemory(capacity=3, ttl=10, eviction_policy=RockMemory.LRU)
+
+    def test_remember_and_contains(self):
+        self.memory.remember(Location(1, 1))
+        self.assertIn(Location(1, 1), self.memory)
+        self.assertNotIn(Location(2, 2), self.memory)
+
+    def test_copy_changes_independently(self):
+        self.memory.remember(Location(1, 1))
+        copy = self.memory.copy()
+        copy.remove(Location(1, 1))
+        copy.remember(Location(2, 2))
+        self.assertEqual(self.memory.get_locations(), [Location(1, 1)])
+        self.assertEqual(copy.get_locations(), [Location(2, 2)])
+
+    def test_remember_is_idempotent(self):
+        self.memory.remember(Location(1, 1))
+        self.memory.remember(Location(1, 1))
+        self.assertEqual(len(self.memory), 1)
+
+    def test_lru_eviction(self):
+        for i in range(3):
+            self.memory.remember(Location(i, i))
+        self.memory.observe(Location(0, 0), True)
+        self.memory.remember(Location(5, 5))
+        self.assertEqual(len(self.memory), 3)
+        self.assertNotIn(Location(1, 1), self.memory)
+        self.assertIn(Location(0, 0), self.memory)
+
+    def test_age_eviction(self):
+        memory = RockMemory(capacity=2, ttl=0, eviction_policy=RockMemory.AGE)
+        memory.tick(1)
+        memory.remember(Location(0, 0))
+        memory.tick(2)
+        memory.remember(Location(1, 1))
+        memory.observe(Location(0, 0), True)
+        memory.remember(Location(2, 2))
+        self.assertNotIn(Location(0, 0), memory)
+        self.assertIn(Location(1, 1), memory)
+
+    def test_distance_eviction(self):
+        memory = RockMemory(capacity=2, ttl=0, eviction_policy=RockMemory.DISTANCE)
+        memory.remember(Location(1, 1))
+        memory.remember(Location(8, 8))
+        memory.remember(Location(2, 2), Location(0, 0))
+        self.assertNotIn(Location(8, 8), memory)
+        self.assertIn(Location(1, 1), memory)
+
+    def test_ttl_expiry(self):
+        self.memory.tick(0)
+        self.memory.remember(Location(1, 1))
+        self.memory.tick(5)
+        self.memory.remember(Location(2, 2))
+        self.memory.tick(10)
+        self.assertNotIn(Location(1, 1), self.memory)
+        self.assertIn(Location(2, 2), self.memory)
+
+    def test_observe_drops_missing_rock(self):
+        self.memory.remember(Location(1, 1))
+        self.memory.observe(Location(1, 1), False)
+        self.assertEqual(len(self.memory), 0)
+
+    def test_remove(self):
+        self.memory.remember(Location(1, 1))
+        self.memory.remove(Location(1, 1))
+        self.memory.remove(Location(1, 1))
+        self.assertEqual(self.memory.get_locations(), [])
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            RockMemory(eviction_policy="random")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
 from __future__ import annotations
-import random
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from model.rock import Rock
 from model.agent import Agent
+from model.intent import Intent
 from model.location import Location
+from model.rock_memory import RockMemory
+from controller.config import Config
 if TYPE_CHECKING:
     from model.mars import Mars
+    from model.sector import Sector
 
 
 class Rover(Agent):
@@ -20,9 +23,14 @@ class Rover(Agent):
         __rock (Rock): The rock picked up by the rover.
         __battery_level (float): The current battery level of the rover.
         __target_location (Location): The target location the rover is moving towards.
-        __remembered_rock_locations (List[Location]): A list of remembered rock locations.
+        __remembered_rock_locations (RockMemory): A bounded, expiring memory of rock locations.
         __shield_level (int): The shield level of the rover.
+        __steps (int): The number of steps the rover has taken part in, used as the memory clock.
+        __home_sector (Sector): The sector the spacecraft assigned to the rover for exploration and pickups.
     """
+    __slots__ = ("__id", "__space_craft_location", "__rock", "__battery_level", "__target_location",
+                 "__remembered_rock_locations", "__shield_level", "__steps", "__home_sector")
+    TYPE_CODE = 2
     __next_id = 1
 
     def __init__(self, location: Location, space_craft_location: Location):
@@ -40,8 +48,10 @@ class Rover(Agent):
         self.__rock = None
         self.__battery_level = 100.0  # Initial battery level
         self.__target_location = None
-        self.__remembered_rock_locations: List[Location] = []
+        self.__remembered_rock_locations = RockMemory()
         self.__shield_level = 100
+        self.__steps = 0
+        self.__home_sector = None
 
     def __repr__(self) -> str:
         """
@@ -84,6 +94,23 @@ class Rover(Agent):
             return NotImplemented
         return self.__id == other.__id
 
+    """
+    ===== Copying =====
+    """
+
+    def clone(self) -> Rover:
+        """
+        Copy the rover with its own rock memory and carried rock; the copy keeps the ID.
+
+        Returns:
+            Rover: The copy.
+        """
+        rover = super().clone()
+        rover.__remembered_rock_locations = self.__remembered_rock_locations.copy()
+        if self.__rock is not None:
+            rover.__rock = self.__rock.clone()
+        return rover
+
     """
     ===== Display ID =====
     """
@@ -115,6 +142,8 @@ class Rover(Agent):
         if self.__rock:
             self.__rock.set_location(new_location)
         self.__battery_level -= 5.0  # Decrease battery level with each move
+        mars.get_exploration_map().observe(new_location.get_x(), new_location.get_y(), False)
+        mars.get_heatmap().record_rover_move(new_location.get_x(), new_location.get_y(), 5.0)
 
     def __move_to_random_location(self, mars: Mars) -> None:
         """
@@ -125,14 +154,12 @@ class Rover(Agent):
         """
         free_locations = mars.get_free_adjacent_locations(self.get_location())
         if free_locations and self.__battery_level >= 5.0:
-            random_free_location = random.choice(free_locations)
-            self.__move(mars, random_free_location)
+            mars.submit(Intent(self, Intent.MOVE, options=free_locations))
         else:
             # If there are no free adjacent locations, move to any available free location on the map
             all_free_locations = mars.get_free_locations()
             if all_free_locations and self.__battery_level >= 5.0:
-                random_free_location = random.choice(all_free_locations)
-                self.__move(mars, random_free_location)
+                mars.submit(Intent(self, Intent.MOVE, options=all_free_locations))
 
     def __move_towards_spacecraft(self, mars: Mars) -> bool:
         """
@@ -154,8 +181,8 @@ class Rover(Agent):
 
         free_adjacent_locations = mars.get_free_adjacent_locations(self.get_location())
         if new_location in free_adjacent_locations:
-            self.__move(mars, new_location)
-            return self.__is_adjacent_to(mars, self.__space_craft_location)
+            mars.submit(Intent(self, Intent.MOVE, new_location))
+            return self.__space_craft_location in mars.get_adjacent_locations(new_location)
         else:
             self.__move_to_random_location(mars)
         return False
@@ -178,7 +205,38 @@ class Rover(Agent):
 
         free_adjacent_locations = mars.get_free_adjacent_locations(self.get_location())
         if new_location in free_adjacent_locations:
-            self.__move(mars, new_location)
+            mars.submit(Intent(self, Intent.MOVE, new_location))
+        else:
+            self.__move_to_random_location(mars)
+
+    def __move_towards_frontier(self, mars: Mars) -> None:
+        """
+        Move the rover one step towards the nearest cell no rover has explored yet.
+
+        Frontiers inside the home sector are preferred until the sector is fully explored. Falls back to a
+        random move once the whole map has been explored.
+
+        Args:
+            mars (Mars): The Mars environment.
+        """
+        frontier = mars.get_exploration_map().nearest_frontier(self.get_location(), self.__home_sector)
+        if frontier is None:
+            self.__move_to_random_location(mars)
+            return
+
+        # Step along the shortest direction on the wrapped grid
+        current_x = self.get_location().get_x()
+        current_y = self.get_location().get_y()
+        width, height = mars.get_width(), mars.get_height()
+        dx = (frontier.get_x() - current_x) % width
+        dy = (frontier.get_y() - current_y) % height
+        dir_x = 0 if dx == 0 else 1 if dx <= width // 2 else -1
+        dir_y = 0 if dy == 0 else 1 if dy <= height // 2 else -1
+        new_location = Location((current_x + dir_x) % width, (current_y + dir_y) % height)
+
+        free_adjacent_locations = mars.get_free_adjacent_locations(self.get_location())
+        if new_location in free_adjacent_locations:
+            mars.submit(Intent(self, Intent.MOVE, new_location))
         else:
             self.__move_to_random_location(mars)
 
@@ -196,12 +254,12 @@ class Rover(Agent):
         """
 
         if rock is not None:
+            mars.get_heatmap().record_rock_pickup(rock.get_location().get_x(), rock.get_location().get_y())
             self.__rock = rock
             self.__move(mars, rock.get_location())
 
             # Remove the picked-up rock location from remembered rock locations
-            if rock.get_location() in self.__remembered_rock_locations:
-                self.__remembered_rock_locations.remove(rock.get_location())
+            self.__remembered_rock_locations.remove(rock.get_location())
             self.__target_location = None
 
     def has_rock(self) -> bool:
@@ -247,17 +305,16 @@ class Rover(Agent):
         Args:
             location (Location): The location of the rock to remember.
         """
-        if location not in self.__remembered_rock_locations:
-            self.__remembered_rock_locations.append(location)
+        self.__remembered_rock_locations.remember(location, self.get_location())
 
     def get_remembered_rock_locations(self) -> List[Location]:
         """
         Get the remembered locations of rocks on Mars.
 
         Returns:
-            List[Location]: A list of remembered rock locations.
+            List[Location]: A list of remembered rock locations, least recently confirmed first.
         """
-        return self.__remembered_rock_locations
+        return self.__remembered_rock_locations.get_locations()
 
     def set_target_location(self, location: Location) -> None:
         """
@@ -268,6 +325,24 @@ class Rover(Agent):
         """
         self.__target_location = location
 
+    def get_home_sector(self) -> Optional[Sector]:
+        """
+        Get the home sector of the rover.
+
+        Returns:
+            Optional[Sector]: The sector assigned by the spacecraft, or None if unassigned.
+        """
+        return self.__home_sector
+
+    def set_home_sector(self, sector: Optional[Sector]) -> None:
+        """
+        Set the home sector of the rover.
+
+        Args:
+            sector (Optional[Sector]): The sector to explore and collect rocks in.
+        """
+        self.__home_sector = sector
+
     """
     ===== Functions for Scanning =====
     """
@@ -285,28 +360,30 @@ class Rover(Agent):
         adjacent_locations = mars.get_adjacent_locations(self.get_location())
         for loc in adjacent_locations:
             if loc == self.__space_craft_location:
-                recharge_amount = 100.0 - self.__battery_level
-                self.recharge(recharge_amount)  # Recharge to full battery
+                mars.submit(Intent(self, Intent.RECHARGE))  # Recharge to full battery
                 return True
         return False
 
     def __scan_for_rocks(self, mars: Mars) -> List[Rock]:
         """
-        Scan adjacent cells for rocks.
+        Scan the cells within sensing range for rocks.
+
+        The sensor window is extracted from the occupancy grid in one go and written to the exploration
+        map. Remembered rock locations inside the window are confirmed or dropped on the way.
 
         Args:
             mars (Mars): The Mars environment.
 
         Returns:
-            List[Rock]: A list of rocks found in adjacent cells.
+            List[Rock]: A list of rocks found within sensing range, nearest first.
         """
-        adjacent_locations = mars.get_adjacent_locations(self.get_location())
-        found_rocks = []
-        for adjacent_location in adjacent_locations:
-            agent = mars.get_agent(adjacent_location)
-            if isinstance(agent, Rock):
-                found_rocks.append(agent)
-        return found_rocks
+        radius = self.__get_sensing_radius(mars)
+        window = mars.get_window(self.get_location(), radius)
+        mars.submit(Intent(self, Intent.OBSERVE, self.get_location(), other=window))
+        for location in self.__remembered_rock_locations.get_locations():
+            if mars.get_distance(self.get_location(), location) <= radius:
+                self.__remembered_rock_locations.observe(location, mars.has_rock(location))
+        return mars.find_agents_in_window(window, self.get_location(), radius, Rock.TYPE_CODE)
 
     def __is_adjacent_to_target(self, mars: Mars, target_location: Location) -> bool:
         """
@@ -327,21 +404,30 @@ class Rover(Agent):
 
     def __scan_for_rovers(self, mars: Mars) -> List[Rover]:
         """
-        Scan adjacent cells for other rovers.
+        Scan the cells within sensing range for other rovers.
 
         Args:
             mars (Mars): The Mars environment.
 
         Returns:
-            List[Rover]: A list of rovers found in adjacent cells.
+            List[Rover]: A list of rovers found within sensing range, nearest first.
         """
-        adjacent_locations = mars.get_adjacent_locations(self.get_location())
-        found_rovers = []
-        for adjacent_location in adjacent_locations:
-            agent = mars.get_agent(adjacent_location)
-            if isinstance(agent, Rover):
-                found_rovers.append(agent)
-        return found_rovers
+        radius = self.__get_sensing_radius(mars)
+        window = mars.get_window(self.get_location(), radius)
+        return mars.find_agents_in_window(window, self.get_location(), radius, Rover.TYPE_CODE)
+
+    @staticmethod
+    def __get_sensing_radius(mars: Mars) -> int:
+        """
+        Get the sensing radius of the rover, limited to what the grid allows.
+
+        Args:
+            mars (Mars): The Mars environment.
+
+        Returns:
+            int: The distance up to which the rover senses other agents.
+        """
+        return max(1, min(Config.rover_sensing_radius, mars.get_max_window_radius()))
 
     def __is_adjacent_to(self, mars: Mars, location: Location) -> bool:
         """
@@ -449,6 +535,8 @@ class Rover(Agent):
             mars (Mars): The Mars environment.
         """
         print(f"Rover {self.__id}- Battery level: {self.__battery_level}, Current location: {self.get_location()}")
+        self.__steps += 1
+        self.__remembered_rock_locations.tick(self.__steps)
         if self.__shield_level == 0:
             return
         if self.__battery_level > 0:
@@ -462,38 +550,94 @@ class Rover(Agent):
                 # print(f"Rover {self.__id} has target")
                 if self.__is_adjacent_to_target(mars, self.__target_location):
                     # print("🚀 is adjacent to target")
-                    rock_at_target = mars.get_agent(self.__target_location)
-                    if isinstance(rock_at_target, Rock):
-                        self.__pick_up_rock(mars, rock_at_target)
+                    if mars.has_rock(self.__target_location):
+                        mars.submit(Intent(self, Intent.PICK_UP, self.__target_location))
                         # print(f"Target {self.__target_location} picked!")
                     else:
+                        self.__remembered_rock_locations.observe(self.__target_location, False)
                         self.__target_location = None
                 else:
                     self.__move_towards_rock(mars, self.__target_location)
                     # print(f"Rover {self.__id} moving towards rock at target location: {self.__target_location}")
 
             else:
-                adjacent_rocks = self.__scan_for_rocks(mars)
-                if len(adjacent_rocks) > 0:
-                    print(f"Rover {self.__id} picking up adjacent rock.")
-                    self.__pick_up_rock(mars, adjacent_rocks[0])
-                    if len(adjacent_rocks) > 1:
-                        remaining_rocks = adjacent_rocks[1:]
+                sensed_rocks = self.__scan_for_rocks(mars)
+                if len(sensed_rocks) > 0:
+                    if mars.get_distance(self.get_location(), sensed_rocks[0].get_location()) <= 1:
+                        print(f"Rover {self.__id} picking up adjacent rock.")
+                        mars.submit(Intent(self, Intent.PICK_UP, sensed_rocks[0].get_location()))
+                    else:
+                        # The nearest rock is out of reach, head for it
+                        self.__target_location = sensed_rocks[0].get_location()
+                        self.__move_towards_rock(mars, self.__target_location)
+                    if len(sensed_rocks) > 1:
+                        remaining_rocks = sensed_rocks[1:]
                         for rock in remaining_rocks:
                             self.__remember_rock_location(rock.get_location())
                             print(f"Rover {self.__id} remembering rock location =>{rock.get_location()}|")
                 else:
-                    # print(f"Rover {self.__id} moving to random location.")
-                    self.__move_to_random_location(mars)
+                    self.__move_towards_frontier(mars)
         else:
-            # Check if adjacent to another rover
-            if self.__scan_for_spacecraft_in_adjacent_cells(mars):
-                self.recharge(100)
-            else:
+            # Recharge at the spacecraft if adjacent, otherwise ask adjacent rovers to share their battery
+            if not self.__scan_for_spacecraft_in_adjacent_cells(mars):
                 nearby_rovers = self.__scan_for_rovers(mars)
                 for nearby_rover in nearby_rovers:
+                    if mars.get_distance(self.get_location(), nearby_rover.get_location()) > 1:
+                        break  # Rovers are sorted by distance; battery can only be shared when adjacent
                     if nearby_rover.get_battery_level() > 50:
                         print(f"Rover {self.__id} requesting battery from nearby rover {nearby_rover.get_id()}")
-                        nearby_rover.share_battery(self)
+                        mars.submit(Intent(self, Intent.SHARE_BATTERY, other=nearby_rover))
                         if self.__rock is None:
-                            self.pick_rock_from_rover(nearby_rover)
+                            mars.submit(Intent(self, Intent.TAKE_ROCK, other=nearby_rover))
+
+    def follow_action(self, mars: Mars, direction: Optional[Tuple[int, int]]) -> None:
+        """
+        Take part in a step with a move chosen by a rover policy instead of by act.
+
+        The rover recharges when it is next to the spacecraft, where the spacecraft also collects its rock,
+        and then moves one cell in the given direction: onto a rock to pick it up if it carries none, or
+        onto an empty cell. Moves into occupied cells, or without the battery for them, are skipped.
+
+        Args:
+            mars (Mars): The Mars environment.
+            direction (Optional[Tuple[int, int]]): The x and y offsets of the move, None to stay.
+        """
+        self.__steps += 1
+        self.__remembered_rock_locations.tick(self.__steps)
+        if self.__shield_level == 0:
+            return
+        self.__scan_for_spacecraft_in_adjacent_cells(mars)
+        if direction is None or self.__battery_level < 5.0:
+            return
+        location = self.get_location()
+        target = Location((location.get_x() + direction[0]) % mars.get_width(),
+                          (location.get_y() + direction[1]) % mars.get_height())
+        if self.__rock is None and mars.has_rock(target):
+            mars.submit(Intent(self, Intent.PICK_UP, target))
+        elif mars.get_type_code(target) == mars.EMPTY_CODE:
+            mars.submit(Intent(self, Intent.MOVE, target))
+
+    def apply_intent(self, mars: Mars, intent: Intent) -> None:
+        """
+        Carry out an intent the rover submitted while acting.
+
+        Args:
+            mars (Mars): The Mars environment.
+            intent (Intent): The intent to carry out.
+        """
+        kind = intent.get_kind()
+        if kind == Intent.MOVE:
+            self.__move(mars, intent.get_location())
+        elif kind == Intent.PICK_UP:
+            self.__pick_up_rock(mars, mars.get_agent(intent.get_location()))
+        elif kind == Intent.OBSERVE:
+            mars.get_exploration_map().observe_window(intent.get_location(), self.__get_sensing_radius(mars),
+                                                      intent.get_other(), Rock.TYPE_CODE)
+        elif kind == Intent.RECHARGE:
+            self.recharge(100.0)
+        elif kind == Intent.SHARE_BATTERY:
+            intent.get_other().share_battery(self)
+        elif kind == Intent.TAKE_ROCK:
+            self.pick_rock_from_rover(intent.get_other())
+        else:
+            super().apply_intent(mars, intent)
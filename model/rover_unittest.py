@@ -1,4 +1,5 @@
 import unittest
+from controller.config import Config
 from model.rover import Rover
 from model.location import Location
 from model.mars import Mars
@@ -117,6 +118,38 @@ class TestRover(unittest.TestCase):
         self.rover.act(self.mars)
         self.assertNotEqual(self.rover.get_location(), initial_location)
 
+    def test_scan_for_rocks_updates_exploration_map(self):
+        rock_location = Location(1, 0)
+        self.mars.set_agent(Rock(rock_location), rock_location)
+        self.rover._Rover__scan_for_rocks(self.mars)
+        exploration_map = self.mars.get_exploration_map()
+        self.assertTrue(exploration_map.is_explored(0, 0))
+        self.assertTrue(exploration_map.is_explored(19, 19))
+        self.assertTrue(exploration_map.has_rock_sighting(1, 0))
+
+    def test_move_towards_frontier(self):
+        self.mars.set_agent(self.rover, self.rover_location)
+        for x in range(-1, 2):
+            for y in range(-1, 2):
+                self.mars.get_exploration_map().observe(x, y, False)
+        self.rover._Rover__move_towards_frontier(self.mars)
+        self.assertNotEqual(self.rover.get_location(), self.rover_location)
+        self.assertTrue(self.mars.get_exploration_map().is_explored(
+            self.rover.get_location().get_x(), self.rover.get_location().get_y()))
+
+    def test_act_heads_for_rock_within_sensing_radius(self):
+        original_radius = Config.rover_sensing_radius
+        Config.rover_sensing_radius = 3
+        try:
+            self.mars.set_agent(self.rover, self.rover_location)
+            rock_location = Location(3, 0)
+            self.mars.set_agent(Rock(rock_location), rock_location)
+            self.rover.act(self.mars)
+        finally:
+            Config.rover_sensing_radius = original_radius
+        self.assertEqual(self.rover._Rover__target_location, rock_location)
+        self.assertEqual(self.rover.get_location(), Location(1, 0))
+
     def test_pick_up_rock(self):
         rock_location = Location(2, 2)
         rock = Rock(rock_location)
@@ -155,7 +188,7 @@ class TestRover(unittest.TestCase):
     def test_get_remembered_rock_locations(self):
         rover = Rover(Location(0, 0), Location(0, 0))
         rock_location = Location(1, 1)
-        rover._Rover__remembered_rock_locations.append(rock_location)
+        rover._Rover__remembered_rock_locations.remember(rock_location)
         remembered_locations = rover.get_remembered_rock_locations()
         self.assertEqual(len(remembered_locations), 1)
         self.assertEqual(remembered_locations[0], rock_location)
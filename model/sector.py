@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import List
+
+
+class Sector:
+    """
+    Represents a vertical strip of the map assigned to a rover as its home sector.
+
+    Attributes:
+        __x_start (int): The first column of the sector.
+        __x_end (int): The column after the last column of the sector.
+    """
+
+    def __init__(self, x_start: int, x_end: int) -> None:
+        """
+        Initialise the Sector object.
+
+        Args:
+            x_start (int): The first column of the sector.
+            x_end (int): The column after the last column of the sector.
+        """
+        self.__x_start = x_start
+        self.__x_end = x_end
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both sectors cover the same columns."""
+        if not isinstance(other, Sector):
+            return NotImplemented
+        return self.__x_start == other.__x_start and self.__x_end == other.__x_end
+
+    def __repr__(self) -> str:
+        """Return a string representation of the sector."""
+        return f"Sector({self.__x_start}, {self.__x_end})"
+
+    def get_x_start(self) -> int:
+        """Get the first column of the sector."""
+        return self.__x_start
+
+    def get_x_end(self) -> int:
+        """Get the column after the last column of the sector."""
+        return self.__x_end
+
+    def contains(self, x: int) -> bool:
+        """
+        Check if a column lies within the sector.
+
+        Args:
+            x (int): The column to check.
+
+        Returns:
+            bool: True if the column is part of the sector, False otherwise.
+        """
+        return self.__x_start <= x < self.__x_end
+
+    @staticmethod
+    def partition(column_weights: List[float], count: int) -> List[Sector]:
+        """
+        Split the map into contiguous strips of roughly equal total weight.
+
+        Args:
+            column_weights (List[float]): The weight of every column, e.g. the number of rocks expected in it.
+            count (int): The number of strips to create.
+
+        Returns:
+            List[Sector]: The strips from left to right; fewer than count if there are fewer columns.
+        """
+        width = len(column_weights)
+        count = min(count, width)
+        if count <= 0:
+            return []
+        total = sum(column_weights)
+        if total <= 0:
+            column_weights = [1.0] * width
+            total = float(width)
+        sectors = []
+        x_start = 0
+        cumulative = 0.0
+        for x, weight in enumerate(column_weights):
+            cumulative += weight
+            remaining_sectors = count - len(sectors) - 1
+            remaining_columns = width - x - 1
+            if remaining_sectors == 0:
+                break
+            reached_share = cumulative >= total * (len(sectors) + 1) / count
+            if remaining_columns == remaining_sectors or reached_share:
+                sectors.append(Sector(x_start, x + 1))
+                x_start = x + 1
+        sectors.append(Sector(x_start, width))
+        return sectors
@@ -0,0 +1,40 @@
+import unittest
+from model.sector import Sector
+
+
+class TestSector(unittest.TestCase):
+
+    def test_contains(self):
+        sector = Sector(2, 5)
+        self.assertTrue(sector.contains(2))
+        self.assertTrue(sector.contains(4))
+        self.assertFalse(sector.contains(5))
+
+    def test_partition_uniform_weights(self):
+        sectors = Sector.partition([1.0] * 10, 2)
+        self.assertEqual(sectors, [Sector(0, 5), Sector(5, 10)])
+
+    def test_partition_follows_weights(self):
+        sectors = Sector.partition([10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 10.0], 2)
+        self.assertEqual(sectors, [Sector(0, 1), Sector(1, 8)])
+
+    def test_partition_covers_every_column(self):
+        sectors = Sector.partition([0.5, 3.0, 0.0, 1.0, 2.0, 0.0, 0.0], 4)
+        self.assertEqual(len(sectors), 4)
+        self.assertEqual(sectors[0].get_x_start(), 0)
+        self.assertEqual(sectors[-1].get_x_end(), 7)
+        for left, right in zip(sectors, sectors[1:]):
+            self.assertEqual(left.get_x_end(), right.get_x_start())
+            self.assertLess(left.get_x_start(), left.get_x_end())
+
+    def test_partition_more_strips_than_columns(self):
+        sectors = Sector.partition([1.0, 1.0], 5)
+        self.assertEqual(sectors, [Sector(0, 1), Sector(1, 2)])
+
+    def test_partition_zero_weights(self):
+        sectors = Sector.partition([0.0] * 4, 2)
+        self.assertEqual(sectors, [Sector(0, 2), Sector(2, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,15 @@
 from __future__ import annotations
-import random
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from itertools import combinations
 from model.agent import Agent
+from model.intent import Intent
 from model.rover import Rover
 from model.rock import Rock
+from model.sector import Sector
+from controller.config import Config
 
 if TYPE_CHECKING:
+    from controller.rollout_planner import RolloutPlanner
     from model.location import Location
     from model.mars import Mars
 
@@ -19,7 +22,13 @@ class Spacecraft(Agent):
         __collected_rocks (List[Rock]): A list of rocks collected by the spacecraft.
         __remembered_rock_locations (List[Location]): A list of remembered locations of rocks.
         __assigned_rovers (dict[Rover, Location]): A dictionary mapping rovers to their assigned locations.
+        __fleet_ids (tuple[int, ...]): The IDs of the live rovers the current sectors were computed for.
+        __total_rocks_delivered (int): The number of rocks delivered so far, including those spent on new rovers.
+        __planner (Optional[RolloutPlanner]): Chooses among the available targets of a docked rover, if set.
     """
+    __slots__ = ("__collected_rocks", "__remembered_rock_locations", "__assigned_rovers", "__fleet_ids",
+                 "__total_rocks_delivered", "__planner")
+    TYPE_CODE = 1
 
     def __init__(self, location: Location):
         """
@@ -32,6 +41,22 @@ class Spacecraft(Agent):
         self.__collected_rocks: List[Rock] = []
         self.__remembered_rock_locations: List[Location] = []
         self.__assigned_rovers: dict[Rover, Location] = {}
+        self.__fleet_ids: tuple[int, ...] = ()
+        self.__total_rocks_delivered = 0
+        self.__planner: Optional[RolloutPlanner] = None
+
+    def clone(self) -> Spacecraft:
+        """
+        Copy the spacecraft with its own rocks, remembered locations and assignments.
+
+        Returns:
+            Spacecraft: The copy.
+        """
+        spacecraft = super().clone()
+        spacecraft.__collected_rocks = list(self.__collected_rocks)
+        spacecraft.__remembered_rock_locations = list(self.__remembered_rock_locations)
+        spacecraft.__assigned_rovers = dict(self.__assigned_rovers)
+        return spacecraft
 
     def __str__(self) -> str:
         """
@@ -43,6 +68,33 @@ class Spacecraft(Agent):
         return (f"Spacecraft is located at: ({repr(self.get_location())})"
                 f" rocks collected")
 
+    def get_total_rocks_delivered(self) -> int:
+        """
+        Get the number of rocks delivered by rovers so far.
+
+        Returns:
+            int: The number of rocks delivered, including those already spent on new rovers.
+        """
+        return self.__total_rocks_delivered
+
+    def get_pending_target_count(self) -> int:
+        """
+        Get the number of rock locations reported by rovers that are not assigned to a rover yet.
+
+        Returns:
+            int: The number of pending target locations.
+        """
+        return len(self.__remembered_rock_locations)
+
+    def set_planner(self, planner: Optional[RolloutPlanner]) -> None:
+        """
+        Let a planner choose the targets of docked rovers instead of taking the first available one.
+
+        Args:
+            planner (Optional[RolloutPlanner]): The planner, or None to assign the first available target.
+        """
+        self.__planner = planner
+
     def act(self, mars: Mars) -> None:
         """
         Perform actions for the spacecraft agent in the simulation.
@@ -50,16 +102,12 @@ class Spacecraft(Agent):
         Args:
             mars (Mars): The Mars environment.
         """
+        mars.submit(Intent(self, Intent.ASSIGN_SECTORS))
         found_rovers = self.__scan_for_rovers_in_adjacent_cells(mars)
         if found_rovers:
             for rover in found_rovers:
                 if rover.has_rock():
-                    self.__collect_rock_from_rover(rover)
-                    rover.get_remembered_rock_locations()
-                    rover.recharge(100.0)
-                    self.__assign_target_location_to_rover(rover)
-                    print(f"Spacecraft collected a rock from rover {rover.get_id()}. "
-                          f"Total rocks collected: {len(self.__collected_rocks)}")
+                    mars.submit(Intent(self, Intent.DOCK, other=rover))
         # if len(self.__collected_rocks) >= 30:
         #     # Reason to have thirty is because it already means it has collected rocks in the surroundings
         #     print(f"SpaceCraft at {self.get_location()} has collected 30 or more rocks. Initiating collaboration.")
@@ -71,6 +119,31 @@ class Spacecraft(Agent):
         if len(self.__collected_rocks) >= 100:
             self.__create_new_rover(mars)
 
+    def __update_sectors(self, mars: Mars) -> None:
+        """
+        Split the map into one strip per live rover, rebalancing whenever rovers are destroyed or created.
+
+        Strips are weighted by the number of rocks each column is expected to hold, from the rocks seen so
+        far and the cells that have not been explored yet.
+
+        Args:
+            mars (Mars): The Mars environment.
+        """
+        live_rovers = sorted((rover for rover in mars.get_all_rovers() if not rover.is_destroyed()),
+                             key=lambda rover: rover.get_id())
+        fleet_ids = tuple(rover.get_id() for rover in live_rovers)
+        if fleet_ids == self.__fleet_ids:
+            return
+        self.__fleet_ids = fleet_ids
+        if not live_rovers:
+            return
+
+        expected_rock_density = Config.rock_creation_probability - Config.alien_creation_probability
+        column_weights = mars.get_exploration_map().get_column_weights(expected_rock_density)
+        sectors = Sector.partition(column_weights, len(live_rovers))
+        for index, rover in enumerate(live_rovers):
+            rover.set_home_sector(sectors[index % len(sectors)])
+
     def __scan_for_rovers_in_adjacent_cells(self, mars: Mars) -> List[Rover]:
         """
         Scan adjacent cells for rovers.
@@ -84,9 +157,8 @@ class Spacecraft(Agent):
         adjacent_locations = mars.get_adjacent_locations(self.get_location())
         found_rovers = []
         for adjacent_location in adjacent_locations:
-            agent = mars.get_agent(adjacent_location)
-            if isinstance(agent, Rover):
-                found_rovers.append(agent)
+            if mars.get_type_code(adjacent_location) == Rover.TYPE_CODE:
+                found_rovers.append(mars.get_agent(adjacent_location))
         return found_rovers
 
     def __collect_rock_from_rover(self, rover: Rover) -> None:
@@ -99,6 +171,7 @@ class Spacecraft(Agent):
         rock = rover.get_rock()
         if rock:
             self.__collected_rocks.append(rock)  # Store the rock in the spacecraft
+            self.__total_rocks_delivered += 1
             rover.drop_rock()  # Drop the rock from the rover
             self.__receive_rock_locations(rover.get_remembered_rock_locations())
 
@@ -109,37 +182,52 @@ class Spacecraft(Agent):
         Args:
             rock_locations (List[Location]): A list of rock locations.
         """
+        known_locations = set(self.__remembered_rock_locations)
+        known_locations.update(self.__assigned_rovers.values())
         for location in rock_locations:
-            if location not in self.__remembered_rock_locations and location not in self.__assigned_rovers.values():
+            if location not in known_locations:
+                known_locations.add(location)
                 self.__remembered_rock_locations.append(location)
         # Remove already assigned target locations
         self.__remove_assigned_locations()
 
     def __remove_assigned_locations(self) -> None:
         """Remove assigned target locations."""
+        assigned_locations = set(self.__assigned_rovers.values())
         self.__remembered_rock_locations = [location for location in self.__remembered_rock_locations if
-                                            location not in self.__assigned_rovers.values()]
+                                            location not in assigned_locations]
 
-    def __assign_target_location_to_rover(self, rover: Rover) -> None:
+    def __assign_target_location_to_rover(self, rover: Rover, mars: Optional[Mars] = None) -> None:
         """
         Assign a target location to a rover.
 
         Args:
             rover (Rover): The rover to assign the target location to.
+            mars (Optional[Mars]): The Mars environment, for the planner to look ahead in; without it the first
+                available target is assigned.
         """
         if rover in self.__assigned_rovers:
             target_location = self.__assigned_rovers[rover]
             if target_location in self.__remembered_rock_locations:
                 return  # Rover is already assigned a valid target location
 
-        # Find the first available remembered rock location
-        for location in self.__remembered_rock_locations:
-            if location not in self.__assigned_rovers.values():
-                self.__assigned_rovers[rover] = location
-                rover.set_target_location(location)
-                self.__remembered_rock_locations.remove(location)
-                # print(f"Rover {rover.get_id()} assigned to target location: {location}")
-                break
+        # Find the first available remembered rock location, preferring the rover's home sector
+        assigned_locations = set(self.__assigned_rovers.values())
+        available_locations = [location for location in self.__remembered_rock_locations
+                               if location not in assigned_locations]
+        if not available_locations:
+            return
+        home_sector = rover.get_home_sector()
+        location = available_locations[0]
+        if home_sector is not None:
+            location = next((candidate for candidate in available_locations if home_sector.contains(candidate.get_x())),
+                            location)
+        if self.__planner is not None and mars is not None and len(available_locations) > 1:
+            location = self.__planner.choose(mars, rover, available_locations, location, self.get_location())
+        self.__assigned_rovers[rover] = location
+        rover.set_target_location(location)
+        self.__remembered_rock_locations.remove(location)
+        # print(f"Rover {rover.get_id()} assigned to target location: {location}")
 
     def __create_new_rover(self, mars: Mars) -> None:
         """
@@ -150,11 +238,35 @@ class Spacecraft(Agent):
         """
         free_locations = mars.get_free_adjacent_locations(self.get_location())
         if free_locations:
-            new_location = random.choice(free_locations)
+            mars.submit(Intent(self, Intent.CREATE_ROVER, options=free_locations))
+
+    def apply_intent(self, mars: Mars, intent: Intent) -> None:
+        """
+        Carry out an intent the spacecraft submitted while acting.
+
+        Args:
+            mars (Mars): The Mars environment.
+            intent (Intent): The intent to carry out.
+        """
+        kind = intent.get_kind()
+        if kind == Intent.ASSIGN_SECTORS:
+            self.__update_sectors(mars)
+        elif kind == Intent.DOCK:
+            rover = intent.get_other()
+            self.__collect_rock_from_rover(rover)
+            rover.recharge(100.0)
+            self.__assign_target_location_to_rover(rover, mars)
+            print(f"Spacecraft collected a rock from rover {rover.get_id()}. "
+                  f"Total rocks collected: {len(self.__collected_rocks)}")
+        elif kind == Intent.CREATE_ROVER:
+            new_location = intent.get_location()
             new_rover = Rover(new_location, self.get_location())
             mars.set_agent(new_rover, new_location)
+            mars.add_rover(new_rover)
             self.__collected_rocks = self.__collected_rocks[100:]  # Remove the first 100 collected rocks
             print(f"New rover created at location {new_location}")
+        else:
+            super().apply_intent(mars, intent)
 
     @staticmethod
     def find_common_adjacent_rock_locations(rovers: List[Rover], mars: Mars) -> List[Location]:
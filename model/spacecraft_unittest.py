@@ -4,6 +4,7 @@ from model.location import Location
 from model.mars import Mars
 from model.rover import Rover
 from model.rock import Rock
+from model.sector import Sector
 
 
 class TestSpacecraft(unittest.TestCase):
@@ -23,6 +24,7 @@ class TestSpacecraft(unittest.TestCase):
         assert self.spacecraft._Spacecraft__collect_rock_from_rover(rover) is None
         assert rock in self.spacecraft._Spacecraft__collected_rocks
         assert rover.get_rock() is None
+        assert self.spacecraft.get_total_rocks_delivered() == 1
 
     def test_receive_rock_locations(self):
         remembered_rock_locations = [Location(1, 1), Location(2, 2), Location(3, 3)]
@@ -66,6 +68,40 @@ class TestSpacecraft(unittest.TestCase):
 
         assert self.mars.get_agent(Location(0, 1)) is not None
 
+    def test_update_sectors(self):
+        rovers = [Rover(Location(1, i), self.spacecraft_location) for i in range(4)]
+        for rover in rovers:
+            self.mars.add_rover(rover)
+
+        self.spacecraft._Spacecraft__update_sectors(self.mars)
+
+        sectors = sorted({(rover.get_home_sector().get_x_start(), rover.get_home_sector().get_x_end())
+                          for rover in rovers})
+        self.assertEqual(len(sectors), 4)
+        self.assertEqual(sectors[0][0], 0)
+        self.assertEqual(sectors[-1][1], self.mars.get_width())
+
+    def test_update_sectors_rebalances_after_rover_destroyed(self):
+        rovers = [Rover(Location(1, i), self.spacecraft_location) for i in range(2)]
+        for rover in rovers:
+            self.mars.add_rover(rover)
+        self.spacecraft._Spacecraft__update_sectors(self.mars)
+
+        rovers[1].sustain_damage(100)
+        self.spacecraft._Spacecraft__update_sectors(self.mars)
+
+        self.assertEqual(rovers[0].get_home_sector().get_x_start(), 0)
+        self.assertEqual(rovers[0].get_home_sector().get_x_end(), self.mars.get_width())
+
+    def test_assign_target_location_prefers_home_sector(self):
+        rover = Rover(Location(4, 4), self.spacecraft_location)
+        rover.set_home_sector(Sector(10, 20))
+        self.spacecraft._Spacecraft__remembered_rock_locations = [Location(1, 1), Location(12, 3)]
+
+        self.spacecraft._Spacecraft__assign_target_location_to_rover(rover)
+
+        self.assertEqual(self.spacecraft._Spacecraft__assigned_rovers[rover], Location(12, 3))
+
     def test_scan_for_rovers_in_adjacent_cells(self):
         adjacent_location = Location(1, 0)
         rover = Rover(adjacent_location, self.spacecraft_location)
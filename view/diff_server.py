@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Tuple, TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
+
+from view.image_writer import ImageWriter
+
+if TYPE_CHECKING:
+    from model.environment import Environment
+
+
+class DiffStream:
+    """
+    Per-step cell diffs of an environment, encoded for streaming to remote viewers.
+
+    Every recorded step becomes one message holding the changed cell indices, delta encoded as varints, and
+    their new type codes. Keyframes hold the whole grid run-length encoded. A client rebuilds the view from a
+    keyframe and then applies every message after it, so the cost per step grows with the number of changed
+    cells rather than with the map size. Messages carry absolute codes, so applying a message twice is
+    harmless, e.g. when a keyframe was taken while a step was still in progress.
+
+    Message layout, all numbers unsigned LEB128 varints:
+        keyframe: width, height, step, then (run length, code byte) pairs until the grid is full.
+        diff: step, count, count index deltas (the first relative to 0), then count code bytes.
+
+    Attributes:
+        __environment (Environment): The environment being streamed.
+        __dirty_cells (Set[int]): The cells changed since the last recorded step.
+        __messages (Deque[Tuple[int, bytes]]): The most recent diff messages and their steps.
+        __step (int): The last recorded step.
+        __lock (threading.Lock): Guards the messages against concurrent readers.
+    """
+    RUN_PATTERN = re.compile(rb"(.)\1*", re.DOTALL)
+
+    def __init__(self, environment: Environment, history: int = 1024) -> None:
+        """
+        Initialise the DiffStream object.
+
+        Args:
+            environment (Environment): The environment to stream.
+            history (int): The number of diff messages kept for clients that fall behind.
+        """
+        self.__environment = environment
+        self.__dirty_cells = environment.track_dirty_cells()
+        self.__messages: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self.__step = 0
+        self.__lock = threading.Lock()
+
+    def get_environment(self) -> Environment:
+        """Get the environment being streamed."""
+        return self.__environment
+
+    def get_step(self) -> int:
+        """Get the last recorded step."""
+        return self.__step
+
+    def record(self, step: int) -> None:
+        """
+        Encode the cells changed since the previous call as the diff message of a step.
+
+        Args:
+            step (int): The step that has just been simulated.
+        """
+        indices = sorted(self.__dirty_cells)
+        self.__dirty_cells.clear()
+        type_codes = self.__environment.get_type_codes()
+        message = bytearray()
+        DiffStream.__write_varint(message, step)
+        DiffStream.__write_varint(message, len(indices))
+        previous = 0
+        for index in indices:
+            DiffStream.__write_varint(message, index - previous)
+            previous = index
+        message += bytes(type_codes[index] for index in indices)
+        with self.__lock:
+            self.__messages.append((step, bytes(message)))
+            self.__step = step
+
+    def get_keyframe(self) -> bytes:
+        """Encode the whole grid, run-length encoded, at the last recorded step."""
+        with self.__lock:
+            step = self.__step
+            type_codes = bytes(self.__environment.get_type_codes())
+        message = bytearray()
+        DiffStream.__write_varint(message, self.__environment.get_width())
+        DiffStream.__write_varint(message, self.__environment.get_height())
+        DiffStream.__write_varint(message, step)
+        for run in DiffStream.RUN_PATTERN.finditer(type_codes):
+            DiffStream.__write_varint(message, run.end() - run.start())
+            message.append(type_codes[run.start()])
+        return bytes(message)
+
+    def get_diffs_since(self, step: int) -> Tuple[bool, bytes]:
+        """
+        Get the diff messages of every step after a given step.
+
+        Args:
+            step (int): The last step the client has applied.
+
+        Returns:
+            Tuple[bool, bytes]: Whether the client can catch up from the kept history, and the concatenated
+            messages. If it cannot, it needs a new keyframe.
+        """
+        with self.__lock:
+            if step == self.__step:
+                return True, b""
+            if step > self.__step or not self.__messages or self.__messages[0][0] > step + 1:
+                return False, b""
+            return True, b"".join(message for message_step, message in self.__messages if message_step > step)
+
+    @staticmethod
+    def decode_keyframe(data: bytes) -> Tuple[int, int, int, bytearray]:
+        """
+        Decode a keyframe.
+
+        Args:
+            data (bytes): The keyframe as returned by get_keyframe.
+
+        Returns:
+            Tuple[int, int, int, bytearray]: The width, height, step and type codes of the grid.
+        """
+        width, position = DiffStream.read_varint(data, 0)
+        height, position = DiffStream.read_varint(data, position)
+        step, position = DiffStream.read_varint(data, position)
+        runs = []
+        while position < len(data):
+            length, position = DiffStream.read_varint(data, position)
+            runs.append(bytes((data[position],)) * length)
+            position += 1
+        return width, height, step, bytearray(b"".join(runs))
+
+    @staticmethod
+    def apply_diffs(data: bytes, type_codes: bytearray) -> int:
+        """
+        Apply concatenated diff messages to a grid.
+
+        Args:
+            data (bytes): The messages as returned by get_diffs_since.
+            type_codes (bytearray): The grid to update in place.
+
+        Returns:
+            int: The step of the last applied message, or -1 if there were none.
+        """
+        position, step = 0, -1
+        while position < len(data):
+            step, position = DiffStream.read_varint(data, position)
+            count, position = DiffStream.read_varint(data, position)
+            indices: List[int] = []
+            index = 0
+            for _ in range(count):
+                delta, position = DiffStream.read_varint(data, position)
+                index += delta
+                indices.append(index)
+            for index, code in zip(indices, data[position:position + count]):
+                type_codes[index] = code
+            position += count
+        return step
+
+    @staticmethod
+    def read_varint(data: bytes, position: int) -> Tuple[int, int]:
+        """
+        Read an unsigned LEB128 varint.
+
+        Args:
+            data (bytes): The encoded data.
+            position (int): The offset of the varint.
+
+        Returns:
+            Tuple[int, int]: The value and the offset just after it.
+        """
+        value, shift = 0, 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, position
+            shift += 7
+
+    @staticmethod
+    def __write_varint(message: bytearray, value: int) -> None:
+        """Append an unsigned LEB128 varint to a message."""
+        while value >= 0x80:
+            message.append((value & 0x7F) | 0x80)
+            value >>= 7
+        message.append(value)
+
+
+class DiffRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the browser client, keyframes and diffs of a DiffServer.
+
+    Routes:
+        /: The browser client.
+        /keyframe: The current keyframe.
+        /diffs?since=N: The diffs after step N, or 410 Gone if the client must fetch a new keyframe.
+    """
+    server: DiffServer
+
+    def do_GET(self) -> None:
+        """Handle a GET request."""
+        url = urlparse(self.path)
+        stream = self.server.get_stream()
+        if url.path == "/":
+            self.__send(200, "text/html; charset=utf-8", self.server.get_client_page().encode("utf-8"))
+        elif url.path == "/keyframe":
+            self.__send(200, "application/octet-stream", stream.get_keyframe())
+        elif url.path == "/diffs":
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+            except ValueError:
+                self.__send(400, "text/plain", b"since must be a step number")
+                return
+            available, diffs = stream.get_diffs_since(since)
+            if available:
+                self.__send(200, "application/octet-stream", diffs)
+            else:
+                self.__send(410, "text/plain", b"history exceeded, fetch a new keyframe")
+        else:
+            self.__send(404, "text/plain", b"not found")
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep request logging out of the simulation output."""
+
+    def __send(self, status: int, content_type: str, body: bytes) -> None:
+        """Send a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class DiffServer(ThreadingHTTPServer):
+    """
+    Loopback-only HTTP server streaming a DiffStream to remote viewers, e.g. through an SSH tunnel.
+
+    The simulator only records diffs; encoding keyframes and answering clients happens on the server threads.
+
+    Attributes:
+        __stream (DiffStream): The stream being served.
+        __client_page (str): The browser client, with the agent colours filled in.
+        __thread (threading.Thread): The thread running the server.
+    """
+    HOST = "127.0.0.1"
+    CLIENT_PAGE = """<!DOCTYPE html>
+<html><head><title>Mars Simulation</title></head>
+<body style="margin:0;background:#222;color:#ddd;font-family:monospace">
+<div id="status">connecting</div><canvas id="world" style="image-rendering:pixelated;width:100vmin"></canvas>
+<script>
+const palette = __PALETTE__;
+let width = 0, height = 0, step = 0, codes = null, image = null;
+const canvas = document.getElementById("world"), context = canvas.getContext("2d");
+function varint(data, position) {
+  let value = 0, shift = 0, byte;
+  do { byte = data[position++]; value += (byte & 127) * 2 ** shift; shift += 7; } while (byte >= 128);
+  return [value, position];
+}
+function paint(index) {
+  const colour = palette[codes[index]] || [255, 0, 255];
+  image.data.set([colour[0], colour[1], colour[2], 255], index * 4);
+}
+async function keyframe() {
+  const data = new Uint8Array(await (await fetch("keyframe")).arrayBuffer());
+  let position = 0, index = 0, length;
+  [width, position] = varint(data, position);
+  [height, position] = varint(data, position);
+  [step, position] = varint(data, position);
+  canvas.width = width; canvas.height = height;
+  codes = new Uint8Array(width * height);
+  image = context.createImageData(width, height);
+  while (position < data.length) {
+    [length, position] = varint(data, position);
+    codes.fill(data[position++], index, index + length);
+    index += length;
+  }
+  for (let cell = 0; cell < codes.length; cell++) paint(cell);
+}
+async function poll() {
+  const response = await fetch("diffs?since=" + step);
+  if (response.status === 410) { await keyframe(); return; }
+  const data = new Uint8Array(await response.arrayBuffer());
+  let position = 0;
+  while (position < data.length) {
+    let count, delta, index = 0;
+    [step, position] = varint(data, position);
+    [count, position] = varint(data, position);
+    const indices = [];
+    for (let i = 0; i < count; i++) { [delta, position] = varint(data, position); index += delta; indices.push(index); }
+    for (let i = 0; i < count; i++) { codes[indices[i]] = data[position + i]; paint(indices[i]); }
+    position += count;
+  }
+}
+async function loop() {
+  try { if (codes === null) await keyframe(); else await poll(); context.putImageData(image, 0, 0); }
+  catch (error) { codes = null; }
+  document.getElementById("status").textContent = codes === null ? "disconnected" : "step " + step;
+  setTimeout(loop, codes === null ? 1000 : 100);
+}
+loop();
+</script></body></html>
+"""
+
+    def __init__(self, stream: DiffStream, agent_colours: dict, port: int = 0) -> None:
+        """
+        Initialise the DiffServer object and bind it to the loopback interface.
+
+        Args:
+            stream (DiffStream): The stream to serve.
+            agent_colours (dict): A dictionary mapping agent classes to their corresponding colors, as used by the GUI.
+            port (int): The port to listen on, 0 to pick a free one.
+        """
+        super().__init__((DiffServer.HOST, port), DiffRequestHandler)
+        self.daemon_threads = True
+        self.__stream = stream
+        palette = {(agent_class.TYPE_CODE if agent_class else 0): ImageWriter.parse_colour(colour)
+                   for agent_class, colour in agent_colours.items()}
+        self.__client_page = DiffServer.CLIENT_PAGE.replace("__PALETTE__", json.dumps(palette))
+        self.__thread = threading.Thread(target=self.serve_forever, args=(0.1,), daemon=True)
+
+    def get_stream(self) -> DiffStream:
+        """Get the stream being served."""
+        return self.__stream
+
+    def get_client_page(self) -> str:
+        """Get the browser client page."""
+        return self.__client_page
+
+    def get_port(self) -> int:
+        """Get the port the server listens on."""
+        return self.server_address[1]
+
+    def start(self) -> None:
+        """Start serving on a background thread."""
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self.__thread.is_alive():
+            self.shutdown()
+            self.__thread.join()
+        self.server_close()
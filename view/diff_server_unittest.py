@@ -0,0 +1,98 @@
+import unittest
+import urllib.error
+import urllib.request
+from model.alien import Alien
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+from view.diff_server import DiffServer, DiffStream
+
+
+AGENT_COLOURS = {Spacecraft: "red", Rover: "blue", Alien: "green", Rock: "black", None: "white"}
+
+
+class TestDiffStream(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.mars.set_agent(Rock(Location(3, 4)), Location(3, 4))
+        self.stream = DiffStream(self.mars, history=3)
+
+    def test_keyframe_round_trip(self):
+        width, height, step, type_codes = DiffStream.decode_keyframe(self.stream.get_keyframe())
+        self.assertEqual((width, height, step), (self.mars.get_width(), self.mars.get_height(), 0))
+        self.assertEqual(type_codes, self.mars.get_type_codes())
+
+    def test_keyframe_plus_diffs_rebuilds_grid(self):
+        _, _, step, type_codes = DiffStream.decode_keyframe(self.stream.get_keyframe())
+        self.mars.set_agent(None, Location(3, 4))
+        self.mars.set_agent(Alien(Location(0, 0)), Location(0, 0))
+        self.stream.record(1)
+        self.mars.set_agent(Rock(Location(300, 1)), Location(300, 1))
+        self.stream.record(2)
+
+        available, diffs = self.stream.get_diffs_since(step)
+        self.assertTrue(available)
+        self.assertEqual(DiffStream.apply_diffs(diffs, type_codes), 2)
+        self.assertEqual(type_codes, self.mars.get_type_codes())
+
+    def test_diff_size_follows_changes(self):
+        self.mars.set_agent(Alien(Location(5, 0)), Location(5, 0))
+        self.stream.record(1)
+        _, diffs = self.stream.get_diffs_since(0)
+        # Step, count, one index delta and one code
+        self.assertEqual(len(diffs), 4)
+
+    def test_client_beyond_history_needs_keyframe(self):
+        for step in range(1, 6):
+            self.stream.record(step)
+        self.assertEqual(self.stream.get_diffs_since(1), (False, b""))
+        self.assertTrue(self.stream.get_diffs_since(2)[0])
+        self.assertEqual(self.stream.get_diffs_since(5), (True, b""))
+
+    def test_varint(self):
+        self.assertEqual(DiffStream.read_varint(bytes((0xAC, 0x02)), 0), (300, 2))
+
+
+class TestDiffServer(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.stream = DiffStream(self.mars)
+        self.server = DiffServer(self.stream, AGENT_COLOURS, port=0)
+        self.server.start()
+        self.url = f"http://{DiffServer.HOST}:{self.server.get_port()}"
+
+    def tearDown(self):
+        self.server.stop()
+
+    def fetch(self, path):
+        with urllib.request.urlopen(self.url + path, timeout=5) as response:
+            return response.read()
+
+    def test_serves_loopback_only(self):
+        self.assertEqual(self.server.server_address[0], "127.0.0.1")
+
+    def test_client_page(self):
+        self.assertIn(b"<canvas", self.fetch("/"))
+
+    def test_keyframe_and_diffs(self):
+        _, _, step, type_codes = DiffStream.decode_keyframe(self.fetch("/keyframe"))
+        self.mars.set_agent(Rock(Location(1, 1)), Location(1, 1))
+        self.stream.record(1)
+        DiffStream.apply_diffs(self.fetch(f"/diffs?since={step}"), type_codes)
+        self.assertEqual(type_codes, self.mars.get_type_codes())
+
+    def test_bad_requests(self):
+        for path, status in (("/diffs?since=x", 400), ("/diffs?since=7", 410), ("/missing", 404)):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.fetch(path)
+            self.assertEqual(context.exception.code, status)
+
+
+if __name__ == '__main__':
+    unittest.main()
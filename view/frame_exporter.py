@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import List, Optional, TYPE_CHECKING
+
+from view.image_writer import ImageWriter
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for animated GIFs
+    Image = None
+
+if TYPE_CHECKING:
+    from model.environment import Environment
+
+
+class FrameExporter:
+    """
+    Offscreen renderer that exports the world as a PNG sequence or an animated GIF, without Tk.
+
+    Frames are built from the occupancy grid with bytes operations only: every row of type codes is widened
+    by slice assignment, rows are repeated for the vertical scale, and bytes.translate maps the codes onto
+    each colour channel. When threaded, the simulation thread only copies the grid and a worker thread does
+    the conversion and file writing. At most QUEUE_FRAMES copies wait for the worker; when writing falls
+    further behind, capture blocks until a frame has been written, so memory stays bounded.
+
+    Animated GIFs are written in segments of at most GIF_SEGMENT_PIXELS pixels of frames, so memory stays
+    bounded however long the run: the first segment is frames.gif, later ones frames_001.gif, frames_002.gif
+    and so on.
+
+    Attributes:
+        __environment (Environment): The environment to export.
+        __directory (str): The directory the frames are written to.
+        __every (int): The number of steps between two exported frames.
+        __scale (int): The size of one cell in pixels.
+        __image_format (str): Either PNG or GIF.
+        __palette (List[int]): The RGB colour of every type code, flattened.
+        __channel_tables (List[bytes]): bytes.translate tables mapping type codes to red, green and blue.
+        __gif_frames (list): The frames collected for the current segment of the animated GIF.
+        __gif_segment_frames (int): The number of frames per segment of the animated GIF.
+        __gif_segment_count (int): The number of segments of the animated GIF written so far.
+        __queue (Optional[queue.Queue]): The frames waiting for the worker thread, at most QUEUE_FRAMES.
+        __worker (Optional[threading.Thread]): The worker thread, if threaded.
+        __frame_count (int): The number of frames captured so far.
+    """
+    PNG = "png"
+    GIF = "gif"
+    GIF_FRAME_DURATION = 100  # Milliseconds per frame of an animated GIF
+    GIF_SEGMENT_PIXELS = 64 * 2 ** 20  # Pixels of frames held in memory before a GIF segment is written
+    PNG_COMPRESSION = 1  # Fast zlib level; the flat colour areas of a frame compress well even so
+    QUEUE_FRAMES = 8  # Grid copies waiting for the worker thread before capture blocks
+
+    def __init__(self, environment: Environment, agent_colours: dict, directory: str, every: int = 1,
+                 scale: int = 1, image_format: str = PNG, threaded: bool = True) -> None:
+        """
+        Initialise the FrameExporter object.
+
+        Args:
+            environment (Environment): The environment to export.
+            agent_colours (dict): A dictionary mapping agent classes to their corresponding colors, as used by the GUI.
+            directory (str): The directory the frames are written to; created if missing.
+            every (int): The number of steps between two exported frames.
+            scale (int): The size of one cell in pixels.
+            image_format (str): Either PNG for a numbered PNG sequence or GIF for one animated GIF.
+            threaded (bool): Whether to convert and write frames on a worker thread.
+
+        Raises:
+            ValueError: If the format is unknown or every or scale is smaller than 1.
+            ImportError: If a GIF is requested but Pillow is not installed.
+        """
+        if image_format not in (FrameExporter.PNG, FrameExporter.GIF):
+            raise ValueError(f"Unknown frame format: {image_format}")
+        if every < 1 or scale < 1:
+            raise ValueError("Frame interval and scale must be at least 1")
+        if image_format == FrameExporter.GIF and Image is None:
+            raise ImportError("Exporting animated GIFs requires Pillow")
+
+        self.__environment = environment
+        self.__directory = directory
+        self.__every = every
+        self.__scale = scale
+        self.__image_format = image_format
+        self.__palette = [0] * 256 * 3
+        for agent_class, colour in agent_colours.items():
+            code = agent_class.TYPE_CODE if agent_class else 0
+            self.__palette[code * 3:code * 3 + 3] = ImageWriter.parse_colour(colour)
+        self.__channel_tables = [bytes(self.__palette[channel::3]) for channel in range(3)]
+        self.__gif_frames = []
+        frame_pixels = environment.get_width() * environment.get_height() * scale * scale
+        self.__gif_segment_frames = max(1, FrameExporter.GIF_SEGMENT_PIXELS // frame_pixels)
+        self.__gif_segment_count = 0
+        self.__frame_count = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self.__queue: Optional[queue.Queue] = None
+        self.__worker: Optional[threading.Thread] = None
+        if threaded:
+            self.__queue = queue.Queue(maxsize=FrameExporter.QUEUE_FRAMES)
+            self.__worker = threading.Thread(target=self.__work, daemon=True)
+            self.__worker.start()
+
+    def get_frame_count(self) -> int:
+        """Get the number of frames captured so far."""
+        return self.__frame_count
+
+    def capture(self, step: int) -> bool:
+        """
+        Export a frame if the step is due.
+
+        Args:
+            step (int): The current simulation step.
+
+        Returns:
+            bool: True if a frame was captured.
+        """
+        if step % self.__every != 0:
+            return False
+        codes = bytes(self.__environment.get_type_codes())
+        self.__frame_count += 1
+        if self.__queue is not None:
+            self.__queue.put((step, codes))
+        else:
+            self.__write(step, codes)
+        return True
+
+    def close(self) -> None:
+        """Wait for pending frames to be written and finish the animated GIF, if any."""
+        if self.__worker is not None:
+            self.__queue.put(None)
+            self.__worker.join()
+            self.__worker = None
+            self.__queue = None
+        self.__write_gif_segment()
+
+    def get_rgb(self, type_codes: bytes) -> bytes:
+        """
+        Convert an occupancy grid into scaled RGB pixel data.
+
+        Args:
+            type_codes (bytes): The type codes of the grid in row-major order.
+
+        Returns:
+            bytes: Three bytes per pixel in row-major order.
+        """
+        codes = self.__scale_codes(type_codes)
+        rgb = bytearray(len(codes) * 3)
+        for channel, table in enumerate(self.__channel_tables):
+            rgb[channel::3] = codes.translate(table)
+        return bytes(rgb)
+
+    def __scale_codes(self, type_codes: bytes) -> bytes:
+        """Enlarge every cell of the grid to a square of scale by scale pixels."""
+        scale = self.__scale
+        if scale == 1:
+            return bytes(type_codes)
+        width = self.__environment.get_width()
+        height = self.__environment.get_height()
+        rows: List[bytes] = []
+        wide = bytearray(width * scale)
+        for y in range(height):
+            row = type_codes[y * width:(y + 1) * width]
+            for offset in range(scale):
+                wide[offset::scale] = row
+            rows.append(bytes(wide) * scale)
+        return b"".join(rows)
+
+    def __write(self, step: int, type_codes: bytes) -> None:
+        """Convert one captured grid and write it out."""
+        width = self.__environment.get_width() * self.__scale
+        height = self.__environment.get_height() * self.__scale
+        if self.__image_format == FrameExporter.GIF:
+            # GIF frames keep the type codes as palette indices, so no RGB conversion is needed
+            frame = Image.frombytes("P", (width, height), self.__scale_codes(type_codes))
+            frame.putpalette(self.__palette)
+            self.__gif_frames.append(frame)
+            if len(self.__gif_frames) >= self.__gif_segment_frames:
+                self.__write_gif_segment()
+        else:
+            path = os.path.join(self.__directory, f"frame_{step:06d}.png")
+            ImageWriter.write_png(path, width, height, self.get_rgb(type_codes),
+                                  compression=FrameExporter.PNG_COMPRESSION)
+
+    def __write_gif_segment(self) -> None:
+        """Write the collected frames as the next segment of the animated GIF and forget them."""
+        if not self.__gif_frames:
+            return
+        name = "frames.gif" if self.__gif_segment_count == 0 else f"frames_{self.__gif_segment_count:03d}.gif"
+        self.__gif_frames[0].save(os.path.join(self.__directory, name), save_all=True,
+                                  append_images=self.__gif_frames[1:], duration=FrameExporter.GIF_FRAME_DURATION,
+                                  loop=0)
+        self.__gif_frames = []
+        self.__gif_segment_count += 1
+
+    def __work(self) -> None:
+        """Write queued frames until the sentinel None arrives."""
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                return
+            self.__write(*item)
@@ -0,0 +1,149 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+from model.alien import Alien
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+from view import frame_exporter
+from view.frame_exporter import FrameExporter
+from view.image_writer import ImageWriter
+
+
+AGENT_COLOURS = {Spacecraft: "red", Rover: "blue", Alien: "green", Rock: "black", None: "white"}
+
+
+def read_png(path):
+    """Decode an unfiltered 8-bit RGB PNG written by ImageWriter."""
+    with open(path, "rb") as file:
+        data = file.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position, chunks = 8, {}
+    while position < len(data):
+        length, = struct.unpack(">I", data[position:position + 4])
+        kind = data[position + 4:position + 8]
+        chunks[kind] = chunks.get(kind, b"") + data[position + 8:position + 8 + length]
+        position += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    stride = width * 3 + 1
+    pixels = b"".join(raw[row * stride + 1:(row + 1) * stride] for row in range(height))
+    return width, height, pixels
+
+
+class TestImageWriter(unittest.TestCase):
+
+    def test_parse_colour(self):
+        self.assertEqual(ImageWriter.parse_colour("red"), (255, 0, 0))
+        self.assertEqual(ImageWriter.parse_colour("#0080ff"), (0, 128, 255))
+        with self.assertRaises(ValueError):
+            ImageWriter.parse_colour("not a colour")
+
+    def test_write_png_rejects_wrong_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                ImageWriter.write_png(os.path.join(directory, "bad.png"), 2, 2, b"\x00" * 5)
+
+
+class TestFrameExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.mars.set_agent(Rock(Location(1, 0)), Location(1, 0))
+        self.mars.set_agent(Alien(Location(0, 1)), Location(0, 1))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_rgb_uses_agent_colours(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, threaded=False)
+        rgb = exporter.get_rgb(bytes(self.mars.get_type_codes()))
+        width = self.mars.get_width()
+        self.assertEqual(len(rgb), width * self.mars.get_height() * 3)
+        self.assertEqual(rgb[0:3], bytes((255, 255, 255)))
+        self.assertEqual(rgb[3:6], bytes((0, 0, 0)))
+        self.assertEqual(rgb[width * 3:width * 3 + 3], bytes((0, 255, 0)))
+
+    def test_scaled_png_frames(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, every=2, scale=3, threaded=False)
+        self.assertFalse(exporter.capture(1))
+        self.assertTrue(exporter.capture(2))
+        exporter.close()
+
+        width, height, pixels = read_png(os.path.join(self.directory.name, "frame_000002.png"))
+        self.assertEqual((width, height), (self.mars.get_width() * 3, self.mars.get_height() * 3))
+        # The rock at (1, 0) covers pixels 3 to 5 of the first three rows
+        for y in range(3):
+            for x in range(6):
+                expected = bytes((0, 0, 0)) if x >= 3 else bytes((255, 255, 255))
+                offset = (y * width + x) * 3
+                self.assertEqual(pixels[offset:offset + 3], expected)
+
+    def test_threaded_export_writes_every_frame(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, threaded=True)
+        for step in range(1, 6):
+            exporter.capture(step)
+        exporter.close()
+        self.assertEqual(exporter.get_frame_count(), 5)
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         [f"frame_{step:06d}.png" for step in range(1, 6)])
+
+    def test_threaded_queue_is_bounded(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, threaded=True)
+        self.assertEqual(exporter._FrameExporter__queue.maxsize, FrameExporter.QUEUE_FRAMES)
+        steps = range(1, 2 * FrameExporter.QUEUE_FRAMES + 2)
+        for step in steps:
+            exporter.capture(step)
+        exporter.close()
+        self.assertEqual(len(os.listdir(self.directory.name)), len(steps))
+
+    def test_captured_frame_is_a_snapshot(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, threaded=True)
+        exporter.capture(1)
+        self.mars.set_agent(None, Location(1, 0))
+        exporter.close()
+        _, _, pixels = read_png(os.path.join(self.directory.name, "frame_000001.png"))
+        self.assertEqual(pixels[3:6], bytes((0, 0, 0)))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, image_format="bmp")
+
+    @unittest.skipIf(frame_exporter.Image is None, "Pillow is not installed")
+    def test_animated_gif(self):
+        exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, image_format=FrameExporter.GIF)
+        exporter.capture(1)
+        # Identical consecutive frames are merged into one, so change the grid in between
+        self.mars.set_agent(Rover(Location(2, 2), Location(0, 0)), Location(2, 2))
+        exporter.capture(2)
+        exporter.close()
+        with frame_exporter.Image.open(os.path.join(self.directory.name, "frames.gif")) as image:
+            self.assertEqual(image.n_frames, 2)
+
+    @unittest.skipIf(frame_exporter.Image is None, "Pillow is not installed")
+    def test_long_gifs_are_written_in_segments(self):
+        # Two frames of the world per segment
+        with mock.patch.object(FrameExporter, "GIF_SEGMENT_PIXELS", 2 * self.mars.get_width() * self.mars.get_height()):
+            exporter = FrameExporter(self.mars, AGENT_COLOURS, self.directory.name, image_format=FrameExporter.GIF,
+                                     threaded=False)
+        for step in range(5):
+            self.mars.set_agent(Rover(Location(step, 5), Location(0, 0)), Location(step, 5))
+            exporter.capture(step)
+        exporter.close()
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["frames.gif", "frames_001.gif", "frames_002.gif"])
+        frame_counts = []
+        for name in sorted(os.listdir(self.directory.name)):
+            with frame_exporter.Image.open(os.path.join(self.directory.name, name)) as image:
+                frame_counts.append(image.n_frames)
+        self.assertEqual(frame_counts, [2, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import TYPE_CHECKING
+from typing import Callable, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from controller.config import Config
-from model.location import Location
+from view.viewport import Viewport
 
 if TYPE_CHECKING:
     from model.environment import Environment
@@ -18,9 +19,28 @@ class Gui(tk.Tk):
     Attributes:
         __environment (Environment): The environment instance to visualise.
         __agent_colours (dict): A dictionary mapping agent classes to their corresponding colors.
+        __code_colours (dict): A dictionary mapping occupancy grid type codes to their corresponding colors.
         __legend_panel (tk.Frame): The legend panel displaying agent types and their counts.
+        __legend_labels (dict): A dictionary mapping agent classes to the labels showing their counts.
+        __canvas (tk.Canvas): The single canvas the world is drawn on.
+        __viewport (Viewport): The visible part of the world, its zoom and level of detail.
+        __cells (List[int]): The canvas rectangle item of every visible cell or block, in row-major order.
+        __x_scrollbar (tk.Scrollbar): The scrollbar moving the view horizontally.
+        __y_scrollbar (tk.Scrollbar): The scrollbar moving the view vertically.
+        __drag_start (Optional[Tuple[int, int]]): The pixel a drag of the view continues from, if dragging.
+        __dirty_cells (Set[int]): The cells that changed since the last frame.
         __closed (bool): Flag indicating whether the GUI window is closed.
+        __step (Callable[[], bool]): Advances the simulation by one step and returns whether it continues.
+        __paused (bool): Flag indicating whether stepping is paused.
+        __finished (bool): Flag indicating whether the simulation has ended.
+        __step_count (int): The number of steps run so far.
+        __step_budget (float): The number of steps due according to the selected speed.
+        __last_tick (float): The time at which the step budget was last topped up.
+        __pause_button (tk.Button): The button pausing and resuming stepping.
+        __speed (tk.Scale): The slider selecting the number of steps per second.
+        __status_label (tk.Label): The label showing the step count and whether stepping is paused.
     """
+    SIMULATION_SLICE = 0.01  # Seconds of stepping per scheduler call, keeping the window responsive
 
     def __init__(self, environment: Environment, agent_colours: dict):
         """
@@ -33,42 +53,124 @@ class Gui(tk.Tk):
         super().__init__()
         self.__environment = environment
         self.__agent_colours = agent_colours
+        self.__code_colours = {(agent_class.TYPE_CODE if agent_class else 0): colour
+                               for agent_class, colour in agent_colours.items()}
         self.__legend_panel = None
+        self.__legend_labels = {}
+        self.__canvas = None
+        self.__viewport = None
+        self.__cells: List[int] = []
+        self.__x_scrollbar: Optional[tk.Scrollbar] = None
+        self.__y_scrollbar: Optional[tk.Scrollbar] = None
+        self.__drag_start: Optional[Tuple[int, int]] = None
+        self.__dirty_cells: Set[int] = environment.track_dirty_cells()
         self.__closed = False
+        self.__step: Optional[Callable[[], bool]] = None
+        self.__paused = False
+        self.__finished = False
+        self.__step_count = 0
+        self.__step_budget = 0.0
+        self.__last_tick = 0.0
+        self.__pause_button: Optional[tk.Button] = None
+        self.__speed: Optional[tk.Scale] = None
+        self.__status_label: Optional[tk.Label] = None
 
         self.__init_gui()
         self.__init_info()
         self.__init_world()
+        self.__init_controls()
 
     def render(self):
-        """Render the current state of the environment."""
-        self.update_legend()
-
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-
-        for row_index in range(self.__environment.get_height()):
-            row = []
-            for col_index in range(self.__environment.get_width()):
-                agent = self.__environment.get_agent(Location(col_index, row_index))
+        """Render the current state of the environment and process pending window events."""
+        self.__draw_frame()
+        self.update()
+        self.update_idletasks()
 
-                if agent:
-                    agent_colour = self.__agent_colours[agent.__class__]
-                else:
-                    agent_colour = self.__agent_colours[None]
+    def run(self, step: Callable[[], bool]) -> None:
+        """
+        Run the simulation under the Tk event loop until the window is closed.
 
-                cell = tk.Canvas(self.grid_frame,
-                                 width=40,
-                                 height=40,
-                                 bg=agent_colour,
-                                 borderwidth=1,
-                                 relief="solid")
+        The simulation is stepped at the speed selected in the window, independently of rendering. Frames
+        are drawn at most Config.max_fps times per second from the latest state, so any number of steps may
+        pass between two frames.
 
-                cell.grid(row=row_index, column=col_index)
-                row.append(cell)
+        Args:
+            step (Callable[[], bool]): Advances the simulation by one step and returns whether it continues.
+        """
+        self.__step = step
+        self.__last_tick = time.perf_counter()
+        self.after(0, self.__simulate)
+        self.after(0, self.__draw)
+        self.mainloop()
+
+    def __simulate(self):
+        """Run the steps that are due at the selected speed, then reschedule."""
+        if self.__closed or self.__finished:
+            return
+        now = time.perf_counter()
+        if not self.__paused:
+            steps_per_second = self.__speed.get()
+            self.__step_budget = min(self.__step_budget + (now - self.__last_tick) * steps_per_second,
+                                     max(steps_per_second, 1))
+            deadline = now + Gui.SIMULATION_SLICE
+            while self.__step_budget >= 1 and time.perf_counter() < deadline:
+                self.__step_budget -= 1
+                self.__run_step()
+                if self.__finished:
+                    return
+        self.__last_tick = now
+        self.after(1, self.__simulate)
+
+    def __run_step(self):
+        """Advance the simulation by one step."""
+        self.__step_count += 1
+        if not self.__step():
+            self.__finished = True
+            self.__draw_frame()
+
+    def __draw(self):
+        """Draw a frame from the latest state, then reschedule at the capped frame rate."""
+        if self.__closed:
+            return
+        self.__draw_frame()
+        if not self.__finished:
+            self.after(max(1, int(1000 / Config.max_fps)), self.__draw)
+
+    def __draw_frame(self):
+        """Recolour the cells that changed since the last frame and refresh the legend and status."""
+        self.update_legend()
 
-        self.update()
-        self.update_idletasks()
+        type_codes = self.__environment.get_type_codes()
+        if len(self.__dirty_cells) >= len(self.__cells):
+            items = range(len(self.__cells))
+        else:
+            items = {self.__viewport.get_item_of_cell(index) for index in self.__dirty_cells}
+            items.discard(None)
+        for item in items:
+            colour = self.__code_colours[self.__viewport.get_item_code(item, type_codes)]
+            self.__canvas.itemconfigure(self.__cells[item], fill=colour)
+        self.__dirty_cells.clear()
+
+        if self.__finished:
+            state = "finished"
+        elif self.__paused:
+            state = "paused"
+        else:
+            state = "running"
+        self.__status_label.configure(text=f"Step {self.__step_count} ({state})")
+
+    def toggle_pause(self):
+        """Pause or resume stepping the simulation."""
+        self.__paused = not self.__paused
+        self.__pause_button.configure(text="Resume" if self.__paused else "Pause")
+        self.__step_budget = 0.0
+        self.__draw_frame()
+
+    def single_step(self):
+        """Advance a paused simulation by exactly one step."""
+        if self.__step is not None and self.__paused and not self.__finished:
+            self.__run_step()
+            self.__draw_frame()
 
     def __init_gui(self):
         """Initialize GUI settings."""
@@ -76,63 +178,147 @@ class Gui(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def __init_info(self):
-        """Initialize the legend panel."""
+        """Initialize the legend panel with one colour swatch and count label per agent class."""
         self.legend_panel = tk.Frame(self)
         self.legend_panel.grid(row=0, column=0)
 
-    def __init_world(self):
-        """Initialize the world grid."""
-        self.grid_frame = tk.Frame(self)
-        self.grid_frame.grid(row=1, column=0)
-
-        for row_index in range(self.__environment.get_height()):
-            row = []
-            for col_index in range(self.__environment.get_width()):
-                agent = self.__environment.get_agent(Location(col_index, row_index))
-
-                if agent:
-                    agent_colour = self.__agent_colours[agent.__class__]
-                else:
-                    agent_colour = self.__agent_colours[None]
-
-                cell = tk.Canvas(self.grid_frame,
-                                 width=10,
-                                 height=10,
-                                 bg=agent_colour,
-                                 borderwidth=1,
-                                 relief="solid")
-
-                cell.grid(row=row_index, column=col_index)
-                row.append(cell)
-
-    def update_legend(self):
-        """Update the legend panel with agent counts."""
-        agent_counts = {}
-
-        # Iterate over all cells in the environment grid
-        for row_index in range(self.__environment.get_height()):
-            for col_index in range(self.__environment.get_width()):
-                agent = self.__environment.get_agent(Location(col_index, row_index))
-
-                # Count the occurrences of each type of agent
-                if agent:
-                    agent_class = agent.__class__
-                    agent_counts[agent_class] = agent_counts.get(agent_class, 0) + 1
-
-        # Clear the legend panel
-        for widget in self.legend_panel.winfo_children():
-            widget.destroy()
-
-        # Update the legend panel with agent counts
-        sorted_counts = sorted(agent_counts.items(), key=lambda x: x[0].__name__)
-
-        for agent_class, count in sorted_counts:
+        agent_classes = sorted((agent_class for agent_class in self.__agent_colours if agent_class),
+                               key=lambda agent_class: agent_class.__name__)
+        for agent_class in agent_classes:
             color_label = tk.Label(self.legend_panel, bg=self.__agent_colours[agent_class], width=2, height=1)
             color_label.pack(side=tk.LEFT)
 
-            label_text = agent_class.__name__ + " (" + str(count) + ")"
-            label = tk.Label(self.legend_panel, text=label_text)
+            label = tk.Label(self.legend_panel)
             label.pack(side=tk.LEFT)
+            self.__legend_labels[agent_class] = label
+
+    def __init_world(self):
+        """Initialize the scrollable, zoomable world canvas, starting zoomed out to show the whole world."""
+        width = self.__environment.get_width()
+        height = self.__environment.get_height()
+        view_width = min(Config.viewport_size, width * Config.cell_size)
+        view_height = min(Config.viewport_size, height * Config.cell_size)
+        self.__viewport = Viewport(width, height, view_width, view_height, 0, self.__code_colours.keys())
+
+        world_frame = tk.Frame(self)
+        world_frame.grid(row=1, column=0)
+        self.__canvas = tk.Canvas(world_frame, width=view_width, height=view_height, highlightthickness=0)
+        self.__canvas.grid(row=0, column=0)
+        self.__x_scrollbar = tk.Scrollbar(world_frame, orient=tk.HORIZONTAL, command=self.__scroll_x)
+        self.__x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.__y_scrollbar = tk.Scrollbar(world_frame, orient=tk.VERTICAL, command=self.__scroll_y)
+        self.__y_scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.__canvas.bind("<ButtonPress-1>", self.__start_drag)
+        self.__canvas.bind("<B1-Motion>", self.__drag)
+        self.__canvas.bind("<MouseWheel>", self.__wheel)
+        self.__canvas.bind("<Button-4>", lambda event: self.__zoom(1.25, event.x, event.y))
+        self.__canvas.bind("<Button-5>", lambda event: self.__zoom(0.8, event.x, event.y))
+        self.bind("<plus>", lambda event: self.__zoom(1.25))
+        self.bind("<equal>", lambda event: self.__zoom(1.25))
+        self.bind("<minus>", lambda event: self.__zoom(0.8))
+        self.bind("<Left>", lambda event: self.__pan(-1, 0))
+        self.bind("<Right>", lambda event: self.__pan(1, 0))
+        self.bind("<Up>", lambda event: self.__pan(0, -1))
+        self.bind("<Down>", lambda event: self.__pan(0, 1))
+
+        self.__rebuild_view()
+
+    def __rebuild_view(self):
+        """Recreate the canvas items for the visible cells or blocks after the view has moved or zoomed."""
+        self.__canvas.delete("all")
+        self.__cells = []
+        type_codes = self.__environment.get_type_codes()
+        columns, rows = self.__viewport.get_shape()
+        outline = "black" if self.__viewport.get_block() == 1 and self.__viewport.get_zoom() >= 8 else ""
+        for item in range(columns * rows):
+            colour = self.__code_colours[self.__viewport.get_item_code(item, type_codes)]
+            cell = self.__canvas.create_rectangle(*self.__viewport.get_item_bounds(item),
+                                                  fill=colour, outline=outline)
+            self.__cells.append(cell)
+        self.__dirty_cells.clear()
+
+        (x_first, x_last), (y_first, y_last) = self.__viewport.get_scroll_fractions()
+        self.__x_scrollbar.set(x_first, x_last)
+        self.__y_scrollbar.set(y_first, y_last)
+
+    def __zoom(self, factor: float, anchor_x: float = None, anchor_y: float = None):
+        """Zoom the view by a factor around an anchor pixel."""
+        self.__viewport.set_zoom(self.__viewport.get_zoom() * factor, anchor_x, anchor_y)
+        self.__rebuild_view()
+
+    def __pan(self, dx: int, dy: int):
+        """Scroll the view by a number of screen items."""
+        block = self.__viewport.get_block()
+        self.__viewport.pan(dx * block, dy * block)
+        self.__rebuild_view()
+
+    def __wheel(self, event):
+        """Zoom with the mouse wheel around the pointer."""
+        self.__zoom(1.25 if event.delta > 0 else 0.8, event.x, event.y)
+
+    def __start_drag(self, event):
+        """Remember where a drag started."""
+        self.__drag_start = (event.x, event.y)
+
+    def __drag(self, event):
+        """Pan the view while dragging, by whole screen items."""
+        item_size = self.__viewport.get_item_size()
+        dx = int((self.__drag_start[0] - event.x) / item_size)
+        dy = int((self.__drag_start[1] - event.y) / item_size)
+        if dx or dy:
+            self.__drag_start = (self.__drag_start[0] - dx * item_size, self.__drag_start[1] - dy * item_size)
+            self.__pan(dx, dy)
+
+    def __scroll_x(self, action, amount, unit=None):
+        """Handle the horizontal scrollbar."""
+        self.__scroll(action, amount, unit, horizontal=True)
+
+    def __scroll_y(self, action, amount, unit=None):
+        """Handle the vertical scrollbar."""
+        self.__scroll(action, amount, unit, horizontal=False)
+
+    def __scroll(self, action, amount, unit, horizontal: bool):
+        """Move the view according to a scrollbar command."""
+        if action == "moveto":
+            if horizontal:
+                self.__viewport.move_to(fraction_x=float(amount))
+            else:
+                self.__viewport.move_to(fraction_y=float(amount))
+            self.__rebuild_view()
+            return
+        columns, rows = self.__viewport.get_shape()
+        step = int(amount) * ((columns if horizontal else rows) if unit == "pages" else 1)
+        if horizontal:
+            self.__pan(step, 0)
+        else:
+            self.__pan(0, step)
+
+    def __init_controls(self):
+        """Initialize the pause, single-step and speed controls."""
+        controls = tk.Frame(self)
+        controls.grid(row=3, column=0)
+
+        self.__pause_button = tk.Button(controls, text="Pause", width=8, command=self.toggle_pause)
+        self.__pause_button.pack(side=tk.LEFT)
+        tk.Button(controls, text="Step", width=8, command=self.single_step).pack(side=tk.LEFT)
+
+        tk.Label(controls, text="Steps/s").pack(side=tk.LEFT)
+        self.__speed = tk.Scale(controls, from_=1, to=Config.max_steps_per_second, orient=tk.HORIZONTAL,
+                                length=200)
+        self.__speed.set(round(1 / Config.sim_delay) if Config.sim_delay > 0 else Config.max_steps_per_second)
+        self.__speed.pack(side=tk.LEFT)
+
+        self.__status_label = tk.Label(controls, width=24, anchor="w")
+        self.__status_label.pack(side=tk.LEFT)
+
+    def update_legend(self):
+        """Update the legend labels in place from the counts the environment keeps per agent type."""
+        type_counts = self.__environment.get_type_counts()
+        for agent_class, label in self.__legend_labels.items():
+            label_text = agent_class.__name__ + " (" + str(type_counts[agent_class.TYPE_CODE]) + ")"
+            if label.cget("text") != label_text:
+                label.configure(text=label_text)
 
     def on_closing(self):
         """Handle closing of the GUI window."""
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Tuple
+
+
+class ImageWriter:
+    """
+    Writes simulation images without Tk or third-party imaging libraries.
+
+    Attributes:
+        COLOUR_NAMES (dict): The named colours used by the simulation, with the RGB values Tk gives them.
+    """
+    COLOUR_NAMES = {
+        "white": (255, 255, 255),
+        "black": (0, 0, 0),
+        "red": (255, 0, 0),
+        "green": (0, 255, 0),
+        "blue": (0, 0, 255),
+        "yellow": (255, 255, 0),
+        "orange": (255, 165, 0),
+        "purple": (160, 32, 240),
+        "brown": (165, 42, 42),
+        "cyan": (0, 255, 255),
+        "magenta": (255, 0, 255),
+        "grey": (190, 190, 190),
+        "gray": (190, 190, 190),
+    }
+
+    @staticmethod
+    def parse_colour(colour: str) -> Tuple[int, int, int]:
+        """
+        Convert a Tk colour name or #rrggbb string into an RGB triple without needing Tk.
+
+        Args:
+            colour (str): The colour name or hex string.
+
+        Returns:
+            Tuple[int, int, int]: The red, green and blue components.
+        """
+        if colour.startswith("#") and len(colour) == 7:
+            return int(colour[1:3], 16), int(colour[3:5], 16), int(colour[5:7], 16)
+        try:
+            return ImageWriter.COLOUR_NAMES[colour.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown colour: {colour}") from None
+
+    @staticmethod
+    def write_png(path: str, width: int, height: int, pixels: bytes, channels: int = 3, compression: int = 6) -> None:
+        """
+        Write an 8-bit RGB or greyscale PNG file using only the standard library.
+
+        Args:
+            path (str): The file to write.
+            width (int): The width of the image in pixels.
+            height (int): The height of the image in pixels.
+            pixels (bytes): The pixel data in row-major order, channels bytes per pixel.
+            channels (int): 3 for RGB or 1 for greyscale.
+            compression (int): The zlib compression level.
+        """
+        if channels not in (1, 3):
+            raise ValueError("Only greyscale and RGB images are supported")
+        stride = width * channels
+        if len(pixels) != stride * height:
+            raise ValueError("Pixel data does not match the image size")
+
+        # Every scanline starts with filter type 0 (none)
+        raw = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))
+        colour_type = 2 if channels == 3 else 0
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        with open(path, "wb") as file:
+            file.write(b"\x89PNG\r\n\x1a\n")
+            file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, colour_type, 0, 0, 0)))
+            file.write(chunk(b"IDAT", zlib.compress(raw, compression)))
+            file.write(chunk(b"IEND", b""))
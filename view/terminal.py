@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import shutil
+import sys
+import time
+from typing import List, Optional, Set, TextIO, TYPE_CHECKING
+
+from view.image_writer import ImageWriter
+from view.viewport import Viewport
+
+if TYPE_CHECKING:
+    from model.environment import Environment
+
+
+class TerminalRenderer:
+    """
+    Text alternative to the Tk GUI drawing the world with ANSI escape sequences, e.g. over SSH.
+
+    Every cell, or block of cells on maps larger than the terminal, is drawn as two spaces with the colour of
+    its agent type as background. The first frame draws everything; later frames only move the cursor to the
+    items whose colour changed and repaint those. Frames are also capped at a maximum rate, with changes
+    collected in between, so the renderer can be called after every step.
+
+    Attributes:
+        __environment (Environment): The environment to render.
+        __agent_colours (dict): A dictionary mapping agent classes to their corresponding colors.
+        __colour_codes (List[str]): The escape sequence selecting the background colour of every type code.
+        __output (TextIO): The stream the frames are written to.
+        __viewport (Viewport): The part of the world shown and its level of detail.
+        __drawn (bytearray): The type code currently shown by every item, NOT_DRAWN if not drawn yet.
+        __started (bool): Flag indicating whether the screen has been cleared for the first frame.
+        __dirty_cells (Set[int]): The cells that changed since the last frame.
+        __legend (str): The legend line currently shown.
+        __min_frame_interval (float): The minimum number of seconds between two frames.
+        __last_frame (float): The time the last frame was drawn.
+    """
+    CELL_WIDTH = 2  # Characters per cell, so cells look roughly square
+    LEGEND_ROWS = 2
+    NOT_DRAWN = 255
+    RESET = "\x1b[0m"
+
+    def __init__(self, environment: Environment, agent_colours: dict, output: Optional[TextIO] = None,
+                 columns: Optional[int] = None, rows: Optional[int] = None, max_fps: float = 30) -> None:
+        """
+        Initialise the TerminalRenderer object.
+
+        Args:
+            environment (Environment): The environment to render.
+            agent_colours (dict): A dictionary mapping agent classes to their corresponding colors, as used by the GUI.
+            output (TextIO): The stream to write to, defaults to standard output.
+            columns (int): The width of the terminal in characters, detected if not given.
+            rows (int): The height of the terminal in lines, detected if not given.
+            max_fps (float): The maximum number of frames per second, 0 for no limit.
+        """
+        terminal_size = shutil.get_terminal_size()
+        columns = columns or terminal_size.columns
+        rows = rows or terminal_size.lines
+        self.__environment = environment
+        self.__agent_colours = agent_colours
+        self.__output = output or sys.stdout
+        self.__colour_codes = [""] * 256
+        for agent_class, colour in agent_colours.items():
+            red, green, blue = ImageWriter.parse_colour(colour)
+            self.__colour_codes[agent_class.TYPE_CODE if agent_class else 0] = f"\x1b[48;2;{red};{green};{blue}m"
+
+        # A view unit of MIN_ITEM_PIXELS stands for one cell, so the viewport switches to blocks exactly when
+        # the world no longer fits into the terminal
+        type_codes = [agent_class.TYPE_CODE if agent_class else 0 for agent_class in agent_colours]
+        self.__viewport = Viewport(environment.get_width(), environment.get_height(),
+                                   max(1, columns // TerminalRenderer.CELL_WIDTH) * Viewport.MIN_ITEM_PIXELS,
+                                   max(1, rows - TerminalRenderer.LEGEND_ROWS) * Viewport.MIN_ITEM_PIXELS,
+                                   0, type_codes)
+        item_columns, item_rows = self.__viewport.get_shape()
+        self.__drawn = bytearray([TerminalRenderer.NOT_DRAWN]) * (item_columns * item_rows)
+        self.__started = False
+        self.__dirty_cells: Set[int] = environment.track_dirty_cells()
+        self.__legend = ""
+        self.__min_frame_interval = 1 / max_fps if max_fps > 0 else 0
+        self.__last_frame = float("-inf")
+
+    def get_viewport(self) -> Viewport:
+        """Get the part of the world shown and its level of detail."""
+        return self.__viewport
+
+    def render(self, status: str = "", force: bool = False) -> bool:
+        """
+        Draw a frame, unless the previous one was drawn too recently.
+
+        Args:
+            status (str): A status text shown next to the legend, e.g. the step.
+            force (bool): Draw even if the frame rate limit was reached.
+
+        Returns:
+            bool: True if a frame was drawn.
+        """
+        now = time.perf_counter()
+        if not force and now - self.__last_frame < self.__min_frame_interval:
+            return False
+        self.__last_frame = now
+
+        if not self.__started:
+            parts = ["\x1b[?25l\x1b[2J"]  # Hide the cursor and clear the screen before the first frame
+            items = range(len(self.__drawn))
+            self.__started = True
+        else:
+            parts = []
+            if len(self.__dirty_cells) >= len(self.__drawn):
+                items = range(len(self.__drawn))
+            else:
+                items = {self.__viewport.get_item_of_cell(index) for index in self.__dirty_cells}
+                items.discard(None)
+                items = sorted(items)
+        self.__dirty_cells.clear()
+
+        self.__paint_items(items, parts)
+        legend = self.__get_legend(status)
+        if legend != self.__legend:
+            _, item_rows = self.__viewport.get_shape()
+            parts.append(f"{TerminalRenderer.RESET}\x1b[{item_rows + 1};1H\x1b[2K{legend}")
+            self.__legend = legend
+        if parts:
+            self.__output.write("".join(parts))
+            self.__output.flush()
+        return True
+
+    def close(self) -> None:
+        """Draw the final frame, then restore the colours and cursor and move below the map."""
+        self.render(force=True)
+        _, item_rows = self.__viewport.get_shape()
+        below = item_rows + TerminalRenderer.LEGEND_ROWS
+        self.__output.write(f"{TerminalRenderer.RESET}\x1b[{below};1H\x1b[?25h\n")
+        self.__output.flush()
+        self.__environment.untrack_dirty_cells(self.__dirty_cells)
+
+    def __paint_items(self, items, parts: List[str]) -> None:
+        """
+        Append the escape sequences repainting the items whose type code changed.
+
+        Cursor moves are skipped between neighbouring items on one row, and colour changes between items of
+        the same colour.
+        """
+        type_codes = self.__environment.get_type_codes()
+        item_columns, _ = self.__viewport.get_shape()
+        cell = " " * TerminalRenderer.CELL_WIDTH
+        drawn, colour_codes = self.__drawn, self.__colour_codes
+        cursor, colour = -1, -1
+        for item in items:
+            code = self.__viewport.get_item_code(item, type_codes)
+            if drawn[item] == code:
+                continue
+            drawn[item] = code
+            if item != cursor or item % item_columns == 0:
+                row, column = divmod(item, item_columns)
+                parts.append(f"\x1b[{row + 1};{column * TerminalRenderer.CELL_WIDTH + 1}H")
+            if code != colour:
+                parts.append(colour_codes[code])
+                colour = code
+            parts.append(cell)
+            cursor = item + 1
+
+    def __get_legend(self, status: str) -> str:
+        """Build the legend line: a colour swatch and count per agent class, then the status."""
+        type_counts = self.__environment.get_type_counts()
+        agent_classes = sorted((agent_class for agent_class in self.__agent_colours if agent_class),
+                               key=lambda agent_class: agent_class.__name__)
+        entries = [f"{self.__colour_codes[agent_class.TYPE_CODE]}  {TerminalRenderer.RESET} "
+                   f"{agent_class.__name__} ({type_counts[agent_class.TYPE_CODE]})" for agent_class in agent_classes]
+        block = self.__viewport.get_block()
+        if block > 1:
+            entries.append(f"[1:{block}]")
+        if status:
+            entries.append(status)
+        return "  ".join(entries)
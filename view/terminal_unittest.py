@@ -0,0 +1,75 @@
+import io
+import re
+import unittest
+from model.alien import Alien
+from model.location import Location
+from model.mars import Mars
+from model.rock import Rock
+from model.rover import Rover
+from model.spacecraft import Spacecraft
+from view.terminal import TerminalRenderer
+
+
+AGENT_COLOURS = {Spacecraft: "red", Rover: "blue", Alien: "green", Rock: "black", None: "white"}
+CURSOR_MOVE = re.compile(r"\x1b\[(\d+);(\d+)H")
+
+
+class TestTerminalRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.mars = Mars()
+        self.mars.clear()
+        self.output = io.StringIO()
+        self.renderer = TerminalRenderer(self.mars, AGENT_COLOURS, self.output, columns=200, rows=100, max_fps=0)
+
+    def take_output(self):
+        text = self.output.getvalue()
+        self.output.seek(0)
+        self.output.truncate()
+        return text
+
+    def test_first_frame_draws_every_cell_and_legend(self):
+        self.mars.set_agent(Rock(Location(0, 0)), Location(0, 0))
+        self.assertTrue(self.renderer.render("Step 0"))
+        text = self.take_output()
+        self.assertTrue(text.startswith("\x1b[?25l\x1b[2J"))
+        self.assertIn("\x1b[48;2;0;0;0m", text)
+        self.assertIn("Rock (1)", text)
+        self.assertIn("Step 0", text)
+
+    def test_later_frames_repaint_only_changed_cells(self):
+        self.renderer.render()
+        self.take_output()
+        self.mars.set_agent(Alien(Location(3, 2)), Location(3, 2))
+        self.renderer.render()
+        text = self.take_output()
+        # One move to the changed cell and one to the legend
+        self.assertEqual(CURSOR_MOVE.findall(text), [("3", "7"), (str(self.mars.get_height() + 1), "1")])
+        self.assertIn("\x1b[48;2;0;255;0m  ", text)
+
+    def test_unchanged_frame_writes_nothing(self):
+        self.renderer.render()
+        self.take_output()
+        self.renderer.render()
+        self.assertEqual(self.take_output(), "")
+
+    def test_frame_rate_limit(self):
+        renderer = TerminalRenderer(self.mars, AGENT_COLOURS, io.StringIO(), columns=200, rows=100, max_fps=1)
+        self.assertTrue(renderer.render())
+        self.assertFalse(renderer.render())
+        self.assertTrue(renderer.render(force=True))
+
+    def test_large_map_is_downsampled(self):
+        renderer = TerminalRenderer(self.mars, AGENT_COLOURS, io.StringIO(), columns=20, rows=7, max_fps=0)
+        self.assertGreater(renderer.get_viewport().get_block(), 1)
+        columns, rows = renderer.get_viewport().get_shape()
+        self.assertLessEqual(columns, 10)
+        self.assertLessEqual(rows, 5)
+
+    def test_close_restores_cursor(self):
+        self.renderer.close()
+        self.assertTrue(self.take_output().endswith("\x1b[?25h\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
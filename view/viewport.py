@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import math
+from typing import Optional, Sequence, Tuple
+
+
+class Viewport:
+    """
+    The visible part of the world and how it maps onto screen items.
+
+    The world wraps around both edges, so the viewport can be scrolled endlessly. When zoomed out so far
+    that a cell would be smaller than MIN_ITEM_PIXELS, every screen item stands for a square block of cells
+    and shows the majority type code of the block (level of detail), keeping the number of items bounded
+    by the screen size rather than the map size.
+
+    Attributes:
+        __world_width (int): The width of the world in cells.
+        __world_height (int): The height of the world in cells.
+        __view_width (int): The width of the view in pixels.
+        __view_height (int): The height of the view in pixels.
+        __type_codes (Sequence[int]): The type codes considered when aggregating blocks.
+        __zoom (float): The size of one cell in pixels.
+        __origin_x (int): The world column shown at the left edge of the view.
+        __origin_y (int): The world row shown at the top edge of the view.
+        __block (int): The number of cells along each side of the block one item stands for.
+        __columns (int): The number of item columns in the view.
+        __rows (int): The number of item rows in the view.
+    """
+    MIN_ITEM_PIXELS = 4
+    MAX_ZOOM = 40.0
+
+    def __init__(self, world_width: int, world_height: int, view_width: int, view_height: int,
+                 zoom: float, type_codes: Sequence[int]) -> None:
+        """
+        Initialise the Viewport object.
+
+        Args:
+            world_width (int): The width of the world in cells.
+            world_height (int): The height of the world in cells.
+            view_width (int): The width of the view in pixels.
+            view_height (int): The height of the view in pixels.
+            zoom (float): The initial size of one cell in pixels.
+            type_codes (Sequence[int]): The type codes considered when aggregating blocks.
+        """
+        self.__world_width = world_width
+        self.__world_height = world_height
+        self.__view_width = view_width
+        self.__view_height = view_height
+        self.__type_codes = tuple(type_codes)
+        self.__origin_x = 0
+        self.__origin_y = 0
+        self.__zoom = self.get_min_zoom()
+        self.__block = 1
+        self.__columns = 0
+        self.__rows = 0
+        self.set_zoom(zoom)
+        self.__origin_x = 0
+        self.__origin_y = 0
+
+    def get_zoom(self) -> float:
+        """Get the size of one cell in pixels."""
+        return self.__zoom
+
+    def get_origin(self) -> Tuple[int, int]:
+        """Get the world cell shown at the top-left corner of the view."""
+        return self.__origin_x, self.__origin_y
+
+    def get_block(self) -> int:
+        """Get the number of cells along each side of the block one item stands for."""
+        return self.__block
+
+    def get_item_size(self) -> float:
+        """Get the size of one item in pixels."""
+        return self.__block * self.__zoom
+
+    def get_shape(self) -> Tuple[int, int]:
+        """Get the number of item columns and rows in the view."""
+        return self.__columns, self.__rows
+
+    def get_min_zoom(self) -> float:
+        """Get the zoom at which the whole world fits into the view."""
+        return min(self.__view_width / self.__world_width, self.__view_height / self.__world_height)
+
+    def set_zoom(self, zoom: float, anchor_x: float = None, anchor_y: float = None) -> None:
+        """
+        Change the zoom, keeping the world position under an anchor pixel in place.
+
+        Args:
+            zoom (float): The new size of one cell in pixels, clamped to the allowed range.
+            anchor_x (float): The pixel column to keep in place, defaults to the centre of the view.
+            anchor_y (float): The pixel row to keep in place, defaults to the centre of the view.
+        """
+        anchor_x = self.__view_width / 2 if anchor_x is None else anchor_x
+        anchor_y = self.__view_height / 2 if anchor_y is None else anchor_y
+        world_x = self.__origin_x + anchor_x / self.__zoom
+        world_y = self.__origin_y + anchor_y / self.__zoom
+
+        self.__zoom = max(self.get_min_zoom(), min(Viewport.MAX_ZOOM, zoom))
+        self.__block = max(1, math.ceil(Viewport.MIN_ITEM_PIXELS / self.__zoom))
+        item_size = self.get_item_size()
+        self.__columns = min(math.ceil(self.__view_width / item_size), math.ceil(self.__world_width / self.__block))
+        self.__rows = min(math.ceil(self.__view_height / item_size), math.ceil(self.__world_height / self.__block))
+
+        self.__origin_x = int(round(world_x - anchor_x / self.__zoom)) % self.__world_width
+        self.__origin_y = int(round(world_y - anchor_y / self.__zoom)) % self.__world_height
+
+    def pan(self, dx: int, dy: int) -> None:
+        """
+        Scroll the view by a number of cells, wrapping around the world edges.
+
+        Args:
+            dx (int): The number of cells to scroll right.
+            dy (int): The number of cells to scroll down.
+        """
+        self.__origin_x = (self.__origin_x + dx) % self.__world_width
+        self.__origin_y = (self.__origin_y + dy) % self.__world_height
+
+    def move_to(self, fraction_x: float = None, fraction_y: float = None) -> None:
+        """
+        Move the top-left corner of the view to a fraction of the world size, e.g. from a scrollbar.
+
+        Args:
+            fraction_x (float): The new horizontal position between 0 and 1, or None to keep it.
+            fraction_y (float): The new vertical position between 0 and 1, or None to keep it.
+        """
+        if fraction_x is not None:
+            self.__origin_x = int(fraction_x * self.__world_width) % self.__world_width
+        if fraction_y is not None:
+            self.__origin_y = int(fraction_y * self.__world_height) % self.__world_height
+
+    def get_visible_cells(self) -> Tuple[int, int]:
+        """Get the number of world columns and rows covered by the view."""
+        return (min(self.__world_width, self.__columns * self.__block),
+                min(self.__world_height, self.__rows * self.__block))
+
+    def get_scroll_fractions(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Get the visible horizontal and vertical ranges as fractions of the world, as used by scrollbars."""
+        visible_x, visible_y = self.get_visible_cells()
+        first_x = self.__origin_x / self.__world_width
+        first_y = self.__origin_y / self.__world_height
+        return ((first_x, min(1.0, first_x + visible_x / self.__world_width)),
+                (first_y, min(1.0, first_y + visible_y / self.__world_height)))
+
+    def get_item_of_cell(self, index: int) -> Optional[int]:
+        """
+        Find the item showing a world cell.
+
+        Args:
+            index (int): The row-major index of the cell.
+
+        Returns:
+            Optional[int]: The row-major index of the item, or None if the cell is outside the view.
+        """
+        y, x = divmod(index, self.__world_width)
+        column = ((x - self.__origin_x) % self.__world_width) // self.__block
+        row = ((y - self.__origin_y) % self.__world_height) // self.__block
+        if column < self.__columns and row < self.__rows:
+            return row * self.__columns + column
+        return None
+
+    def get_item_bounds(self, item: int) -> Tuple[float, float, float, float]:
+        """
+        Get the pixel rectangle of an item.
+
+        Args:
+            item (int): The row-major index of the item.
+
+        Returns:
+            Tuple[float, float, float, float]: The left, top, right and bottom pixel coordinates.
+        """
+        row, column = divmod(item, self.__columns)
+        item_size = self.get_item_size()
+        return column * item_size, row * item_size, (column + 1) * item_size, (row + 1) * item_size
+
+    def get_item_code(self, item: int, type_codes: bytearray) -> int:
+        """
+        Get the type code an item shows: the code of its cell, or the majority code of its block.
+
+        Args:
+            item (int): The row-major index of the item.
+            type_codes (bytearray): The occupancy grid of the world.
+
+        Returns:
+            int: The type code to show; ties go to the higher code.
+        """
+        row, column = divmod(item, self.__columns)
+        width, height, block = self.__world_width, self.__world_height, self.__block
+        x_offset = column * block
+        y_offset = row * block
+        if block == 1:
+            return type_codes[((self.__origin_y + y_offset) % height) * width + (self.__origin_x + x_offset) % width]
+
+        # Blocks at the far edge are clipped so no cell is counted twice
+        block_width = min(block, width - x_offset)
+        block_height = min(block, height - y_offset)
+        x_start = (self.__origin_x + x_offset) % width
+        x_end = x_start + block_width
+        rows = []
+        for dy in range(block_height):
+            row_start = ((self.__origin_y + y_offset + dy) % height) * width
+            if x_end <= width:
+                rows.append(type_codes[row_start + x_start:row_start + x_end])
+            else:
+                rows.append(type_codes[row_start + x_start:row_start + width])
+                rows.append(type_codes[row_start:row_start + x_end - width])
+        cells = b"".join(rows)
+        return max(self.__type_codes, key=lambda code: (cells.count(code), code))
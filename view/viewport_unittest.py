@@ -0,0 +1,65 @@
+import unittest
+from view.viewport import Viewport
+
+
+class TestViewport(unittest.TestCase):
+
+    def setUp(self):
+        self.viewport = Viewport(100, 100, 400, 400, 40.0, (0, 1, 2, 3, 4))
+
+    def test_initial_zoom_shows_cells(self):
+        self.assertEqual(self.viewport.get_block(), 1)
+        self.assertEqual(self.viewport.get_shape(), (10, 10))
+
+    def test_zoom_is_clamped_to_whole_world(self):
+        self.viewport.set_zoom(0.001)
+        self.assertEqual(self.viewport.get_zoom(), 4.0)
+        self.assertEqual(self.viewport.get_visible_cells(), (100, 100))
+
+    def test_level_of_detail_blocks(self):
+        viewport = Viewport(2000, 2000, 800, 800, 0, (0, 4))
+        self.assertEqual(viewport.get_block(), 10)
+        self.assertEqual(viewport.get_shape(), (200, 200))
+
+    def test_pan_wraps(self):
+        self.viewport.pan(-3, 105)
+        self.assertEqual(self.viewport.get_origin(), (97, 5))
+
+    def test_item_of_cell(self):
+        self.viewport.pan(95, 0)
+        self.assertEqual(self.viewport.get_item_of_cell(2 * 100 + 96), 2 * 10 + 1)
+        self.assertEqual(self.viewport.get_item_of_cell(2 * 100 + 4), 2 * 10 + 9)
+        self.assertIsNone(self.viewport.get_item_of_cell(2 * 100 + 50))
+
+    def test_item_code_single_cell(self):
+        type_codes = bytearray(100 * 100)
+        type_codes[3 * 100 + 7] = 2
+        self.assertEqual(self.viewport.get_item_code(3 * 10 + 7, type_codes), 2)
+
+    def test_item_code_majority_of_block(self):
+        viewport = Viewport(8, 8, 8, 8, 1.0, (0, 3, 4))
+        self.assertEqual(viewport.get_block(), 4)
+        type_codes = bytearray(64)
+        for index in (0, 1, 8, 9, 16, 17, 24, 25, 3):
+            type_codes[index] = 4
+        type_codes[2] = 3
+        self.assertEqual(viewport.get_item_code(0, type_codes), 4)
+        self.assertEqual(viewport.get_item_code(1, type_codes), 0)
+
+    def test_item_code_block_wraps(self):
+        viewport = Viewport(8, 8, 8, 8, 1.0, (0, 4))
+        viewport.pan(6, 6)
+        type_codes = bytearray(64)
+        for index in (6 * 8 + 6, 6 * 8 + 7, 6 * 8 + 0, 7 * 8 + 0, 0 * 8 + 7, 1 * 8 + 1, 0 * 8 + 0, 7 * 8 + 7, 7 * 8 + 6):
+            type_codes[index] = 4
+        self.assertEqual(viewport.get_item_code(0, type_codes), 4)
+
+    def test_scroll_fractions(self):
+        self.viewport.move_to(fraction_x=0.5)
+        (x_first, x_last), (y_first, y_last) = self.viewport.get_scroll_fractions()
+        self.assertEqual((x_first, x_last), (0.5, 0.6))
+        self.assertEqual((y_first, y_last), (0.0, 0.1))
+
+
+if __name__ == '__main__':
+    unittest.main()